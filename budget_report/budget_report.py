@@ -9,18 +9,36 @@
 
 ### LIBRARIES / PACKAGES ###
 
+# annotations are not evaluated, tkinter is only imported by the GUI
+from __future__ import annotations
 import os
+import re
 import sys
-import tkinter as tk
-from tkinter import filedialog
-import webbrowser as wb
+import glob
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+import threading
+import queue
 from pathlib import Path
-from decimal import Decimal
-from datetime import datetime
+from contextlib import closing
+from itertools import islice
+from datetime import datetime, timedelta, timezone
+from typing import Generator, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import folioclient
 import pandas as pd
-from PIL import ImageTk, Image
-from tkcalendar import Calendar
+import openpyxl
 import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+# pyarrow is only needed for the parsed export cache
+try:
+    from pyarrow import ArrowException
+except ImportError:
+    ArrowException = ImportError
 
 
 ### GLOBAL CONSTANTS / VARIABLES ###
@@ -34,7 +52,129 @@ LOGO_PATH = os.path.join('images', 'logo-no-background.png')
 HELP_PATH = os.path.join('texts', 'info-help-text.txt')
 CALENDAR_DATE_FORMAT = 'yyyy-mm-dd'
 DATETIME_FORMAT = '%Y-%m-%d'
+US_DATE_FORMAT = '%m/%d/%Y' # format of dates exported from FOLIO
+FOLIO_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S' # format of FOLIO metadata dates
 DATE_CUTOFF_COLUMN_NAME = 'Invoice date'
+COST_COLUMN_NAME = 'Total'
+COLUMN_TO_BE_SPLIT = 'Invoice line fund distributions'
+CENTS_COLUMN_NAME = 'Total (cents)' # exact integer form of COST_COLUMN_NAME
+CENTS_PER_DOLLAR = 100
+# one fund distribution, i.e. "Code""Title""Percentage Used""Cost", split
+# invoice lines hold several of these (separated by "|" in FOLIO exports)
+DISTRIBUTION_PATTERN = re.compile(r'"([^"]*)""([^"]*)""([^"]*)""([^"]*)"')
+# a whole invoice line, one or more distributions
+DISTRIBUTION_LINE_PATTERN = re.compile(r'\s*"[^"]*"(?:"[^"]*"){3}' \
+                                       r'(?:\s*\|?\s*"[^"]*"(?:"[^"]*"){3})*' \
+                                       r'\s*')
+DISTRIBUTION_COLUMN_NAMES = ['Code', 'Title', 'Percentage Used', 'Cost']
+# the only columns read from the export, and their types, totals are
+# read as text so that malformed totals can be reported like dates
+REQUIRED_COLUMN_DTYPES = {
+    COST_COLUMN_NAME : str,
+    DATE_CUTOFF_COLUMN_NAME : str,
+    COLUMN_TO_BE_SPLIT : str,
+}
+# identifiers of each invoice line, carried along when present in the
+# export, for the invoice line detail sheets
+INVOICE_ID_COLUMN_NAMES = ['Vendor invoice number', 'Invoice line number']
+# columns of the invoice lines kept for the detail sheets, in order
+LINE_COLUMN_NAMES = [
+    DATE_CUTOFF_COLUMN_NAME,
+    *INVOICE_ID_COLUMN_NAMES,
+    'Code',
+    'Title',
+    'Percentage Used',
+    CENTS_COLUMN_NAME,
+]
+CSV_CHUNK_SIZE = 50_000 # rows per chunk when streaming an export
+# exports saved from Excel, always streamed as they cannot be read in part
+XLSX_EXTENSION = '.xlsx'
+ACCEPTED_EXTENSIONS = ['.csv', XLSX_EXTENSION]
+# exports larger than this are streamed in chunks instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024 # 100 MiB
+SUMMARY_SHEET_NAME = 'SUMMARY' # first sheet of a consolidated batch report
+PERIOD_SHEET_NAME = 'BY PERIOD' # sheet of the fund-by-period breakdown
+PERIOD_FREQUENCY = 'M' # default breakdown period, monthly
+FUND_SHEET_NAME = 'BY FUND CODE' # sheet of the fund code rollups
+# separates the levels of a fund code, i.e. ledger, group and subfund
+FUND_CODE_SEPARATOR = '-'
+FUND_SUM_COLUMN_NAMES = ['ytd', 'current'] # columns of the fund code sums
+MAX_SHEET_NAME_LENGTH = 31 # Excel limit on worksheet names
+DETAIL_SHEET_NAME = 'DETAIL' # sheet of the invoice lines behind each subfund
+MAX_SHEET_ROWS = 1_048_576 # Excel limit on worksheet rows
+VARIANCE_SHEET_NAME = 'VARIANCE' # sheet comparing the report to a baseline
+# writes rows straight to disk instead of holding whole sheets in memory,
+# text from exports is never turned into formulas or links
+WORKBOOK_OPTIONS = {
+    'constant_memory' : True,
+    'strings_to_formulas' : False,
+    'strings_to_urls' : False,
+}
+COLUMN_WIDTH_PADDING = 2 # extra characters of width added to each column
+
+# parsed exports are cached here, keyed by content hash and modification time
+CACHE_DIRECTORY = os.path.join(Path.home(), '.budget_report', 'cache')
+CACHE_FILE_EXTENSION = '.feather'
+CACHE_FORMAT_VERSION = 3 # raised whenever the parsed columns change
+MAX_CACHED_EXPORTS = 20 # oldest cached exports are removed past this
+# errors of a missing pyarrow or a damaged cache file, e.g. ArrowTypeError
+# being a TypeError, upon which the export is parsed as usual
+CACHE_ERRORS = (ImportError, OSError, ValueError, TypeError, ArrowException)
+HASH_BLOCK_SIZE = 1024 * 1024 # bytes read at a time when hashing
+# running per-subfund totals of every invoice line counted, so that
+# reports only fold in invoice lines not counted yet
+YTD_STORE_PATH = os.path.join(Path.home(), '.budget_report', 'ytd.sqlite3')
+YTD_STORE_VERSION = 3 # raised whenever the tables change, totals recounted
+# FOLIO invoices updated this long before the last fetch (the watermark)
+# are fetched again, in case this computer's clock is behind FOLIO's
+FOLIO_WATERMARK_OVERLAP = timedelta(days=1)
+# sums of every report, kept so later reports can be compared against them
+SNAPSHOT_DIRECTORY = os.path.join(Path.home(), '.budget_report', 'snapshots')
+SNAPSHOT_EXTENSION = '.json'
+SNAPSHOT_HASH_LENGTH = 8 # hex digits of the export's path hash in the name
+
+# keys required in config.json, read from the working directory by default
+DEFAULT_CONFIG_NAME = 'config.json'
+REQUIRED_CONFIG_KEYS = {
+    'okapi_url' : 'https://okapi-mobius.folio.ebsco.com',
+    'tenant' : '[INSTITUTION ID]',
+    'username' : '[USERNAME]',
+    'password' : '[PASSWORD]',
+    }
+FOLIO_PAGE_SIZE = 1000 # records per request to the FOLIO APIs
+FOLIO_MAX_WORKERS = 8 # requests to the FOLIO APIs in flight at once
+FOLIO_ID_BATCH_SIZE = 50 # IDs per batched query, i.e. of invoice lines
+# columns of the report filled in from FOLIO finance, in integer cents
+FINANCE_COLUMN_NAMES = ['APPROPRIATION', 'ENCUMBRANCES']
+FINANCE_CACHE_TTL = 24 * 60 * 60 # seconds before finance is fetched again
+TENANT_HASH_LENGTH = 8 # hex digits of the tenant hash in finance cache names
+
+# scope resolution for the root window, only created when run as the GUI
+root = None
+
+# when set, receives status messages as status_handler(msg, col) instead
+# of the root window, i.e. when the pipeline runs in a worker process
+status_handler = None
+MALFORMED_ROWS_SHOWN = 20 # number of malformed rows listed to the user
+
+# stages of the report pipeline, shown in the main window as they start
+REPORT_STAGES = {
+    'read' : 'Reading export',
+    'parse dates' : 'Parsing dates',
+    'split' : 'Splitting distributions',
+    'aggregate' : 'Aggregating costs',
+    'write' : 'Writing report',
+}
+PROGRESS_POLL_MS = 100 # milliseconds between checks of the report thread
+# when set, the report is running on a worker thread, which sends its
+# status messages and stages to the main window through this queue
+progress_queue = None
+# set from the main window to stop the report running on the worker thread
+cancel_event = threading.Event()
+
+
+class ReportCancelled(Exception):
+    """Raised on the report thread once the user cancels the report."""
 
 
 ### FUNCTIONS ###
@@ -79,6 +219,17 @@ def error_msg(msg : str = 'Unknown error occured.') -> None:
         None, terminates program
     """
 
+    # passes error on when there is no window to display it in
+    if status_handler:
+        status_handler(msg, FAIL_COL)
+        return
+
+    # tkinter is only used from the main thread, errors are displayed
+    # once the main window reads them from the queue
+    if is_report_thread():
+        progress_queue.put(('error', msg))
+        return
+
     # displays error window
     error = tk.Toplevel()
     error.title('Error')
@@ -107,30 +258,55 @@ def update_validation(*entry : tk.Event) -> bool:
         bool: Returns True if patron ID is valid, False otherwise
     """
 
-    # retrieves input file path from text field
-    file_path = input_filename.get()
-    _, extension = os.path.splitext(file_path)
+    # retrieves input file path and fiscal year from text fields
+    is_valid_file, validation_msg = validate_input(input_filename.get(),
+                                                   fiscal_year_str.get())
 
-    # function validates to ensure file exists
-    is_valid_file = False # scope resolution, base case
-    enter_button.config(state='disabled')
-    if not os.path.exists(file_path):
-        status.config(text='File does not exist.',
-                      fg=FAIL_COL)
-    elif extension != '.csv':
-        status.config(text='File exists, but is not a CSV file.',
-                      fg=FAIL_COL)
-    else:
-        status.config(text='Valid file path.',
-                      fg=SUCCESS_COL)
-        enter_button.config(state='normal')
-        is_valid_file = True
+    # a running report keeps its status and the enter button disabled,
+    # the input is checked again once it is done
+    if progress_queue is not None:
+        return is_valid_file
+    status.config(text=validation_msg,
+                  fg=SUCCESS_COL if is_valid_file else FAIL_COL)
+    enter_button.config(state='normal' if is_valid_file else 'disabled')
         
     # wrap-up statements
     root.update()
     return is_valid_file
 
 
+def validate_input(file_path : str,
+                   fiscal_year_code : str = '') -> tuple[bool, str]:
+    """Checks whether a report can be generated from the input.
+
+    A function which validates the input file, folder or glob pattern,
+    or the FOLIO fiscal year which takes its place, without touching
+    any widgets.
+
+    Args:
+        file_path (str): The path to the export, folder or pattern
+        fiscal_year_code (str): The FOLIO fiscal year, if any
+
+    Returns:
+        tuple[bool, str]: Returns True if the input is valid, False
+            otherwise, and a message describing the input
+    """
+
+    _, extension = os.path.splitext(file_path)
+    fiscal_year_code = fiscal_year_code.strip()
+    if fiscal_year_code:
+        # fiscal years are pulled from FOLIO, no input file needed
+        return True, f'Pulling {fiscal_year_code} from FOLIO.'
+    batch_files = find_batch_files(file_path)
+    if batch_files:
+        return True, f'Valid batch of {len(batch_files)} exports.'
+    if not os.path.exists(file_path):
+        return False, 'File does not exist.'
+    if extension.lower() not in ACCEPTED_EXTENSIONS:
+        return False, 'File exists, but is not a CSV or XLSX file.'
+    return True, 'Valid file path.'
+
+
 def update_status(*, # requires all arguments to be keyword-only arguments
                   msg : str = '',
                   col : str = DEFAULT_COL,
@@ -153,6 +329,18 @@ def update_status(*, # requires all arguments to be keyword-only arguments
         None
     """
 
+    # passes message on when there is no window to update
+    if status_handler:
+        if msg:
+            status_handler(msg, col)
+        return
+
+    # tkinter is only used from the main thread, which reads the
+    # message from the queue instead
+    if is_report_thread():
+        progress_queue.put(('status', msg, col, enter_state))
+        return
+
     # changes status message if it is inputted,
     # otherwise keep it the same
     if msg:
@@ -167,6 +355,41 @@ def update_status(*, # requires all arguments to be keyword-only arguments
     return
 
 
+def is_report_thread() -> bool:
+    """Checks whether the pipeline is running on the report thread.
+
+    Returns:
+        bool: Returns True if the report runs on a worker thread and
+            this is not the main thread, False otherwise
+    """
+
+    return progress_queue is not None \
+        and threading.current_thread() is not threading.main_thread()
+
+
+def report_stage(stage : str) -> None:
+    """Reports the stage of the pipeline the report has reached.
+
+    A function which sends the stage to the main window when the report
+    runs on a worker thread. Also where a cancelled report stops, so
+    that it only stops between stages.
+
+    Args:
+        stage (str): a key of REPORT_STAGES
+
+    Returns:
+        None
+
+    Raises:
+        ReportCancelled: if the user has cancelled the report
+    """
+
+    if cancel_event.is_set():
+        raise ReportCancelled()
+    if is_report_thread():
+        progress_queue.put(('stage', stage))
+
+
 def open_info_help() -> None:
     """Opens a special info/help window.
     
@@ -276,7 +499,7 @@ def find_input_file() -> None:
     # pulls up file explorer
     ACCEPTED_FILETYPES = [
         ('Comma-separated values', '*.csv'),
-        # ('Microsoft Excel', '*.xlsx')
+        ('Microsoft Excel', '*.xlsx'),
     ]
     # if user closes out of filedialog prematurely, then folder_path = ''
     folder_path = filedialog.askopenfilename(parent=root,
@@ -291,6 +514,100 @@ def find_input_file() -> None:
     return
 
 
+def find_input_folder() -> None:
+    """Finds input folder for batch mode.
+
+    A function which contains the handling to find a folder of
+    exported CSV files, all of which are processed as one batch.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    initial_directory = os.curdir # defaults to location where exe is stored
+    downloads_path = os.path.join(Path.home(), 'Downloads')
+    if os.path.exists(downloads_path):
+        initial_directory = downloads_path
+
+    # if user closes out of filedialog prematurely, then folder_path = ''
+    folder_path = filedialog.askdirectory(parent=root,
+                                          title='Find folder - jaq',
+                                          initialdir=initial_directory)
+
+    input_filename.delete(0, 'end') # deletes previous text input
+    input_filename.insert(0, folder_path) # inputs newly extracted folder path
+
+    return
+
+
+def find_compare_file() -> None:
+    """Finds the export or report snapshot to compare the report with.
+
+    A function which opens the file explorer in the folder of report
+    snapshots, if there are any, otherwise in the Downloads folder.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    initial_directory = os.curdir # defaults to location where exe is stored
+    downloads_path = os.path.join(Path.home(), 'Downloads')
+    if os.path.exists(SNAPSHOT_DIRECTORY):
+        initial_directory = SNAPSHOT_DIRECTORY
+    elif os.path.exists(downloads_path):
+        initial_directory = downloads_path
+
+    ACCEPTED_FILETYPES = [
+        ('Report snapshot', f'*{SNAPSHOT_EXTENSION}'),
+        ('Comma-separated values', '*.csv'),
+        ('Microsoft Excel', '*.xlsx'),
+    ]
+    # if user closes out of filedialog prematurely, then file_path = ''
+    file_path = filedialog.askopenfilename(parent=root,
+                                           title='Compare with - jaq',
+                                           initialdir=initial_directory,
+                                           filetypes=ACCEPTED_FILETYPES)
+
+    compare_input.delete(0, 'end') # deletes previous text input
+    compare_input.insert(0, file_path)
+
+    return
+
+
+def find_batch_files(path : str) -> list:
+    """Finds the exports of a batch.
+
+    A function which expands a folder or a glob pattern
+    (i.e. "Downloads/invoice-export-*.csv") into the CSV and XLSX
+    files to be processed as one batch.
+
+    Args:
+        path (str): A folder path or glob pattern
+
+    Returns:
+        list: Returns a sorted list of export file paths, empty if the
+            path is not a folder or glob pattern
+    """
+
+    if os.path.isdir(path):
+        path = os.path.join(path, '*')
+    elif not glob.has_magic(path): # single file, not a batch
+        return []
+
+    # leaves out the lock files Excel keeps beside open workbooks
+    return sorted(file_path for file_path in glob.glob(path) \
+                  if os.path.splitext(file_path)[1].lower() \
+                    in ACCEPTED_EXTENSIONS \
+                  and not os.path.basename(file_path).startswith('~$') \
+                  and os.path.isfile(file_path))
+
+
 def column_exists(column_name : str, df : pd.DataFrame) -> bool:
     """Checks for a column's existence.
     
@@ -315,9 +632,303 @@ def column_exists(column_name : str, df : pd.DataFrame) -> bool:
     return True
 
 
+def parse_us_dates(date_column : pd.Series) -> tuple[pd.Series, list]:
+    """Parses a column of US dates.
+
+    A function which converts a column of MM/DD/YYYY dates to
+    datetimes in one vectorised pass with a fixed format. Dates
+    which cannot be parsed are collected instead of raising an
+    error partway through the column.
+
+    Args:
+        date_column (pd.Series): The raw date column from the CSV
+
+    Returns:
+        tuple[pd.Series, list]: Returns the parsed date column and a
+            list of the CSV row numbers with malformed dates (the
+            header being row 1), empty if every date is valid
+    """
+
+    # malformed and empty dates become NaT rather than raising an error
+    parsed_dates = pd.to_datetime(date_column,
+                                  format=US_DATE_FORMAT,
+                                  errors='coerce')
+    
+    # +2 converts from the 0-indexed DataFrame to the 1-indexed
+    # CSV rows, accounting for the header row
+    malformed_index = parsed_dates.index[parsed_dates.isna()]
+    malformed_rows = [int(index) + 2 for index in malformed_index]
+    return parsed_dates, malformed_rows
+
+
+def report_malformed_rows(status_msg : str,
+                          expected : str,
+                          malformed_rows : list,
+                          filename : str) -> None:
+    """Reports malformed rows of an export to the user.
+
+    Args:
+        status_msg (str): The short description of the problem
+        expected (str): The description of the expected values
+        malformed_rows (list): The CSV row numbers of the malformed rows
+        filename (str): The path to the export, used in error messages
+
+    Returns:
+        None
+    """
+
+    update_status(msg=status_msg,
+                  col=FAIL_COL,
+                  enter_state='normal')
+    shown_rows = ', '.join(str(row) for row \
+                           in malformed_rows[:MALFORMED_ROWS_SHOWN])
+    if len(malformed_rows) > MALFORMED_ROWS_SHOWN:
+        shown_rows += ', ...'
+    error_msg(f'{status_msg}\nExpected {expected}. See rows\n' \
+              f'{shown_rows}\nin \"{filename}\" to debug.')
+
+
+def find_malformed_distributions(distributions : pd.Series) -> list:
+    """Finds fund distributions which cannot be parsed.
+
+    A function which checks every invoice line against the expected
+    layout of one or more distributions in one vectorised pass.
+    Empty invoice lines are not considered malformed.
+
+    Args:
+        distributions (pd.Series): The raw fund distributions column
+
+    Returns:
+        list: Returns the CSV row numbers with malformed distributions
+            (the header being row 1), empty if every line is valid
+    """
+
+    is_valid = distributions.str.fullmatch(DISTRIBUTION_LINE_PATTERN)
+    is_malformed = ~is_valid.fillna(True).astype(bool) & \
+        (distributions.str.strip() != '')
+    # +2 converts from the 0-indexed DataFrame to the 1-indexed
+    # CSV rows, accounting for the header row
+    return [int(index) + 2 for index in distributions.index[is_malformed]]
+
+
+def split_distributions(distributions : pd.Series,
+                        cents_column : pd.Series) -> pd.DataFrame:
+    """Splits invoice lines into one row per fund distribution.
+
+    A function which extracts every distribution of every invoice line
+    into a long table in a single vectorised pass, then allocates the
+    cents of each line across its distributions by percentage, or by
+    the Cost of amount-type distributions (those without a "%"). The
+    last distribution of a line takes any remainder, so the
+    distributions of a line always sum exactly to the line's total.
+    Lines with no distributions are kept as a single row with blank
+    distribution columns.
+
+    Args:
+        distributions (pd.Series): The raw fund distributions column
+        cents_column (pd.Series): The total of each line in cents
+
+    Returns:
+        pd.DataFrame: Returns the distribution columns and allocated
+            cents, indexed by the row of the invoice line (repeated for
+            split lines) in the original row order
+    """
+
+    # one row per distribution, indexed by (line, match)
+    extracted = distributions.str.extractall(DISTRIBUTION_PATTERN)
+    extracted.columns = DISTRIBUTION_COLUMN_NAMES
+    line_index = extracted.index.get_level_values(0)
+
+    # allocates each line's cents by percentage, i.e. "50%" -> 50.0
+    percentage_used = extracted['Percentage Used'].str.strip()
+    percentages = pd.to_numeric(percentage_used.str.rstrip('%'),
+                                errors='coerce').fillna(0)
+    line_cents = pd.Series(cents_column.reindex(line_index).to_numpy(),
+                           index=extracted.index)
+    allocated_cents = (line_cents * percentages / 100).round().astype('int64')
+    # amount-type distributions take their own Cost, i.e. "$12.50"
+    is_amount = ~percentage_used.str.endswith('%')
+    if is_amount.any():
+        amount_cents = convert_to_cents(
+            extracted['Cost'].str.replace(r'[$,\s]', '', regex=True)
+        )
+        allocated_cents = allocated_cents.where(~is_amount, amount_cents)
+    # gives the remainder of each line to its last distribution
+    remainder_cents = line_cents - \
+        allocated_cents.groupby(level=0).transform('sum')
+    is_last = ~line_index.duplicated(keep='last')
+    extracted[CENTS_COLUMN_NAME] = \
+        allocated_cents + remainder_cents.where(is_last, 0)
+    extracted = extracted.droplevel(1)
+
+    # keeps lines without distributions whole, with blank columns
+    unsplit_lines = cents_column[~cents_column.index.isin(line_index)]
+    unsplit_df = pd.DataFrame('',
+                              index=unsplit_lines.index,
+                              columns=DISTRIBUTION_COLUMN_NAMES)
+    unsplit_df[CENTS_COLUMN_NAME] = unsplit_lines
+
+    # restores original row order, keeping distributions in order
+    long_df = pd.concat([extracted, unsplit_df])
+    return long_df.sort_index(kind='stable')
+
+
+def find_malformed_costs(cost_column : pd.Series) -> list:
+    """Finds currency amounts which cannot be parsed.
+
+    A function which checks every total against a numeric conversion
+    in one vectorised pass. Empty totals are not considered malformed,
+    as they are counted as 0 cents.
+
+    Args:
+        cost_column (pd.Series): The raw column of currency amounts
+
+    Returns:
+        list: Returns the CSV row numbers of the malformed totals (the
+            header being row 1), empty if every total is valid
+    """
+
+    costs = pd.to_numeric(cost_column, errors='coerce')
+    is_empty = cost_column.isna() \
+        | (cost_column.astype('string').str.strip() == '')
+    malformed_index = costs.index[costs.isna() & ~is_empty]
+    return [int(index) + 2 for index in malformed_index]
+
+
+def convert_to_cents(cost_column : pd.Series) -> pd.Series:
+    """Converts a column of currency to integer cents.
+
+    A function which parses a column of currency amounts into exact
+    int64 cents in a single vectorised conversion, so that all further
+    arithmetic is done on integers. Empty amounts become 0 cents.
+
+    Args:
+        cost_column (pd.Series): The raw column of currency amounts
+
+    Returns:
+        pd.Series: Returns the amounts as int64 cents
+    """
+
+    costs = pd.to_numeric(cost_column, errors='coerce').fillna(0)
+    # rounding after scaling recovers the exact cents of each amount,
+    # as currency is exported with at most two decimal places
+    return (costs * CENTS_PER_DOLLAR).round().astype('int64') \
+        .rename(CENTS_COLUMN_NAME)
+
+
 def extract_data_from_csv(filename : str) -> pd.DataFrame:
     """Extracts columns of data.
 
+    A function which reads the entire CSV file exported from FOLIO
+    and extracts the needed columns from it.
+
+    Args:
+        filename (str): The path to the CSV file exported from FOLIO
+
+    Returns:
+        pd.DataFrame: Returns a DataFrame with the extracted columns,
+            or an empty DataFrame if an error occurs
+    """
+
+    # skips parsing entirely if the export has been parsed before
+    report_stage('read')
+    cache_path = find_cache_path(filename)
+    cached_df = read_cached_export(cache_path)
+    if not cached_df.empty:
+        update_status(msg='Export parsed previously, using cached copy.')
+        return cached_df
+
+    raw_df = pd.read_csv(filename)
+    budget_df = prepare_budget_data(raw_df, filename)
+    if not budget_df.empty:
+        write_cached_export(cache_path, budget_df)
+    return budget_df
+
+
+def find_cache_path(filename : str) -> str:
+    """Finds the cache path of an export.
+
+    A function which builds the path of the cached copy of an export
+    from the SHA-256 hash of its contents and its modification time,
+    so that any change to the export leads to a different path, and
+    from CACHE_FORMAT_VERSION, so that copies parsed by older versions
+    of the program are never read.
+
+    Args:
+        filename (str): The path to the CSV file exported from FOLIO
+
+    Returns:
+        str: Returns the path to the cached copy, which may not exist
+    """
+
+    file_hash = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        while block := file.read(HASH_BLOCK_SIZE):
+            file_hash.update(block)
+    modified_time = os.stat(filename).st_mtime_ns
+    cache_name = f'{file_hash.hexdigest()}-{modified_time}' \
+        f'-v{CACHE_FORMAT_VERSION}{CACHE_FILE_EXTENSION}'
+    return os.path.join(CACHE_DIRECTORY, cache_name)
+
+
+def read_cached_export(cache_path : str) -> pd.DataFrame:
+    """Reads a cached copy of a parsed export.
+
+    Args:
+        cache_path (str): The path from find_cache_path()
+
+    Returns:
+        pd.DataFrame: Returns the parsed export, or an empty
+            DataFrame if there is no usable cached copy
+    """
+
+    if not os.path.exists(cache_path):
+        return pd.DataFrame()
+
+    # a missing pyarrow or a damaged cache file falls back to parsing
+    try:
+        return pd.read_feather(cache_path)
+    except CACHE_ERRORS:
+        return pd.DataFrame()
+
+
+def write_cached_export(cache_path : str, budget_df : pd.DataFrame) -> None:
+    """Writes a parsed export to the cache.
+
+    A function which stores the parsed, normalised columns of an
+    export in the Feather columnar format, then removes the oldest
+    cached copies past MAX_CACHED_EXPORTS. Caching is best-effort,
+    so failures are ignored.
+
+    Args:
+        cache_path (str): The path from find_cache_path()
+        budget_df (pd.DataFrame): The parsed export
+
+    Returns:
+        None
+    """
+
+    try:
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        budget_df.reset_index(drop=True).to_feather(cache_path)
+    except CACHE_ERRORS:
+        return # export is simply parsed again next time
+
+    # removes oldest cached copies
+    cached_paths = glob.glob(os.path.join(CACHE_DIRECTORY,
+                                          f'*{CACHE_FILE_EXTENSION}'))
+    cached_paths.sort(key=os.path.getmtime, reverse=True)
+    for old_path in cached_paths[MAX_CACHED_EXPORTS : ]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            ... # may be in use by another process, removed next time
+
+
+def prepare_budget_data(raw_df : pd.DataFrame,
+                        filename : str) -> pd.DataFrame:
+    """Prepares raw export data for processing.
+
     A function which: 
         1)  Ensures requisite data columns are present.
         2)  Once confirmed, splits up the needed columns and
@@ -325,65 +936,74 @@ def extract_data_from_csv(filename : str) -> pd.DataFrame:
             the program for further processing.
 
     Args:
-        filename (str): The path to the CSV file exported from FOLIO
+        raw_df (pd.DataFrame): The raw data (or a chunk of the raw data)
+            read from the export
+        filename (str): The path to the export, used in error messages
 
     Returns:
         pd.DataFrame: Returns a DataFrame with the extracted columns,
             or an empty DataFrame if an error occurs
     """
 
-    # checks to see if input file is formatted correctly
-    raw_df = pd.read_csv(filename)
-
     # checks total column
-    COST_COLUMN_NAME = 'Total'
     if not column_exists(COST_COLUMN_NAME, raw_df):
         return pd.DataFrame() # prematurely returns empty df
-    cost_column = raw_df[COST_COLUMN_NAME]
+    malformed_rows = find_malformed_costs(raw_df[COST_COLUMN_NAME])
+    if malformed_rows:
+        report_malformed_rows(f'{len(malformed_rows)} malformed total(s) ' \
+                              f'in \"{COST_COLUMN_NAME}\".',
+                              'numeric totals',
+                              malformed_rows,
+                              filename)
+        return pd.DataFrame() # prematurely returns empty df
+    # parses costs once, all further math is in integer cents
+    cents_column = convert_to_cents(raw_df[COST_COLUMN_NAME])
 
     # checks date column
     DATE_COLUMN_NAME = DATE_CUTOFF_COLUMN_NAME
     if not column_exists(DATE_COLUMN_NAME, raw_df):
         return pd.DataFrame() # prematurely returns empty df
-    # lambda function to convert us MM/DD/YYYY to Python datetime object
-    convert_us_to_dt = lambda us_date : datetime.strptime(us_date, '%m/%d/%Y')
-    # applies lambda over date column
-    date_column = raw_df[DATE_COLUMN_NAME].apply(convert_us_to_dt)
+    # converts US MM/DD/YYYY to datetimes over the whole column
+    report_stage('parse dates')
+    date_column, malformed_rows = parse_us_dates(raw_df[DATE_COLUMN_NAME])
+    if malformed_rows:
+        report_malformed_rows(f'{len(malformed_rows)} malformed date(s) ' \
+                              f'in \"{DATE_COLUMN_NAME}\".',
+                              'MM/DD/YYYY dates',
+                              malformed_rows,
+                              filename)
+        return pd.DataFrame() # prematurely returns empty df
     
     # checks long column
-    COLUMN_TO_BE_SPLIT = 'Invoice line fund distributions'
     if not column_exists(COLUMN_TO_BE_SPLIT, raw_df):
         return pd.DataFrame() # prematurely returns empty df
     
-    # splits column into component parts
+    # splits column into one row per fund distribution
+    report_stage('split')
     update_status(msg=f'\"{COLUMN_TO_BE_SPLIT}\" found, splitting column.')
-    # removes leading and trailing quotation marks
-    cleaned_column = raw_df[COLUMN_TO_BE_SPLIT].str.strip('\"')
-    # takes extracted column and splits along double quotes
-    split_columns = cleaned_column.str.split('\"\"', expand=True)
-    
-    # renames indexed columns to new column names
-    NEW_COLUMN_NAMES = {
-        0 : 'Code',
-        1 : 'Title',
-        2 : 'Percentage Used',
-        3 : 'Cost',
-    }
-    renamed_columns = None # scope resolution
-    try:
-        renamed_columns = split_columns.rename(columns=NEW_COLUMN_NAMES,
-                                              errors='raise')
-    except KeyError as e:
-        update_status(msg='More columns than expected.',
-                      col=FAIL_COL,
-                      enter_state='normal')
-        error_msg('More columns than expected.\n' \
-                  f'See \"{COLUMN_TO_BE_SPLIT}\" in\n' \
-                  f'\"{filename}\" to debug.\n\n{e}')
-        return pd.DataFrame()
+    distributions = raw_df[COLUMN_TO_BE_SPLIT].astype('string')
+    malformed_rows = find_malformed_distributions(distributions)
+    if malformed_rows:
+        report_malformed_rows(f'{len(malformed_rows)} malformed ' \
+                              'fund distribution(s) in ' \
+                              f'\"{COLUMN_TO_BE_SPLIT}\".',
+                              '"Code""Title""Percentage""Cost" ' \
+                              'distributions',
+                              malformed_rows,
+                              filename)
+        return pd.DataFrame() # prematurely returns empty df
+    split_df = split_distributions(distributions, cents_column)
 
-    # joins total column with split columns
-    merged_df = pd.concat([date_column, renamed_columns, cost_column], axis=1)
+    # joins date column (and invoice identifiers, if present) with split
+    # columns, repeating them for each distribution of a split line
+    id_columns = [column_name for column_name in INVOICE_ID_COLUMN_NAMES \
+                  if column_name in raw_df.columns]
+    merged_df = pd.concat([date_column.reindex(split_df.index),
+                           raw_df[id_columns].astype('string') \
+                            .reindex(split_df.index),
+                           split_df],
+                          axis=1)
+    merged_df = merged_df.reset_index(drop=True)
     
     # fills NaN with empty string, allows the rest of
     # the program to process exceptions and empty strings
@@ -391,103 +1011,1895 @@ def extract_data_from_csv(filename : str) -> pd.DataFrame:
     return filled_df
 
 
-def sum_costs(dataframe : pd.DataFrame) -> tuple[dict, dict]:
-    """Sums together costs of titles.
-    
-    A function which takes the values in the Cost column and
-    sums them together by the Title.
-    
+def stream_costs_from_csv(filename : str,
+                          cutoff_date : datetime,
+                          chunk_size : int = CSV_CHUNK_SIZE,
+                          by_period : bool = False,
+                          period_starts : list = None,
+                          with_lines : bool = False) -> dict | None:
+    """Sums together costs of titles while streaming the CSV.
+
+    A function which reads only the required columns of the CSV
+    exported from FOLIO, with explicit types, in fixed-size chunks.
+    Each chunk is prepared and summed, then folded into running
+    totals by Title, so that memory is bounded by the chunk size
+    rather than the size of the export.
+
     Args:
-        dataframe (pd.DataFrame): The extracted columns from the
-            raw CSV
-        
+        filename (str): The path to the CSV file exported from FOLIO
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        chunk_size (int): The number of rows read at a time
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        with_lines (bool): Also keeps the invoice lines if True
+
     Returns:
-        tuple[dict, dict]: Returns two dictionaries with Cost sums
-            broken down by Title, one with YTD expenditures and one
-            with "current" expenditures for the past month
+        dict | None: Returns the report sums, same as
+            summarize_export(), or None if an error occurs
     """
 
-    # initializes empty dict in which the sums will be collected
-    ytd_cost_sums = {}
-    current_cost_sums = {}
+    # checks the header before streaming, as reading
+    # missing columns would raise an error
+    header_df = pd.read_csv(filename, nrows=0)
+    for column_name in REQUIRED_COLUMN_DTYPES.keys():
+        if not column_exists(column_name, header_df):
+            return None
 
-    # iterates through each row and sums Cost by Title
-    # NOTE: you shouldn't have to check for the existence of the
-    # columns because the program will have stopped before then
-    # I may add in another check here if I have time or if the need
-    # arises but for right now it should be relatively safe to ignore
-    for _, row in dataframe.iterrows():
-        
-        ### UNPACKING INFORMATION
-
-        # checks for existence of Cost
-        if not row['Total']: # if no cost associated with row (i.e. empty)
-            continue # then skip to next row
-        # must convert to string first to preserve decimal places
-        cost = Decimal(str(row['Total']))
-
-        # unpacks Title
-        title = 'Miscellaneous' # scope resolution, default case
-        if row['Title']: # if Title not blank
-            title = row['Title']
-        
-        ### YTD EXPENDITURES
+    # invoice identifiers are only read when the lines are kept
+    column_dtypes = REQUIRED_COLUMN_DTYPES.copy()
+    if with_lines:
+        column_dtypes.update({column_name : str for column_name \
+                              in INVOICE_ID_COLUMN_NAMES \
+                              if column_name in header_df.columns})
+    reader = pd.read_csv(filename,
+                         usecols=list(column_dtypes.keys()),
+                         dtype=column_dtypes,
+                         chunksize=chunk_size)
+    with reader:
+        return sum_raw_chunks(reader,
+                              filename,
+                              cutoff_date,
+                              by_period,
+                              period_starts,
+                              with_lines)
 
-        # adds to sum, or starts sum if not present
-        if title in ytd_cost_sums.keys():
-            ytd_cost_sums[title] += cost # adds to running total
-        else: # title not in dictionary
-            ytd_cost_sums[title] = cost # initializes key and value
 
-        ### CURRENT EXPENDITURES
-        
-        cutoff_date = datetime.strptime(calendar.get_date(), DATETIME_FORMAT)
-        # if payment date is before cutoff
-        if row[DATE_CUTOFF_COLUMN_NAME] < cutoff_date:
-            continue # then continue to next iteration
+def read_xlsx_header(filename : str) -> pd.DataFrame:
+    """Reads the header of an export saved from Excel.
 
-        # if payment date is after cutoff, proceed to the following
-        if title in current_cost_sums.keys():
-            current_cost_sums[title] += cost # adds to running total
-        else: # title not in dictionary
-            current_cost_sums[title] = cost # initializes key and value
-    
-    # finds complement of subset (ytd keys missing from current)
-    # i.e. finds keys found in YTD costs dict and not in current costs dict
-    missing_keys = set(ytd_cost_sums.keys()) - set(current_cost_sums.keys())
+    Args:
+        filename (str): The path to the XLSX file
 
-    # fills in missing gaps to prevent KeyError during XLSX creation
-    for key in missing_keys:
-        current_cost_sums[key] = 0.0
+    Returns:
+        pd.DataFrame: Returns an empty DataFrame with the columns of
+            the first worksheet, as pd.read_csv(nrows=0) would
+    """
 
-    return (ytd_cost_sums, current_cost_sums)
+    # read-only workbooks keep the file open until closed
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    with closing(workbook):
+        header = next(workbook.worksheets[0].iter_rows(max_row=1,
+                                                       values_only=True),
+                      ())
+    return pd.DataFrame(columns=[str(name) for name in header])
 
 
-def generate_xlsx_report(file_path : str,
-                         ytd_cost_sums : dict,
-                         current_cost_sums : dict) -> str:
-    """Generates budget report as an XLSX file
-    
-    A function which takes the summed costs from the raw file
-    and formats and outputs it onto an XLSX file
-    
+def read_xlsx_chunks(filename : str,
+                     chunk_size : int = CSV_CHUNK_SIZE,
+                     with_lines : bool = False) \
+                        -> Generator[pd.DataFrame, None, None]:
+    """Streams the needed columns of an export saved from Excel.
+
+    A function which reads the first worksheet a row at a time through
+    a read-only workbook, keeping only the columns of
+    REQUIRED_COLUMN_DTYPES, so that memory is bounded by the chunk size
+    rather than the size of the workbook. The header must be checked
+    beforehand, see read_xlsx_header().
+
     Args:
-        file_path (str): the name of the original exported CSV
-        ytd_cost_sums (str): dict containing YTD expenditures
-        current_cost_sums (str): dict containing current monthly expenditures
-    
+        filename (str): The path to the XLSX file
+        chunk_size (int): The number of rows per chunk
+        with_lines (bool): Also reads the invoice identifiers, if
+            present, when True
+
     Returns:
-        str: Returns the name of the output XLSX file.
+        Generator[pd.DataFrame, None, None]: Yields chunks of the raw
+            export columns, indexed the same way as a CSV export
+    """
+
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+    with closing(workbook):
+        rows = enumerate(workbook.worksheets[0].iter_rows(values_only=True))
+        _, header = next(rows)
+        header = [str(name) for name in header]
+        column_names = list(REQUIRED_COLUMN_DTYPES.keys())
+        if with_lines:
+            column_names += [column_name for column_name \
+                             in INVOICE_ID_COLUMN_NAMES \
+                             if column_name in header]
+        column_indices = {column_name : header.index(column_name) \
+                          for column_name in column_names}
+
+        while chunk_rows := list(islice(rows, chunk_size)):
+            # row 1 is the header, so worksheet rows line up with CSV rows
+            raw_chunk = pd.DataFrame({
+                column_name : [row[column_index] \
+                               if column_index < len(row) else None \
+                               for _, row in chunk_rows] \
+                for column_name, column_index in column_indices.items()
+            }, index=[row_number - 1 for row_number, _ in chunk_rows])
+
+            # Excel stores dates as dates, FOLIO exports them as US text
+            raw_chunk[DATE_CUTOFF_COLUMN_NAME] = \
+                raw_chunk[DATE_CUTOFF_COLUMN_NAME].map(
+                    lambda value : value.strftime(US_DATE_FORMAT) \
+                        if isinstance(value, datetime) else value)
+            # blank rows are skipped, the same as blank lines of a CSV
+            yield raw_chunk.dropna(how='all')
+
+
+def stream_costs_from_xlsx(filename : str,
+                           cutoff_date : datetime,
+                           by_period : bool = False,
+                           period_starts : list = None,
+                           chunk_size : int = CSV_CHUNK_SIZE,
+                           with_lines : bool = False) -> dict | None:
+    """Summarizes an export saved from Excel in chunks.
+
+    A function which streams the needed columns of an XLSX export
+    through the same chunked aggregation as large CSV exports.
+
+    Args:
+        filename (str): The path to the XLSX file
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        chunk_size (int): The number of rows per chunk
+        with_lines (bool): Also keeps the invoice lines if True
+
+    Returns:
+        dict | None: Returns the report sums, same as
+            summarize_export(), or None if an error occurs
+    """
+
+    # checks the header before streaming, as reading
+    # missing columns would raise an error
+    header_df = read_xlsx_header(filename)
+    for column_name in REQUIRED_COLUMN_DTYPES.keys():
+        if not column_exists(column_name, header_df):
+            return None
+
+    return sum_raw_chunks(read_xlsx_chunks(filename, chunk_size, with_lines),
+                          filename,
+                          cutoff_date,
+                          by_period,
+                          period_starts,
+                          with_lines)
+
+
+def sum_raw_chunks(raw_chunks : Iterable[pd.DataFrame],
+                   source_name : str,
+                   cutoff_date : datetime,
+                   by_period : bool = False,
+                   period_starts : list = None,
+                   with_lines : bool = False) -> dict | None:
+    """Sums together costs of titles over chunks of raw data.
+
+    A function which prepares and sums each chunk of raw export
+    columns as it arrives, folding the sums into running totals by
+    Title. The chunks may come from a CSV file or from FOLIO itself.
+
+    Args:
+        raw_chunks (Iterable[pd.DataFrame]): Chunks of the raw export
+            columns, i.e. REQUIRED_COLUMN_DTYPES
+        source_name (str): The name of the data source, used in
+            error messages
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        with_lines (bool): Also keeps the invoice lines if True
+
+    Returns:
+        dict | None: Returns the report sums, same as
+            summarize_export(), or None if an error occurs
+    """
+
+    # running totals in integer cents
+    ytd_cents = pd.Series(dtype='int64')
+    current_cents = pd.Series(dtype='int64')
+    period_cents = pd.Series(dtype='int64',
+                             index=pd.MultiIndex.from_arrays([[], []]))
+    fund_cents = pd.DataFrame(columns=FUND_SUM_COLUMN_NAMES, dtype='int64')
+    line_chunks = [] # only the columns of the detail sheets are kept
+    # folds a chunk's sums into a running total
+    add_sums = lambda total, sums : \
+        pd.concat([total, sums]).groupby(level=0).sum()
+    add_period_sums = lambda total, sums : \
+        pd.concat([total, sums]).groupby(level=[0, 1], observed=True).sum()
+
+    report_stage('read') # each chunk is read as the loop continues
+    for chunk_number, raw_chunk in enumerate(raw_chunks, start=1):
+        if raw_chunk.empty:
+            continue # nothing to fold in, i.e. a page without invoice lines
+        update_status(msg=f'Processing chunk #{chunk_number} ' \
+                      f'({len(raw_chunk)} rows).')
+        budget_df = prepare_budget_data(raw_chunk, source_name)
+        if budget_df.empty:
+            # specific message found in above function
+            return None
+        report_stage('aggregate')
+        chunk_ytd_cents, chunk_current_cents = \
+            sum_cents(budget_df, cutoff_date)
+        ytd_cents = add_sums(ytd_cents, chunk_ytd_cents)
+        current_cents = add_sums(current_cents, chunk_current_cents)
+        fund_cents = add_sums(fund_cents, sum_fund_cents(budget_df,
+                                                         cutoff_date))
+        if with_lines:
+            line_chunks.append(select_invoice_lines(budget_df))
+        if by_period:
+            period_cents = add_period_sums(period_cents,
+                                           sum_period_cents(budget_df,
+                                                            period_starts))
+        report_stage('read')
+
+    report_sums = {
+        'ytd' : cents_to_dict(ytd_cents),
+        'current' : cents_to_dict(current_cents),
+        'funds' : fund_cents.sort_index(),
+    }
+    if by_period:
+        report_sums['periods'] = period_cents_to_matrix(period_cents)
+    if with_lines:
+        report_sums['lines'] = pd.concat(line_chunks, ignore_index=True) \
+            if line_chunks else pd.DataFrame(columns=LINE_COLUMN_NAMES)
+    return report_sums
+
+
+def select_invoice_lines(dataframe : pd.DataFrame) -> pd.DataFrame:
+    """Selects the invoice lines behind the sums of a report.
+
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV
+
+    Returns:
+        pd.DataFrame: Returns the rows with a cost, with only the
+            LINE_COLUMN_NAMES columns, blank if not in the export
+    """
+
+    has_cost = dataframe[CENTS_COLUMN_NAME] != 0
+    return dataframe.loc[has_cost].reindex(columns=LINE_COLUMN_NAMES,
+                                           fill_value='')
+
+
+def cents_to_dict(cent_sums : pd.Series) -> dict:
+    """Converts sums of integer cents to a dictionary.
+
+    Args:
+        cent_sums (pd.Series): Sums of integer cents indexed by Title
+
+    Returns:
+        dict: Returns the sums as Python integer cents by Title
+    """
+
+    return {title : int(cents) for title, cents in cent_sums.items()}
+
+
+def sum_costs(dataframe : pd.DataFrame,
+              cutoff_date : datetime) -> tuple[dict, dict]:
+    """Sums together costs of titles.
+    
+    A function which takes the values in the Cost column and
+    sums them together by the Title.
+    
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        
+    Returns:
+        tuple[dict, dict]: Returns two dictionaries with Cost sums
+            in integer cents broken down by Title, one with YTD
+            expenditures and one with "current" expenditures for
+            the past month
+    """
+
+    ytd_cents, current_cents = sum_cents(dataframe, cutoff_date)
+    return (cents_to_dict(ytd_cents), cents_to_dict(current_cents))
+
+
+def sum_cents(dataframe : pd.DataFrame,
+              cutoff_date : datetime) -> tuple[pd.Series, pd.Series]:
+    """Sums together costs of titles in integer cents.
+    
+    A function which takes the values in the Cost column and
+    sums them together by the Title. The sums are computed
+    over the whole column at once using exact integer cents,
+    rather than row by row.
+    
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        
+    Returns:
+        tuple[pd.Series, pd.Series]: Returns two Series of integer
+            cents indexed by Title, one with YTD expenditures and one
+            with "current" expenditures for the past month
+    """
+
+    # NOTE: you shouldn't have to check for the existence of the
+    # columns because the program will have stopped before then
+    # I may add in another check here if I have time or if the need
+    # arises but for right now it should be relatively safe to ignore
+
+    ### UNPACKING INFORMATION
+
+    # skips rows with no cost associated with them (i.e. empty)
+    has_cost = dataframe[CENTS_COLUMN_NAME] != 0
+    cents = dataframe.loc[has_cost, CENTS_COLUMN_NAME]
+
+    # unpacks Title, blank Titles are grouped as Miscellaneous
+    titles = dataframe.loc[has_cost, 'Title']
+    titles = titles.where(titles != '', 'Miscellaneous')
+
+    ### YTD EXPENDITURES
+    ytd_cents = cents.groupby(titles).sum()
+
+    ### CURRENT EXPENDITURES
+    # payments on or after the cutoff date count towards current costs,
+    # filling in the titles missing from the current costs with zero
+    # to prevent KeyError during XLSX creation
+    is_current = dataframe.loc[has_cost, DATE_CUTOFF_COLUMN_NAME] >= \
+        cutoff_date
+    current_cents = cents[is_current].groupby(titles[is_current]).sum()
+    current_cents = current_cents.reindex(ytd_cents.index, fill_value=0)
+
+    return (ytd_cents, current_cents)
+
+
+def sum_period_cents(dataframe : pd.DataFrame,
+                     period_starts : list = None) -> pd.Series:
+    """Sums together costs of titles by period in integer cents.
+
+    A function which labels every row with its period and sums the
+    Cost column by Title and period in a single grouped pass.
+
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV
+        period_starts (list): The start dates of custom periods, rows
+            before the first start are left out. Defaults to None,
+            which uses monthly periods
+
+    Returns:
+        pd.Series: Returns a Series of integer cents indexed by
+            Title and period label
+    """
+
+    has_cost = dataframe[CENTS_COLUMN_NAME] != 0
+    cents = dataframe.loc[has_cost, CENTS_COLUMN_NAME]
+    titles = dataframe.loc[has_cost, 'Title']
+    titles = titles.where(titles != '', 'Miscellaneous')
+    dates = dataframe.loc[has_cost, DATE_CUTOFF_COLUMN_NAME]
+
+    # labels each row by period in one vectorised pass
+    periods = None # scope resolution
+    if period_starts:
+        period_starts = sorted(pd.Timestamp(start) for start in period_starts)
+        period_labels = [start.strftime(DATETIME_FORMAT) \
+                         for start in period_starts]
+        periods = pd.cut(dates,
+                         bins=period_starts + [pd.Timestamp.max],
+                         right=False, # periods include their start date
+                         labels=period_labels)
+    else:
+        periods = dates.dt.to_period(PERIOD_FREQUENCY).astype(str)
+
+    # rows outside of every period are dropped by the groupby
+    return cents.groupby([titles, periods], observed=True).sum()
+
+
+def period_cents_to_matrix(period_cents : pd.Series) -> pd.DataFrame:
+    """Converts sums by Title and period to a fund-by-period matrix.
+
+    Args:
+        period_cents (pd.Series): Sums of integer cents indexed by
+            Title and period label
+
+    Returns:
+        pd.DataFrame: Returns a DataFrame of integer cents with one
+            row per Title and one column per period, in order
+    """
+
+    period_matrix = period_cents.unstack(fill_value=0).astype('int64')
+    period_matrix.columns = period_matrix.columns.astype(str)
+    return period_matrix.sort_index().sort_index(axis=1)
+
+
+def sum_fund_cents(dataframe : pd.DataFrame,
+                   cutoff_date : datetime) -> pd.DataFrame:
+    """Sums together costs of fund codes in integer cents.
+
+    A function which sums the YTD and "current" costs of every fund
+    code together in a single grouped pass over the rows.
+
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+
+    Returns:
+        pd.DataFrame: Returns a DataFrame of integer cents indexed by
+            Code, with YTD ('ytd') and current ('current') columns
+    """
+
+    has_cost = dataframe[CENTS_COLUMN_NAME] != 0
+    cents = dataframe.loc[has_cost, CENTS_COLUMN_NAME]
+    codes = dataframe.loc[has_cost, 'Code']
+    codes = codes.where(codes != '', 'Miscellaneous')
+    is_current = dataframe.loc[has_cost, DATE_CUTOFF_COLUMN_NAME] >= \
+        cutoff_date
+    return pd.DataFrame({
+        'ytd' : cents,
+        'current' : cents.where(is_current, 0),
+    }).groupby(codes).sum()
+
+
+def rollup_fund_cents(fund_cents : pd.DataFrame) -> pd.DataFrame:
+    """Rolls up the sums of fund codes to every level of the hierarchy.
+
+    A function which counts every fund code towards itself and each
+    of its parent codes, i.e. "LIB-BKS-GEN" towards "LIB-BKS" and
+    "LIB", then sums them in a single grouped aggregation. Only the
+    sums by fund code are rolled up, never the rows themselves.
+
+    Args:
+        fund_cents (pd.DataFrame): Sums by fund code from
+            sum_fund_cents()
+
+    Returns:
+        pd.DataFrame: Returns a DataFrame of integer cents indexed by
+            fund code, parents before their children, with the
+            0-indexed depth ('level') of each code and whether it has
+            children ('is_parent')
+    """
+
+    # lists every level of each fund code, i.e. [LIB, LIB-BKS, LIB-BKS-GEN]
+    code_levels = fund_cents.index.astype(str).to_series() \
+        .str.split(FUND_CODE_SEPARATOR)
+    parent_codes = code_levels.apply(
+        lambda levels : [FUND_CODE_SEPARATOR.join(levels[ : depth]) \
+                         for depth in range(1, len(levels) + 1)]).explode()
+    rollup_cents = fund_cents.loc[parent_codes.index] \
+        .groupby(parent_codes.values).sum().astype('int64')
+
+    # sorts level by level, so parents come before their children
+    sorted_codes = sorted(rollup_cents.index,
+                          key=lambda code : code.split(FUND_CODE_SEPARATOR))
+    rollup_cents = rollup_cents.loc[sorted_codes]
+    rollup_cents['level'] = rollup_cents.index.str.count(FUND_CODE_SEPARATOR)
+    rollup_cents['is_parent'] = rollup_cents.index.isin(
+        parent_codes[parent_codes.values != parent_codes.index].values)
+    return rollup_cents
+
+
+def summarize_export(filename : str,
+                     cutoff_date : datetime,
+                     by_period : bool = False,
+                     period_starts : list = None,
+                     with_lines : bool = False) -> dict | None:
+    """Summarizes an exported CSV or XLSX file.
+
+    A function which extracts and sums the costs of an export,
+    streaming exports saved from Excel and exports too large to
+    comfortably load at once.
+
+    Args:
+        filename (str): The path to the CSV or XLSX export
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        with_lines (bool): Also keeps the invoice lines if True
+
+    Returns:
+        dict | None: Returns the report sums, with the YTD ('ytd')
+            and current ('current') expenditure dictionaries in
+            integer cents, the sums by fund code ('funds'), if
+            by_period, the fund-by-period matrix ('periods') and, if
+            with_lines, the invoice lines ('lines'). Returns None if
+            an error occurs
+    """
+
+    # streams exports saved from Excel and large exports,
+    # summarizing chunk by chunk
+    if os.path.splitext(filename)[1].lower() == XLSX_EXTENSION:
+        return stream_costs_from_xlsx(filename,
+                                      cutoff_date,
+                                      by_period=by_period,
+                                      period_starts=period_starts,
+                                      with_lines=with_lines)
+    if os.path.getsize(filename) > STREAMING_THRESHOLD_BYTES:
+        return stream_costs_from_csv(filename,
+                                     cutoff_date,
+                                     by_period=by_period,
+                                     period_starts=period_starts,
+                                     with_lines=with_lines)
+
+    # validates column, then splits into separate columns
+    budget_df = extract_data_from_csv(filename)
+    if budget_df.empty:
+        return None # specific message found in above function
+    
+    # extracts and summarizes information into a dictionary
+    report_stage('aggregate')
+    ytd_cost_sums, current_cost_sums = sum_costs(budget_df, cutoff_date)
+    report_sums = {
+        'ytd' : ytd_cost_sums,
+        'current' : current_cost_sums,
+        'funds' : sum_fund_cents(budget_df, cutoff_date),
+    }
+    if by_period:
+        period_cents = sum_period_cents(budget_df, period_starts)
+        report_sums['periods'] = period_cents_to_matrix(period_cents)
+    if with_lines:
+        report_sums['lines'] = select_invoice_lines(budget_df)
+    return report_sums
+
+
+def open_ytd_store() -> sqlite3.Connection:
+    """Opens the store of running year-to-date totals.
+
+    A function which opens (creating if needed) the SQLite database
+    holding the per-fund code, per-subfund, per-day totals of every
+    invoice line counted towards each store key, along with the
+    watermark of each store key pulled from FOLIO, the time of its last
+    fetch. Totals kept by an older version of the tables are dropped,
+    to be counted again.
+
+    Args:
+        None
+
+    Returns:
+        sqlite3.Connection: Returns the open database
+    """
+
+    os.makedirs(os.path.dirname(YTD_STORE_PATH), exist_ok=True)
+    connection = sqlite3.connect(YTD_STORE_PATH)
+    with connection:
+        store_version = connection.execute('PRAGMA user_version').fetchone()[0]
+        if store_version != YTD_STORE_VERSION:
+            connection.execute('DROP TABLE IF EXISTS daily_totals')
+            connection.execute('DROP TABLE IF EXISTS line_totals')
+            connection.execute('DROP TABLE IF EXISTS watermarks')
+            connection.execute(f'PRAGMA user_version = {YTD_STORE_VERSION}')
+        connection.execute('CREATE TABLE IF NOT EXISTS line_totals (' \
+                           'store_key TEXT NOT NULL, ' \
+                           'line_key TEXT NOT NULL, ' \
+                           'code TEXT NOT NULL, ' \
+                           'title TEXT NOT NULL, ' \
+                           'day TEXT NOT NULL, ' \
+                           'cents INTEGER NOT NULL, ' \
+                           'PRIMARY KEY (store_key, line_key, code, ' \
+                           'title, day))')
+        connection.execute('CREATE TABLE IF NOT EXISTS watermarks (' \
+                           'store_key TEXT PRIMARY KEY, ' \
+                           'fetched_at TEXT NOT NULL)')
+    return connection
+
+
+def read_ytd_watermark(connection : sqlite3.Connection,
+                       store_key : str) -> datetime | None:
+    """Reads the time of the last FOLIO fetch of a store key.
+
+    Args:
+        connection (sqlite3.Connection): The store from open_ytd_store()
+        store_key (str): The running totals being read, i.e. "FY2025"
+
+    Returns:
+        datetime | None: Returns the watermark (in UTC), or None if
+            nothing has been fetched yet
+    """
+
+    row = connection.execute('SELECT fetched_at FROM watermarks ' \
+                             'WHERE store_key = ?',
+                             (store_key,)).fetchone()
+    if row is None:
+        return None
+    return datetime.fromisoformat(row[0])
+
+
+def find_line_keys(dataframe : pd.DataFrame) -> pd.Series:
+    """Identifies invoice lines by their invoice and line numbers.
+
+    Args:
+        dataframe (pd.DataFrame): The raw export columns, or the
+            extracted columns, including INVOICE_ID_COLUMN_NAMES
+
+    Returns:
+        pd.Series: Returns the key of the invoice line of each row
+    """
+
+    id_columns = dataframe[INVOICE_ID_COLUMN_NAMES].astype('string') \
+        .fillna('')
+    return (id_columns[INVOICE_ID_COLUMN_NAMES[0]] + '\t' + \
+            id_columns[INVOICE_ID_COLUMN_NAMES[1]]).rename('line_key')
+
+
+def sum_line_cents(dataframe : pd.DataFrame) -> pd.Series:
+    """Sums together costs of invoice lines by fund and day in cents.
+
+    Args:
+        dataframe (pd.DataFrame): The extracted columns from the
+            raw CSV, including INVOICE_ID_COLUMN_NAMES
+
+    Returns:
+        pd.Series: Returns sums of integer cents indexed by line key,
+            Code, Title and day (as DATETIME_FORMAT text)
+    """
+
+    titles = dataframe['Title'].where(dataframe['Title'] != '',
+                                      'Miscellaneous')
+    days = dataframe[DATE_CUTOFF_COLUMN_NAME].dt.strftime(DATETIME_FORMAT)
+    return dataframe[CENTS_COLUMN_NAME] \
+        .groupby([find_line_keys(dataframe),
+                  dataframe['Code'],
+                  titles,
+                  days]) \
+        .sum()
+
+
+def fold_into_ytd_store(connection : sqlite3.Connection,
+                        store_key : str,
+                        raw_chunks : Iterable[pd.DataFrame],
+                        source_name : str,
+                        watermark : datetime = None) -> bool:
+    """Folds new invoice lines into the running year-to-date totals.
+
+    A function which prepares and sums each chunk of raw export columns
+    by invoice line, fund code, subfund and day, then replaces the
+    totals of those invoice lines in a single transaction. Invoice lines
+    counted before are replaced rather than counted twice, i.e. FOLIO
+    invoices updated since the last fetch, so invoices are counted
+    whatever their date.
+
+    Args:
+        connection (sqlite3.Connection): The store from open_ytd_store()
+        store_key (str): The running totals being updated, i.e. "FY2025"
+        raw_chunks (Iterable[pd.DataFrame]): Chunks of the raw export
+            columns of the new or updated invoice lines, including
+            INVOICE_ID_COLUMN_NAMES
+        source_name (str): The name of the data source, used in
+            error messages
+        watermark (datetime): The new watermark of the store key,
+            recorded along with the totals if given
+
+    Returns:
+        bool: Returns True if the totals were updated, False if an
+            error occurs
+    """
+
+    line_sums = []
+    report_stage('read') # each chunk is read as the loop continues
+    for raw_chunk in raw_chunks:
+        if raw_chunk.empty:
+            continue # nothing to fold in
+        budget_df = prepare_budget_data(raw_chunk, source_name)
+        if budget_df.empty:
+            return False # specific message found in above function
+        report_stage('aggregate')
+        line_sums.append(sum_line_cents(budget_df))
+        report_stage('read')
+    line_cents = pd.Series(dtype='int64') # scope resolution
+    if line_sums:
+        line_cents = pd.concat(line_sums).groupby(level=[0, 1, 2, 3]).sum()
+    line_keys = line_cents.index.get_level_values(0).unique()
+    if line_cents.empty:
+        update_status(msg='No new invoice lines since the last report.')
+    else:
+        update_status(msg=f'Folding {len(line_keys)} new invoice lines ' \
+                      'into the running totals.')
+
+    # lines counted before are replaced in full
+    report_stage('aggregate') # last chance to cancel, totals stay untouched
+    with connection: # one transaction, rolled back if anything fails
+        connection.executemany('DELETE FROM line_totals ' \
+                               'WHERE store_key = ? AND line_key = ?',
+                               [(store_key, line_key) \
+                                for line_key in line_keys])
+        connection.executemany('INSERT INTO line_totals ' \
+                               'VALUES (?, ?, ?, ?, ?, ?)',
+                               [(store_key,
+                                 line_key,
+                                 code,
+                                 title,
+                                 day,
+                                 int(cents)) \
+                                for (line_key, code, title, day), cents \
+                                in line_cents.items()])
+        if watermark is not None:
+            connection.execute('INSERT OR REPLACE INTO watermarks ' \
+                               'VALUES (?, ?)',
+                               (store_key, watermark.isoformat()))
+    return True
+
+
+def summarize_ytd_store(connection : sqlite3.Connection,
+                        store_key : str,
+                        cutoff_date : datetime,
+                        by_period : bool = False,
+                        period_starts : list = None) -> dict:
+    """Summarizes the running year-to-date totals of a store key.
+
+    A function which reads the per-day totals back as one row per
+    fund code, subfund and day, then sums them the same way as an
+    export, so the cost is proportional to the number of days rather
+    than invoices.
+
+    Args:
+        connection (sqlite3.Connection): The store from open_ytd_store()
+        store_key (str): The running totals being read, i.e. "FY2025"
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+
+    Returns:
+        dict: Returns the report sums, same as summarize_export()
+    """
+
+    daily_df = pd.read_sql_query('SELECT code, title, day, ' \
+                                 'SUM(cents) AS cents FROM line_totals ' \
+                                 'WHERE store_key = ? ' \
+                                 'GROUP BY code, title, day',
+                                 connection,
+                                 params=(store_key,))
+    budget_df = pd.DataFrame({
+        DATE_CUTOFF_COLUMN_NAME : pd.to_datetime(daily_df['day'],
+                                                 format=DATETIME_FORMAT),
+        'Code' : daily_df['code'],
+        'Title' : daily_df['title'],
+        CENTS_COLUMN_NAME : daily_df['cents'].astype('int64'),
+    })
+
+    ytd_cost_sums, current_cost_sums = sum_costs(budget_df, cutoff_date)
+    report_sums = {
+        'ytd' : ytd_cost_sums,
+        'current' : current_cost_sums,
+        'funds' : sum_fund_cents(budget_df, cutoff_date),
+    }
+    if by_period:
+        period_cents = sum_period_cents(budget_df, period_starts)
+        report_sums['periods'] = period_cents_to_matrix(period_cents)
+    return report_sums
+
+
+def write_report_snapshot(source_name : str,
+                          cutoff_date : datetime,
+                          report_sums : dict) -> None:
+    """Keeps the sums of a report as a snapshot.
+
+    A function which writes the year-to-date and current expenditures
+    of a report to SNAPSHOT_DIRECTORY, named after its source and cutoff
+    date, so that later reports can be compared against it without the
+    original export. Exports are also named by a hash of their full
+    path, so that same-named exports of different folders are kept
+    apart. Snapshots are best-effort, so failures are ignored.
+
+    Args:
+        source_name (str): The export or FOLIO fiscal year reported on
+        cutoff_date (datetime): The cutoff date of the report
+        report_sums (dict): The report sums, see summarize_export()
+
+    Returns:
+        None
+    """
+
+    basename, _ = os.path.splitext(os.path.basename(source_name))
+    if os.path.exists(source_name):
+        path_hash = hashlib.sha256(os.path.abspath(source_name).encode())
+        basename += f'-{path_hash.hexdigest()[ : SNAPSHOT_HASH_LENGTH]}'
+    cutoff_str = cutoff_date.strftime(DATETIME_FORMAT)
+    snapshot_path = os.path.join(SNAPSHOT_DIRECTORY,
+                                 f'{basename}-{cutoff_str}{SNAPSHOT_EXTENSION}')
+    try:
+        os.makedirs(SNAPSHOT_DIRECTORY, exist_ok=True)
+        with open(snapshot_path, 'w') as snapshot_file:
+            json.dump({
+                'source' : source_name,
+                'cutoff_date' : cutoff_str,
+                'ytd' : report_sums['ytd'],
+                'current' : report_sums['current'],
+            }, snapshot_file, indent=4)
+    except OSError:
+        ... # the report itself was still generated
+
+
+def read_report_snapshot(snapshot_path : str) -> dict | None:
+    """Reads the sums of a report kept by write_report_snapshot().
+
+    Args:
+        snapshot_path (str): The path to the snapshot
+
+    Returns:
+        dict | None: Returns the YTD ('ytd') and current ('current')
+            expenditure dictionaries in integer cents, or None if the
+            snapshot cannot be read
+    """
+
+    try:
+        with open(snapshot_path, 'r') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        return {
+            'ytd' : {title : int(cents) for title, cents \
+                     in snapshot['ytd'].items()},
+            'current' : {title : int(cents) for title, cents \
+                         in snapshot['current'].items()},
+        }
+    except (OSError, ValueError, KeyError, AttributeError) as e:
+        status_msg = 'Cannot read the report snapshot.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{snapshot_path}\n{e}')
+        return None
+
+
+def diff_report_sums(report_sums : dict,
+                     baseline_sums : dict) -> pd.DataFrame:
+    """Compares the sums of a report with those of a baseline report.
+
+    A function which lines up the subfunds of both reports in a single
+    outer join, subfunds missing from either being 0, then computes
+    the change of each subfund over whole columns at once.
+
+    Args:
+        report_sums (dict): The report sums, see summarize_export()
+        baseline_sums (dict): The sums compared against, i.e. from an
+            earlier export or read_report_snapshot()
+
+    Returns:
+        pd.DataFrame: Returns one row per subfund, with the baseline,
+            report and change in integer cents and the change as a
+            fraction of the baseline (NaN if the baseline is 0) of
+            both the YTD and current expenditures
+    """
+
+    SUM_NAMES = ['ytd', 'current']
+    sums_frame = lambda sums : \
+        pd.DataFrame({sum_name : pd.Series(sums[sum_name], dtype='int64') \
+                      for sum_name in SUM_NAMES})
+    joined_cents = sums_frame(baseline_sums) \
+        .join(sums_frame(report_sums), how='outer', lsuffix='_baseline') \
+        .fillna(0) \
+        .astype('int64') \
+        .sort_index()
+
+    variance_cents = pd.DataFrame(index=joined_cents.index)
+    for sum_name in SUM_NAMES:
+        baseline = joined_cents[f'{sum_name}_baseline']
+        change = joined_cents[sum_name] - baseline
+        variance_cents[f'{sum_name}_baseline'] = baseline
+        variance_cents[sum_name] = joined_cents[sum_name]
+        variance_cents[f'{sum_name}_change'] = change
+        variance_cents[f'{sum_name}_percent'] = change / baseline.where(
+            baseline != 0)
+    return variance_cents
+
+
+def compare_report_sums(report_sums : dict,
+                        baseline_path : str,
+                        cutoff_date : datetime) -> pd.DataFrame | None:
+    """Compares the sums of a report with an export or a snapshot.
+
+    Args:
+        report_sums (dict): The report sums, see summarize_export()
+        baseline_path (str): The CSV or XLSX export, or the snapshot,
+            compared against
+        cutoff_date (datetime): The cutoff date of the baseline export,
+            unused for snapshots, which keep their own
+
+    Returns:
+        pd.DataFrame | None: Returns the variance from diff_report_sums(),
+            or None if an error occurs
+    """
+
+    if not os.path.isfile(baseline_path):
+        status_msg = 'File to compare with not found.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{baseline_path}')
+        return None
+    update_status(msg=f'Comparing with {os.path.basename(baseline_path)}.')
+    baseline_sums = None # scope resolution
+    if baseline_path.lower().endswith(SNAPSHOT_EXTENSION):
+        baseline_sums = read_report_snapshot(baseline_path)
+    else:
+        baseline_sums = summarize_export(baseline_path, cutoff_date)
+    if baseline_sums is None:
+        return None # specific message found in above function
+    return diff_report_sums(report_sums, baseline_sums)
+
+
+def login_folioclient(config_name : str) -> folioclient.FolioClient:
+    """Organizes initial handshake with FOLIOClient.
+    
+    A function which handles the possible exceptions on start-up
+    and, if everything is in order, logs into the FOLIOClient API.
+    
+    Args:
+        config_name (str): The path to the config.json file
+    
+    Returns:
+        FolioClient: Returns an API object to the FOLIOClient
+    """
+
+    # checks for existence of config.json file, notifies user if none available
+    if not os.path.exists(config_name):
+        with open(config_name, 'w') as config_template:
+            json.dump(REQUIRED_CONFIG_KEYS, config_template, indent=4)
+        status_msg = f'\"{config_name}\" not detected.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg} Creating template \"{config_name}\".')
+        return
+
+    # Setup FOLIO variables
+    login = None # scope resolution
+    with open(config_name ,'r') as config:
+        login = json.load(config)
+
+    # checks to ensure config file is set up correctly
+    required_key_names = set(REQUIRED_CONFIG_KEYS.keys())
+    # if required keys not in login
+    if not required_key_names.issubset(set(login.keys())):
+        update_status(msg=f'\"{config_name}\" improperly set up.',
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'\"{config_name}\" improperly set up.\nPlease check keys.' \
+                  f'\nDetected keys: {set(login.keys())}' \
+                  f'\nRequired keys: {required_key_names}')
+        return
+
+    # unpacks relevant data from config.json file
+    okapi_url = login['okapi_url']
+    tenant = login['tenant']
+    username = login['username']
+    password = login['password']
+
+    # attempts FOLIO API handshake
+    f = None # scope resolution
+    try:
+        f = folioclient.FolioClient(okapi_url, tenant, username, password)
+    except Exception as e:
+        status_msg = f'Cannot connect to FolioClient. Try again.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{e}')
+
+    return f
+
+
+def fetch_folio_pages(f : folioclient.FolioClient,
+                      path : str,
+                      key : str,
+                      query : str,
+                      executor : ThreadPoolExecutor) -> Generator[list,
+                                                                  None,
+                                                                  None]:
+    """Fetches every page of records matching a query.
+
+    A function which fetches the first page to learn the total number
+    of records, then fetches the remaining pages concurrently, yielding
+    each page of records in order.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        path (str): The API endpoint, i.e. "/invoice/invoices"
+        key (str): The key of the records in each response
+        query (str): The CQL query the records must match
+        executor (ThreadPoolExecutor): The threads fetching the pages
+
+    Returns:
+        Generator[list, None, None]: Yields each page of records
+    """
+
+    # sorts by ID so that pages neither overlap nor skip records
+    sorted_query = f'{query} sortBy id'
+    fetch_page = lambda offset : f.folio_get(path,
+                                            query_params={
+                                                'query' : sorted_query,
+                                                'limit' : FOLIO_PAGE_SIZE,
+                                                'offset' : offset,
+                                            })
+
+    first_page = fetch_page(0)
+    yield first_page.get(key, [])
+    remaining_offsets = range(FOLIO_PAGE_SIZE,
+                              first_page.get('totalRecords', 0),
+                              FOLIO_PAGE_SIZE)
+    for page in executor.map(fetch_page, remaining_offsets):
+        yield page.get(key, [])
+
+
+def fetch_fiscal_year_id(f : folioclient.FolioClient,
+                         fiscal_year_code : str) -> str | None:
+    """Finds the ID of a fiscal year.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_code (str): The code of the fiscal year, i.e. "FY2025"
+
+    Returns:
+        str | None: Returns the ID of the fiscal year, or None if no
+            fiscal year has that code
+    """
+
+    fiscal_years = f.folio_get('/finance/fiscal-years',
+                               'fiscalYears',
+                               query_params={
+                                   'query' : f'code==\"{fiscal_year_code}\"',
+                                   'limit' : 1,
+                               })
+    if not fiscal_years:
+        return None
+    return fiscal_years[0]['id']
+
+
+def fetch_expense_class_names(f : folioclient.FolioClient) -> dict:
+    """Fetches the names of every expense class.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+
+    Returns:
+        dict: Returns the expense class names by ID
+    """
+
+    expense_classes = f.folio_get_all('/finance/expense-classes',
+                                      'expenseClasses',
+                                      limit=FOLIO_PAGE_SIZE)
+    return {expense_class['id'] : expense_class.get('name', '') \
+            for expense_class in expense_classes}
+
+
+def format_fund_distributions(invoice_line : dict,
+                              expense_class_names : dict) -> str:
+    """Formats the fund distributions of an invoice line.
+
+    A function which writes the fund distributions of an invoice line
+    the same way as the "Invoice line fund distributions" column of
+    the CSV exported from FOLIO, i.e.
+    "Code""Expense class""Percentage""Cost" | ...
+
+    Args:
+        invoice_line (dict): The invoice line from the FOLIO API
+        expense_class_names (dict): The expense class names by ID
+
+    Returns:
+        str: Returns the formatted fund distributions
+    """
+
+    line_total = invoice_line.get('total', 0)
+    formatted_distributions = []
+    for distribution in invoice_line.get('fundDistributions', []):
+        # distributions are either a percentage or an amount of the total
+        value = distribution.get('value', 0)
+        percentage = value
+        amount = line_total * value / 100
+        if distribution.get('distributionType') == 'amount':
+            percentage = value / line_total * 100 if line_total else 0
+            amount = value
+
+        # removes quotation marks, which separate the fields
+        code = distribution.get('code', '').replace('\"', '')
+        expense_class = expense_class_names.get(
+            distribution.get('expenseClassId'),
+            ''
+        ).replace('\"', '')
+        formatted_distributions.append(f'\"{code}\"\"{expense_class}\"' \
+                                       f'\"{percentage:g}%\"\"${amount:.2f}\"')
+
+    return ' | '.join(formatted_distributions)
+
+
+def format_invoice_date(iso_date : str) -> str:
+    """Converts a FOLIO date to the US format of the CSV export.
+
+    Args:
+        iso_date (str): The ISO 8601 date from the FOLIO API
+
+    Returns:
+        str: Returns the date as MM/DD/YYYY, or an empty string
+            if the date is missing or malformed
+    """
+
+    try:
+        # only the date itself is needed, timezones are ignored
+        return datetime.fromisoformat(iso_date[:10]).strftime(US_DATE_FORMAT)
+    except ValueError:
+        return ''
+
+
+def read_folio_invoice_chunks(f : folioclient.FolioClient,
+                              fiscal_year_id : str,
+                              executor : ThreadPoolExecutor,
+                              since : datetime = None) \
+                                -> Generator[pd.DataFrame, None, None]:
+    """Reads the invoice lines of a fiscal year from FOLIO.
+
+    A function which fetches the invoices of a fiscal year a page at a
+    time, then fetches the lines of each page of invoices concurrently
+    in batches of invoice IDs. Each page is yielded as the same columns
+    read from a CSV export, so no intermediate file is written.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_id (str): The ID of the fiscal year
+        executor (ThreadPoolExecutor): The threads fetching the pages
+        since (datetime): Only fetches invoices updated on or after
+            this time (in UTC) if given
+
+    Returns:
+        Generator[pd.DataFrame, None, None]: Yields the raw export
+            columns of each page of invoices
+    """
+
+    expense_class_names = fetch_expense_class_names(f)
+    fetch_invoice_lines = lambda invoice_ids : \
+        list(f.folio_get_all('/invoice/invoice-lines',
+                             'invoiceLines',
+                             query=f'invoiceId==({" or ".join(invoice_ids)})',
+                             limit=FOLIO_PAGE_SIZE))
+
+    invoice_query = f'fiscalYearId==\"{fiscal_year_id}\"'
+    if since is not None:
+        invoice_query += ' and metadata.updatedDate>=' \
+            f'\"{since.strftime(FOLIO_TIMESTAMP_FORMAT)}\"'
+    invoice_pages = fetch_folio_pages(f,
+                                      '/invoice/invoices',
+                                      'invoices',
+                                      invoice_query,
+                                      executor)
+    for invoices in invoice_pages:
+        invoice_dates = {invoice['id'] : \
+                         format_invoice_date(invoice.get('invoiceDate', '')) \
+                         for invoice in invoices}
+        invoice_numbers = {invoice['id'] : invoice.get('vendorInvoiceNo', '') \
+                           for invoice in invoices}
+        invoice_ids = list(invoice_dates.keys())
+        id_batches = [invoice_ids[start : start + FOLIO_ID_BATCH_SIZE] \
+                      for start \
+                      in range(0, len(invoice_ids), FOLIO_ID_BATCH_SIZE)]
+        invoice_lines = [invoice_line \
+                         for batch_lines \
+                         in executor.map(fetch_invoice_lines, id_batches) \
+                         for invoice_line in batch_lines]
+
+        # arranges the invoice lines as the columns of a CSV export
+        totals = [line.get('total', 0) for line in invoice_lines]
+        dates = [invoice_dates[line['invoiceId']] for line in invoice_lines]
+        distributions = [format_fund_distributions(line, expense_class_names) \
+                         for line in invoice_lines]
+        raw_chunk = pd.DataFrame({
+            COST_COLUMN_NAME : totals,
+            DATE_CUTOFF_COLUMN_NAME : dates,
+            COLUMN_TO_BE_SPLIT : distributions,
+            INVOICE_ID_COLUMN_NAMES[0] : [invoice_numbers[line['invoiceId']] \
+                                          for line in invoice_lines],
+            INVOICE_ID_COLUMN_NAMES[1] : [line.get('invoiceLineNumber', '') \
+                                          for line in invoice_lines],
+        })
+        yield raw_chunk.astype(REQUIRED_COLUMN_DTYPES)
+
+
+def summarize_folio_invoices(f : folioclient.FolioClient,
+                             fiscal_year_code : str,
+                             cutoff_date : datetime,
+                             by_period : bool = False,
+                             period_starts : list = None,
+                             incremental : bool = False,
+                             with_lines : bool = False) -> dict | None:
+    """Summarizes the invoices of a fiscal year straight from FOLIO.
+
+    A function which streams the invoice lines of a fiscal year from
+    the FOLIO invoice APIs into the same sums as an exported CSV file,
+    without the export.
+
+    NOTE: f must already be entered (i.e. "with f:"), so that every
+    thread shares its HTTP session instead of each request opening and
+    closing a session of its own, which is not thread-safe.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_code (str): The code of the fiscal year, i.e. "FY2025"
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        incremental (bool): Only fetches invoices updated since the
+            last fetch, adding them to the running totals of the
+            fiscal year, if True
+        with_lines (bool): Also keeps the invoice lines if True, unless
+            incremental, as running totals do not keep invoice lines
+
+    Returns:
+        dict | None: Returns the report sums, same as
+            summarize_export(), or None if an error occurs
+    """
+
+    source_name = f'FOLIO fiscal year {fiscal_year_code}'
+    report_sums = None # scope resolution
+    try:
+        update_status(msg=f'Querying FOLIO API for {fiscal_year_code}.')
+        fiscal_year_id = fetch_fiscal_year_id(f, fiscal_year_code)
+        if fiscal_year_id is None:
+            status_msg = f'Fiscal year \"{fiscal_year_code}\" not found.'
+            update_status(msg=status_msg,
+                          col=FAIL_COL,
+                          enter_state='normal')
+            error_msg(f'{status_msg}\nPlease check the fiscal year code ' \
+                      '(i.e. FY2025).')
+            return None
+
+        with ThreadPoolExecutor(max_workers=FOLIO_MAX_WORKERS) as executor:
+            if incremental:
+                report_sums = summarize_folio_invoices_incrementally(
+                    f,
+                    fiscal_year_code,
+                    fiscal_year_id,
+                    executor,
+                    cutoff_date,
+                    by_period,
+                    period_starts
+                )
+            else:
+                raw_chunks = read_folio_invoice_chunks(f,
+                                                       fiscal_year_id,
+                                                       executor)
+                report_sums = sum_raw_chunks(raw_chunks,
+                                             source_name,
+                                             cutoff_date,
+                                             by_period,
+                                             period_starts,
+                                             with_lines)
+    except ReportCancelled:
+        raise # not a FOLIO error, stops the report
+    except Exception as e:
+        status_msg = 'Cannot retrieve invoices from FOLIO. Try again.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{e}')
+        return None
+
+    if report_sums is not None and not report_sums['ytd']:
+        status_msg = f'No invoice lines found in {source_name}.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(status_msg)
+        return None
+    return report_sums
+
+
+def fetch_fiscal_year_code(f : folioclient.FolioClient,
+                           date : datetime) -> str | None:
+    """Finds the code of the fiscal year containing a date.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        date (datetime): The date within the fiscal year
+
+    Returns:
+        str | None: Returns the code of the fiscal year, i.e. "FY2025",
+            or None if no fiscal year contains the date
+    """
+
+    iso_date = date.strftime(DATETIME_FORMAT)
+    fiscal_years = f.folio_get('/finance/fiscal-years',
+                               'fiscalYears',
+                               query_params={
+                                   'query' : 'periodStart<=' \
+                                       f'\"{iso_date}T23:59:59\" and ' \
+                                       'periodEnd>=' \
+                                       f'\"{iso_date}T00:00:00\"',
+                                   'limit' : 1,
+                               })
+    if not fiscal_years:
+        return None
+    return fiscal_years[0]['code']
+
+
+def fetch_finance_cents(f : folioclient.FolioClient,
+                        fiscal_year_id : str,
+                        executor : ThreadPoolExecutor) -> pd.DataFrame:
+    """Fetches the appropriations and encumbrances of each fund code.
+
+    A function which fetches every budget of a fiscal year, then the
+    codes of their funds concurrently, in batches of IDs. FOLIO
+    allocates money to funds rather than to expense classes, so the
+    finance is kept by fund code, same as the fund code rollups.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_id (str): The ID of the fiscal year
+        executor (ThreadPoolExecutor): The threads fetching the pages
+
+    Returns:
+        pd.DataFrame: Returns the appropriations and encumbrances
+            (FINANCE_COLUMN_NAMES) in integer cents, indexed by fund code
+    """
+
+    budgets = [budget \
+               for page in fetch_folio_pages(f,
+                                             '/finance/budgets',
+                                             'budgets',
+                                             'fiscalYearId==' \
+                                                f'\"{fiscal_year_id}\"',
+                                             executor) \
+               for budget in page]
+
+    # fetches the funds of the budgets in batches of IDs
+    fund_ids = [budget['fundId'] for budget in budgets]
+    id_batches = [fund_ids[start : start + FOLIO_ID_BATCH_SIZE] \
+                  for start in range(0, len(fund_ids), FOLIO_ID_BATCH_SIZE)]
+    fetch_funds = lambda ids : \
+        f.folio_get('/finance/funds',
+                    'funds',
+                    query_params={
+                        'query' : f'id==({" or ".join(ids)})',
+                        'limit' : len(ids),
+                    })
+    fund_codes = {fund['id'] : fund.get('code', '') \
+                  for funds in executor.map(fetch_funds, id_batches) \
+                  for fund in funds}
+
+    # sums the budgets of each fund code in integer cents
+    finance_df = pd.DataFrame({
+        FINANCE_COLUMN_NAMES[0] : [budget.get('allocated', 0) \
+                                   for budget in budgets],
+        FINANCE_COLUMN_NAMES[1] : [budget.get('encumbered', 0) \
+                                   for budget in budgets],
+    }, dtype='float64').apply(convert_to_cents)
+    codes = pd.Series([fund_codes.get(budget['fundId'], '') \
+                       for budget in budgets],
+                      dtype=object)
+    codes = codes.where(codes != '', 'Miscellaneous')
+    finance_cents = finance_df.groupby(codes).sum()
+    return finance_cents[(finance_cents != 0).any(axis=1)]
+
+
+def load_finance_cents(f : folioclient.FolioClient,
+                       fiscal_year_code : str) -> pd.DataFrame | None:
+    """Loads the appropriations and encumbrances of a fiscal year.
+
+    A function which reuses the finance of a fiscal year fetched
+    within the past FINANCE_CACHE_TTL seconds from the same FOLIO
+    tenant, otherwise fetches it from the FOLIO finance APIs and
+    caches it.
+
+    NOTE: f must already be entered (i.e. "with f:"), see
+    summarize_folio_invoices().
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_code (str): The code of the fiscal year, i.e. "FY2025"
+
+    Returns:
+        pd.DataFrame | None: Returns the appropriations and encumbrances
+            in integer cents by fund code, or None if an error occurs
+    """
+
+    # reuses recently fetched finance, a damaged cache file or one from
+    # an older version is refetched, tenants sharing fiscal year codes
+    # are told apart by a hash of their URL and tenant
+    tenant_hash = hashlib.sha256(f'{f.okapi_url}\t{f.tenant_id}'.encode()) \
+        .hexdigest()[ : TENANT_HASH_LENGTH]
+    cache_path = os.path.join(CACHE_DIRECTORY,
+                              f'finance-{fiscal_year_code}-{tenant_hash}' \
+                              f'-v{CACHE_FORMAT_VERSION}.json')
+    try:
+        if time.time() - os.path.getmtime(cache_path) < FINANCE_CACHE_TTL:
+            with open(cache_path, 'r') as cache_file:
+                finance_cents = pd.DataFrame(json.load(cache_file),
+                                             columns=FINANCE_COLUMN_NAMES)
+            update_status(msg=f'Finance for {fiscal_year_code} fetched ' \
+                          'recently, using cached copy.')
+            return finance_cents.fillna(0).astype('int64')
+    except (OSError, ValueError):
+        ... # fetched again below
+
+    finance_cents = None # scope resolution
+    try:
+        update_status(msg=f'Querying FOLIO finance for {fiscal_year_code}.')
+        fiscal_year_id = fetch_fiscal_year_id(f, fiscal_year_code)
+        if fiscal_year_id is None:
+            status_msg = f'Fiscal year \"{fiscal_year_code}\" not found.'
+            update_status(msg=status_msg,
+                          col=FAIL_COL,
+                          enter_state='normal')
+            error_msg(f'{status_msg}\nPlease check the fiscal year code ' \
+                      '(i.e. FY2025).')
+            return None
+
+        with ThreadPoolExecutor(max_workers=FOLIO_MAX_WORKERS) as executor:
+            finance_cents = fetch_finance_cents(f, fiscal_year_id, executor)
+    except Exception as e:
+        status_msg = 'Cannot retrieve finance from FOLIO. Try again.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{e}')
+        return None
+
+    # caching is best-effort, finance is simply fetched again next time
+    try:
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        with open(cache_path, 'w') as cache_file:
+            json.dump({column_name : cents_to_dict(finance_cents[column_name]) \
+                       for column_name in FINANCE_COLUMN_NAMES},
+                      cache_file,
+                      indent=4)
+    except OSError:
+        ...
+
+    return finance_cents
+
+
+def summarize_folio_invoices_incrementally(f : folioclient.FolioClient,
+                                           fiscal_year_code : str,
+                                           fiscal_year_id : str,
+                                           executor : ThreadPoolExecutor,
+                                           cutoff_date : datetime,
+                                           by_period : bool = False,
+                                           period_starts : list = None) \
+                                            -> dict | None:
+    """Adds new FOLIO invoices to the running totals of a fiscal year.
+
+    A function which fetches only the invoices updated since the
+    watermark of the fiscal year (the time of its last fetch), folds
+    them into its running year-to-date totals, then summarizes those
+    totals. Invoices are fetched by when they were updated rather than
+    by their date, so back-dated invoices are counted as well.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        fiscal_year_code (str): The code of the fiscal year, i.e. "FY2025"
+        fiscal_year_id (str): The ID of the fiscal year
+        executor (ThreadPoolExecutor): The threads fetching the pages
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Also sums costs by period if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+
+    Returns:
+        dict | None: Returns the report sums, same as
+            summarize_export(), or None if an error occurs
+    """
+
+    with closing(open_ytd_store()) as connection:
+        # the new watermark is taken before fetching, so that invoices
+        # updated during the fetch are fetched again next time
+        watermark = read_ytd_watermark(connection, fiscal_year_code)
+        new_watermark = datetime.now(timezone.utc)
+        since = None # scope resolution
+        if watermark is not None:
+            since = watermark - FOLIO_WATERMARK_OVERLAP
+        raw_chunks = read_folio_invoice_chunks(f,
+                                               fiscal_year_id,
+                                               executor,
+                                               since=since)
+        if not fold_into_ytd_store(connection,
+                                   fiscal_year_code,
+                                   raw_chunks,
+                                   f'FOLIO fiscal year {fiscal_year_code}',
+                                   new_watermark):
+            return None
+        return summarize_ytd_store(connection,
+                                   fiscal_year_code,
+                                   cutoff_date,
+                                   by_period,
+                                   period_starts)
+
+
+def summarize_batch_file(filename : str,
+                         cutoff_date : datetime,
+                         write_report : bool,
+                         by_period : bool = False,
+                         period_starts : list = None,
+                         by_fund : bool = False) -> tuple[str, dict, str]:
+    """Summarizes a single export of a batch in a worker process.
+
+    A function which runs in a separate process, so status messages
+    are collected rather than shown. Optionally writes the export's
+    own report from the worker as well, saved next to the export so
+    that same-named exports of different folders do not overwrite
+    each other's reports.
+
+    Args:
+        filename (str): The path to the CSV or XLSX export
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        write_report (bool): Writes a report for this export if True
+        by_period (bool): Also sums costs by month if True
+        period_starts (list): The start dates of custom periods,
+            defaults to monthly periods
+        by_fund (bool): Adds the fund code rollups to the report if True
+
+    Returns:
+        tuple[str, dict, str]: Returns the filename, the report sums
+            (None if an error occurs), and the last status message
+    """
+
+    global status_handler
+    messages = [''] # collects status messages, includes default
+    status_handler = lambda msg, col : messages.append(msg)
+
+    sums = None # scope resolution
+    try:
+        sums = summarize_export(filename,
+                                cutoff_date,
+                                by_period,
+                                period_starts)
+        if sums and write_report:
+            basename, _ = os.path.splitext(os.path.basename(filename))
+            output_filename = os.path.join(os.path.dirname(filename),
+                                           f'REPORT_{basename}-jaq.xlsx')
+            generate_xlsx_report(filename,
+                                 sums['ytd'],
+                                 sums['current'],
+                                 cutoff_date,
+                                 sums.get('periods'),
+                                 fund_cents=sums['funds'] if by_fund \
+                                    else None,
+                                 output_filename=output_filename)
+    except Exception as e: # reported back to the main process
+        messages.append(f'{type(e).__name__}: {e}')
+        sums = None
+
+    return filename, sums, messages[-1]
+
+
+def generate_xlsx_report(file_path : str,
+                         ytd_cost_sums : dict,
+                         current_cost_sums : dict,
+                         cutoff_date : datetime,
+                         period_sums : pd.DataFrame = None,
+                         finance_cents : pd.DataFrame = None,
+                         fund_cents : pd.DataFrame = None,
+                         invoice_lines : pd.DataFrame = None,
+                         detail_per_fund : bool = False,
+                         variance_cents : pd.DataFrame = None,
+                         baseline_name : str = '',
+                         output_filename : str = None) -> str:
+    """Generates budget report as an XLSX file
+    
+    A function which takes the summed costs from the raw file
+    and formats and outputs it onto an XLSX file
+    
+    Args:
+        file_path (str): the name of the original exported CSV
+        ytd_cost_sums (dict): dict containing YTD expenditures in cents
+        current_cost_sums (dict): dict containing current monthly
+            expenditures in cents
+        cutoff_date (datetime): the cutoff date for current expenditures
+        period_sums (pd.DataFrame): fund-by-period matrix in cents,
+            written on its own sheet if given
+        finance_cents (pd.DataFrame): appropriations and encumbrances
+            by fund code in cents, zero if not given
+        fund_cents (pd.DataFrame): sums by fund code in cents, rolled
+            up onto their own sheet along with the finance if given
+        invoice_lines (pd.DataFrame): the invoice lines behind the
+            sums, listed on detail sheets if given
+        detail_per_fund (bool): lists the invoice lines of each
+            subfund on a sheet of its own if True, otherwise on a
+            single detail sheet
+        variance_cents (pd.DataFrame): the comparison with a baseline
+            from diff_report_sums(), written onto its own sheet if given
+        baseline_name (str): the export or snapshot compared against
+        output_filename (str): the path of the XLSX file, named after
+            the original export if not given
+    
+    Returns:
+        str: Returns the name of the output XLSX file.
     """
 
     # creates output filename
-    filename = os.path.basename(file_path)
-    basename, _ = os.path.splitext(filename)
-    output_filename = f'REPORT_{basename}-jaq.xlsx'
+    report_stage('write')
+    if not output_filename:
+        filename = os.path.basename(file_path)
+        basename, _ = os.path.splitext(filename)
+        output_filename = f'REPORT_{basename}-jaq.xlsx'
 
-    # initializes workbook
-    workbook = xlsxwriter.Workbook(output_filename)
+    # initializes workbook and its formats
+    workbook = xlsxwriter.Workbook(output_filename, WORKBOOK_OPTIONS)
+    formats = create_report_formats(workbook)
     worksheet = workbook.add_worksheet()
+    write_budget_sheet(worksheet,
+                       formats,
+                       ytd_cost_sums,
+                       current_cost_sums,
+                       cutoff_date,
+                       finance_cents=finance_cents)
+    if period_sums is not None:
+        write_period_sheet(workbook.add_worksheet(PERIOD_SHEET_NAME),
+                           formats,
+                           period_sums)
+    if fund_cents is not None:
+        write_fund_sheet(workbook.add_worksheet(FUND_SHEET_NAME),
+                         formats,
+                         fund_cents,
+                         finance_cents)
+    if variance_cents is not None:
+        write_variance_sheet(workbook.add_worksheet(VARIANCE_SHEET_NAME),
+                             formats,
+                             variance_cents,
+                             baseline_name)
+    if invoice_lines is not None:
+        write_detail_sheets(workbook, formats, invoice_lines, detail_per_fund)
+
+    workbook.close()
+    return output_filename
+
+
+def generate_batch_xlsx_report(folder_name : str,
+                               batch_sums : dict,
+                               cutoff_date : datetime,
+                               by_fund : bool = False,
+                               output_filename : str = None) -> str:
+    """Generates a consolidated budget report for a batch of exports.
+
+    A function which writes a summary sheet of the costs summed across
+    every export, followed by one sheet per export, into a single
+    XLSX file.
+
+    Args:
+        folder_name (str): the name of the batch, used in the filename
+        batch_sums (dict): dict of export filenames to their report
+            sums, see summarize_export()
+        cutoff_date (datetime): the cutoff date for current expenditures
+        by_fund (bool): adds the fund code rollups of the whole batch
+            if True
+        output_filename (str): the path of the XLSX file, named after
+            the batch if not given
+
+    Returns:
+        str: Returns the name of the output XLSX file.
+    """
+
+    report_stage('write')
+    if not output_filename:
+        output_filename = f'REPORT_BATCH_{folder_name}-jaq.xlsx'
+    workbook = xlsxwriter.Workbook(output_filename, WORKBOOK_OPTIONS)
+    formats = create_report_formats(workbook)
+
+    # sums costs across every export, in integer cents
+    total_ytd_cost_sums = {}
+    total_current_cost_sums = {}
+    for report_sums in batch_sums.values():
+        for title, cents in report_sums['ytd'].items():
+            total_ytd_cost_sums[title] = \
+                total_ytd_cost_sums.get(title, 0) + cents
+        for title, cents in report_sums['current'].items():
+            total_current_cost_sums[title] = \
+                total_current_cost_sums.get(title, 0) + cents
+    summary_sheet = workbook.add_worksheet(SUMMARY_SHEET_NAME)
+    write_budget_sheet(summary_sheet,
+                       formats,
+                       total_ytd_cost_sums,
+                       total_current_cost_sums,
+                       cutoff_date,
+                       f'SUMMARY OF {len(batch_sums)} EXPORTS')
+
+    # sums fund-by-period matrices across every export, if present
+    period_matrices = [report_sums['periods'] \
+                       for report_sums in batch_sums.values() \
+                       if 'periods' in report_sums]
+    if period_matrices:
+        total_period_sums = pd.concat(period_matrices).fillna(0) \
+            .groupby(level=0).sum().astype('int64').sort_index(axis=1)
+        write_period_sheet(workbook.add_worksheet(f'{SUMMARY_SHEET_NAME} ' \
+                                                  f'{PERIOD_SHEET_NAME}'),
+                           formats,
+                           total_period_sums)
+
+    # sums fund codes across every export, rolled up once at the end
+    if by_fund:
+        total_fund_cents = pd.concat([report_sums['funds'] \
+                                      for report_sums in batch_sums.values()])
+        total_fund_cents = total_fund_cents.groupby(level=0).sum()
+        write_fund_sheet(workbook.add_worksheet(f'{SUMMARY_SHEET_NAME} ' \
+                                                f'{FUND_SHEET_NAME}'),
+                         formats,
+                         total_fund_cents)
+
+    # writes one sheet per export, with Excel-safe unique names
+    for file_path, report_sums in batch_sums.items():
+        filename = os.path.basename(file_path)
+        basename, _ = os.path.splitext(filename)
+        worksheet = workbook.add_worksheet(find_sheet_name(workbook, basename))
+        write_budget_sheet(worksheet,
+                           formats,
+                           report_sums['ytd'],
+                           report_sums['current'],
+                           cutoff_date,
+                           filename)
+
+    workbook.close()
+    return output_filename
+
+
+def find_sheet_name(workbook : xlsxwriter.Workbook, name : str) -> str:
+    """Finds an Excel-safe worksheet name not yet used in a workbook.
+
+    Args:
+        workbook (Workbook): the workbook the worksheet is added to
+        name (str): the preferred name, i.e. an export or subfund
+
+    Returns:
+        str: Returns the name without characters Excel forbids, cut
+            to MAX_SHEET_NAME_LENGTH and numbered if already used
+    """
+
+    used_sheet_names = {sheet.name.lower() for sheet in workbook.worksheets()}
+    base_name = ''.join(char for char in name if char not in '[]:*?/\\')
+    base_name = base_name.strip("'")[ : MAX_SHEET_NAME_LENGTH] or 'Sheet'
+    sheet_name = base_name
+    duplicate_count = 1
+    while sheet_name.lower() in used_sheet_names:
+        duplicate_count += 1
+        suffix = f' ({duplicate_count})'
+        sheet_name = base_name[ : MAX_SHEET_NAME_LENGTH - len(suffix)] \
+            + suffix
+    return sheet_name
+
+
+def create_report_formats(workbook : xlsxwriter.Workbook) -> dict:
+    """Creates the cell formats of a report.
+
+    A function which creates every format used in a report once per
+    workbook, to be shared by each of its sheets.
+
+    Args:
+        workbook (xlsxwriter.Workbook): the workbook being written
+
+    Returns:
+        dict: Returns the formats by name
+    """
+
+    return {
+        'header' : workbook.add_format(
+            {
+                'bold' : 1,
+                'align' : 'center',
+                'bottom' : 6, # Index: 6, Name: Double; Weight: 3; Style: =====
+            }
+        ),
+        'column_header' : workbook.add_format(
+            {
+                'bold' : 1,
+                'italic' : 1,    
+            }
+        ),
+        'subfund' : workbook.add_format(
+            {
+                'italic' : 1,    
+            }
+        ),
+        'currency' : workbook.add_format(
+            {
+                'num_format' : '$#,##0.00',
+            }
+        ),
+        'subtotal' : workbook.add_format(
+            {
+                'bold' : 1,
+                'num_format' : '$#,##0.00',
+            }
+        ),
+        'totals' : workbook.add_format(
+            {
+                'bold' : 1,
+                'top' : 6, # Index: 6, Name: Double; Weight: 3; Style: =====
+                'num_format' : '$#,##0.00',
+            }
+        ),
+        'percent' : workbook.add_format(
+            {
+                'num_format' : '0.0%',
+            }
+        ),
+        'percent_totals' : workbook.add_format(
+            {
+                'bold' : 1,
+                'top' : 6, # Index: 6, Name: Double; Weight: 3; Style: =====
+                'num_format' : '0.0%',
+            }
+        ),
+        'red' : workbook.add_format({'bg_color' : '#f4cccc'}), # light red 3
+        'green' : workbook.add_format({'bg_color' : '#d9ead3'}), # light green 3
+    }
+
+
+def format_currency(cents : int) -> str:
+    """Formats integer cents the way they are displayed in a report.
+
+    Args:
+        cents (int): the amount in integer cents
+
+    Returns:
+        str: Returns the amount as text, i.e. "$1,234.56"
+    """
+
+    return f'${cents / CENTS_PER_DOLLAR:,.2f}'
+
+
+def set_column_widths(worksheet, column_texts : list) -> None:
+    """Sets the width of each column to fit its text.
+
+    A function which stands in for worksheet.autofit(), which is not
+    supported in constant memory mode, by sizing each column from the
+    text that will be written to it before any rows are written.
+
+    Args:
+        worksheet (Worksheet): the worksheet to size the columns of
+        column_texts (list): one list of displayed texts per column,
+            starting from column A
+
+    Returns:
+        None
+    """
+
+    for column, texts in enumerate(column_texts):
+        width = max((len(text) for text in texts), default=0)
+        worksheet.set_column(column, column, width + COLUMN_WIDTH_PADDING)
+
+
+def write_budget_sheet(worksheet,
+                       formats : dict,
+                       ytd_cost_sums : dict,
+                       current_cost_sums : dict,
+                       cutoff_date : datetime,
+                       title : str = '',
+                       finance_cents : pd.DataFrame = None) -> None:
+    """Writes a budget report table onto a worksheet.
+
+    A function which writes the table strictly from top to bottom,
+    a whole row at a time, as required by constant memory mode.
+
+    Args:
+        worksheet (Worksheet): the worksheet to write the table onto
+        formats (dict): formats from create_report_formats()
+        ytd_cost_sums (dict): dict containing YTD expenditures in cents
+        current_cost_sums (dict): dict containing current monthly
+            expenditures in cents
+        cutoff_date (datetime): the cutoff date for current expenditures
+        title (str): text of the top row, blank by default
+        finance_cents (pd.DataFrame): appropriations and encumbrances
+            by fund code in cents, only written into the TOTALS row as
+            FOLIO does not allocate money by subfund
+
+    Returns:
+        None
+    """
 
     # sets column headers
     COLUMN_NAMES = [
@@ -498,135 +2910,583 @@ def generate_xlsx_report(file_path : str,
         'ENCUMBRANCES',
         'FREE BALANCE',
     ]
-    COLUMN_HEADER_FORMAT = workbook.add_format(
-        {
-            'bold' : 1,
-            'italic' : 1,    
-        }
-    )
-    worksheet.write_row('A3',
-                        COLUMN_NAMES,
-                        COLUMN_HEADER_FORMAT)
+    LAST_COLUMN = len(COLUMN_NAMES) - 1
     
+    # appropriations and encumbrances of subfunds are left as 0, to be
+    # filled in by hand, unless FOLIO finance fills in their totals
+    subfunds = sorted(ytd_cost_sums.keys())
+    table_cents = pd.DataFrame({
+        'CURRENT EXPENDITURES' : current_cost_sums,
+        'YTD EXPENDITURES' : ytd_cost_sums,
+    }, index=subfunds, dtype='float64') \
+        .reindex(columns=COLUMN_NAMES[1 : LAST_COLUMN]) \
+        .fillna(0) \
+        .astype('int64')
+    totals_cents = table_cents.sum()
+    if finance_cents is not None:
+        totals_cents[FINANCE_COLUMN_NAMES] = finance_cents.sum()
+
     ### FORMATS BULK OF TABLE
     # sorts keys to be displayed in alphabetical
     # order, adds buffer to keys
     BUFFER_STR = ''
     SUMS_BUFFER_SPACES = 3
-    sorted_keys = sorted(ytd_cost_sums.keys()) + \
-        [BUFFER_STR] * SUMS_BUFFER_SPACES
-    START_ROW = 4 # A1 notation row that cost sums start being printed on
-    SUBFUND_FORMAT = workbook.add_format(
-        {
-            'italic' : 1,    
-        }
-    )
-    CURRENCY_FORMAT = workbook.add_format(
-        {
-            'num_format' : '$#,##0.00',
-        }
-    )
+    sorted_keys = subfunds + [BUFFER_STR] * SUMS_BUFFER_SPACES
+    HEADER_ROW = 2 # 0-indexed row of the column headers
+    START_ROW = HEADER_ROW + 1 # 0-indexed row that cost sums start on
+    TOTALS_ROW = START_ROW + len(sorted_keys) # calculates sum row placement
+
+    # sizes columns up front, as rows cannot be revisited once written
+    currency_texts = [format_currency(cents) for cents \
+                      in [*table_cents.values.ravel(),
+                          *totals_cents.values,
+                          totals_cents[COLUMN_NAMES[1]] \
+                            - totals_cents[COLUMN_NAMES[3]] \
+                            - totals_cents[COLUMN_NAMES[4]]]]
+    set_column_widths(worksheet,
+                      [[COLUMN_NAMES[0], 'TOTALS', *sorted_keys]] + \
+                      [[column_name, *currency_texts] \
+                       for column_name in COLUMN_NAMES[1 : ]])
+
+    # sets up worksheet headers
+    # NOTE: headers are written first, as rows must be written in
+    # order; their merged cells are left out of the column widths
+    HEADER_TEXT = 'REPORT - CUTOFF DATE: ' \
+        f'{cutoff_date.strftime(DATETIME_FORMAT)}'
+    worksheet.merge_range(0, 0, 0, LAST_COLUMN, title, formats['header'])
+    worksheet.merge_range(1, 0, 1, LAST_COLUMN, HEADER_TEXT, formats['header'])
+    worksheet.write_row(HEADER_ROW,
+                        0,
+                        COLUMN_NAMES,
+                        formats['column_header'])
     
     ### FILLS OUT BULK OF TABLE
-    for index, subfund in enumerate(sorted_keys):
+    # converts integer cents back to currency only when writing,
+    # buffer rows are left as 0
+    table_values = (table_cents / CENTS_PER_DOLLAR).values.tolist() + \
+        [[0] * len(table_cents.columns)] * SUMS_BUFFER_SPACES
+    for index, (subfund, values) in enumerate(zip(sorted_keys,
+                                                  table_values)):
 
         # calculates current working row
         row = START_ROW + index
+        excel_row = row + 1 # A1 notation row, used in formulas
 
-        # prevents KeyError from dicts
-        current_expenditures = 0
-        ytd_expenditures = 0
-        if subfund != BUFFER_STR:
-            current_expenditures = current_cost_sums[subfund]
-            ytd_expenditures = ytd_cost_sums[subfund]
-
-        # fills out table
-        APPROPRIATION_DEFAULT = 0
-        ENCUMBRANCE_DEFAULT = 0
-        worksheet.write(f'A{row}',
-                        subfund,
-                        SUBFUND_FORMAT)
-        worksheet.write(f'B{row}',
-                        APPROPRIATION_DEFAULT,
-                        CURRENCY_FORMAT)
-        worksheet.write(f'C{row}',
-                        current_expenditures,
-                        CURRENCY_FORMAT)
-        worksheet.write(f'D{row}',
-                        ytd_expenditures,
-                        CURRENCY_FORMAT)
-        worksheet.write(f'E{row}',
-                        ENCUMBRANCE_DEFAULT,
-                        CURRENCY_FORMAT)
+        # fills out table a row at a time
+        worksheet.write_string(row, 0, subfund, formats['subfund'])
+        worksheet.write_row(row, 1, values, formats['currency'])
         # writes FREE BALANCE formula in required column
-        worksheet.write_formula(f'F{row}',
-                                f'=B{row}-D{row}-E{row}',
-                                CURRENCY_FORMAT)
+        worksheet.write_formula(row,
+                                LAST_COLUMN,
+                                f'=B{excel_row}-D{excel_row}-E{excel_row}',
+                                formats['currency'])
     
     ### TOTALS ROW
-    # formats and prints column totals
-    TOTALS_ROW = START_ROW + len(sorted_keys) # calculates sum row placement
-    TOTALS_FORMAT = workbook.add_format(
-        {
-            'bold' : 1,
-            'top' : 6, # Index: 6, Name: Double; Weight: 3; Style: =====
-            'num_format' : '$#,##0.00',
-        }
-    )
-    worksheet.write(f'A{TOTALS_ROW}',
-                    'TOTALS',
-                    TOTALS_FORMAT)
-    TOTALS_COLUMN_NAMES = 'BCDEF'
-    # TOTALS_FORMAT.set_num_format('$#,##0.00') # adds num_format to sum row
-    for column in TOTALS_COLUMN_NAMES:
-        totals_formula = f'=SUM({column}{START_ROW}:{column}{TOTALS_ROW - 1})'
-        worksheet.write_formula(f'{column}{TOTALS_ROW}',
+    # formats and prints column totals, FOLIO finance as values
+    worksheet.write_string(TOTALS_ROW, 0, 'TOTALS', formats['totals'])
+    for column in range(1, LAST_COLUMN):
+        column_name = xl_col_to_name(column)
+        if finance_cents is not None and \
+                COLUMN_NAMES[column] in FINANCE_COLUMN_NAMES:
+            worksheet.write_number(TOTALS_ROW,
+                                   column,
+                                   totals_cents[COLUMN_NAMES[column]] \
+                                    / CENTS_PER_DOLLAR,
+                                   formats['totals'])
+            continue
+        totals_formula = f'=SUM({column_name}{START_ROW + 1}:' \
+            f'{column_name}{TOTALS_ROW})'
+        worksheet.write_formula(TOTALS_ROW,
+                                column,
                                 totals_formula,
-                                TOTALS_FORMAT)
+                                formats['totals'])
+    excel_row = TOTALS_ROW + 1 # A1 notation row, used in formulas
+    worksheet.write_formula(TOTALS_ROW,
+                            LAST_COLUMN,
+                            f'=B{excel_row}-D{excel_row}-E{excel_row}',
+                            formats['totals'])
     
     ### ADDS CONDITIONAL FORMATTING
-    currency_range = f'B{START_ROW}:F{TOTALS_ROW}'
-    RED_FORMAT = workbook.add_format({'bg_color' : '#f4cccc'}) # light red 3
-    GREEN_FORMAT = workbook.add_format({'bg_color' : '#d9ead3'}) # light green 3
-    worksheet.conditional_format(currency_range, {'type' : 'cell',
-                                                  'criteria' : 'less than',
-                                                  'value' : 0,
-                                                  'format' : RED_FORMAT})
-    worksheet.conditional_format(currency_range, {'type' : 'cell',
-                                                  'criteria' : 'greater than',
-                                                  'value' : 0,
-                                                  'format' : GREEN_FORMAT})
-    
-    worksheet.autofit() # reformats cell width
+    add_sign_formatting(worksheet,
+                        formats,
+                        START_ROW,
+                        1,
+                        TOTALS_ROW,
+                        LAST_COLUMN)
 
 
-    # sets up worksheet headers
-    # NOTE:worksheet headers must come after rest of table (and
-    # specifically autofit) because autofitting to a merged cell
-    # is wonky and doesn't really work, at least under my current
-    # understanding of how the autofit function works
-    HEADER_TEXT = f'REPORT - CUTOFF DATE: {calendar.get_date()}'
-    HEADER_FORMAT = workbook.add_format(
-        {
-            'bold' : 1,
-            'align' : 'center',
-            'bottom' : 6, # Index: 6, Name: Double; Weight: 3; Style: =====
-        }
-    )
-    worksheet.merge_range('A1:F1', '', HEADER_FORMAT)
-    worksheet.merge_range('A2:F2', HEADER_TEXT, HEADER_FORMAT)
+def add_sign_formatting(worksheet,
+                        formats : dict,
+                        first_row : int,
+                        first_column : int,
+                        last_row : int,
+                        last_column : int) -> None:
+    """Highlights negative amounts in red and positive amounts in green.
 
-    workbook.close()
-    return output_filename
+    Args:
+        worksheet (Worksheet): the worksheet to format
+        formats (dict): formats from create_report_formats()
+        first_row (int): 0-indexed first row of the range
+        first_column (int): 0-indexed first column of the range
+        last_row (int): 0-indexed last row of the range
+        last_column (int): 0-indexed last column of the range
+
+    Returns:
+        None
+    """
+
+    cell_range = (first_row, first_column, last_row, last_column)
+    worksheet.conditional_format(*cell_range, {'type' : 'cell',
+                                               'criteria' : 'less than',
+                                               'value' : 0,
+                                               'format' : formats['red']})
+    worksheet.conditional_format(*cell_range, {'type' : 'cell',
+                                               'criteria' : 'greater than',
+                                               'value' : 0,
+                                               'format' : formats['green']})
+
+
+def write_period_sheet(worksheet,
+                       formats : dict,
+                       period_sums : pd.DataFrame) -> None:
+    """Writes a fund-by-period matrix onto a worksheet.
+
+    A function which writes one row per subfund and one column per
+    period, followed by a TOTAL column and a TOTALS row. Rows are
+    written in order, a whole row at a time.
+
+    Args:
+        worksheet (Worksheet): the worksheet to write the matrix onto
+        formats (dict): formats from create_report_formats()
+        period_sums (pd.DataFrame): fund-by-period matrix in cents
+
+    Returns:
+        None
+    """
+
+    # 0-indexed rows and columns of the matrix
+    HEADER_ROW = 2
+    START_ROW = HEADER_ROW + 1
+    period_count = len(period_sums.columns)
+
+    # no costs fall in any period, i.e. every custom period starts after
+    # the last invoice, which would leave the sums without a range
+    if period_sums.empty:
+        worksheet.merge_range(0, 0, 0, 1, '', formats['header'])
+        worksheet.merge_range(1,
+                              0,
+                              1,
+                              1,
+                              'REPORT - EXPENDITURES BY PERIOD',
+                              formats['header'])
+        worksheet.write_string(HEADER_ROW,
+                               0,
+                               'No expenditures in any period.')
+        return
+
+    total_column = period_count + 1 # after SUBFUND and each period
+    TOTALS_ROW = START_ROW + len(period_sums.index)
+    last_period_name = xl_col_to_name(period_count)
+
+    # sizes columns up front, as rows cannot be revisited once written
+    row_totals = period_sums.sum(axis=1)
+    column_totals = period_sums.sum(axis=0)
+    set_column_widths(worksheet,
+                      [['SUBFUND', 'TOTALS', *period_sums.index]] + \
+                      [[period, *map(format_currency, period_sums[period]),
+                        format_currency(column_totals[period])] \
+                       for period in period_sums.columns] + \
+                      [['TOTAL', *map(format_currency, row_totals),
+                        format_currency(row_totals.sum())]])
+
+    # headers come first, as rows must be written in order
+    worksheet.merge_range(0, 0, 0, total_column, '', formats['header'])
+    worksheet.merge_range(1,
+                          0,
+                          1,
+                          total_column,
+                          'REPORT - EXPENDITURES BY PERIOD',
+                          formats['header'])
+    worksheet.write_row(HEADER_ROW,
+                        0,
+                        ['SUBFUND', *period_sums.columns, 'TOTAL'],
+                        formats['column_header'])
+
+    # converts integer cents back to currency only when writing
+    period_values = (period_sums / CENTS_PER_DOLLAR).values.tolist()
+    for offset, (subfund, values) in enumerate(zip(period_sums.index,
+                                                   period_values)):
+        row = START_ROW + offset
+        worksheet.write_string(row, 0, subfund, formats['subfund'])
+        worksheet.write_row(row, 1, values, formats['currency'])
+        worksheet.write_formula(row,
+                                total_column,
+                                f'=SUM(B{row + 1}:{last_period_name}{row + 1})',
+                                formats['currency'])
+
+    # totals row, sums each column of the matrix
+    worksheet.write_string(TOTALS_ROW, 0, 'TOTALS', formats['totals'])
+    for column in range(1, total_column + 1):
+        column_name = xl_col_to_name(column)
+        worksheet.write_formula(TOTALS_ROW,
+                                column,
+                                f'=SUM({column_name}{START_ROW + 1}:' \
+                                f'{column_name}{TOTALS_ROW})',
+                                formats['totals'])
+
+
+def write_fund_sheet(worksheet,
+                     formats : dict,
+                     fund_cents : pd.DataFrame,
+                     finance_cents : pd.DataFrame = None) -> None:
+    """Writes the fund code rollups onto a worksheet.
+
+    A function which writes one row per level of every fund code,
+    parents above their children, as outline-grouped rows which can
+    be collapsed down to any level in Excel. Rows are written in
+    order, a whole row at a time.
+
+    Args:
+        worksheet (Worksheet): the worksheet to write the rollups onto
+        formats (dict): formats from create_report_formats()
+        fund_cents (pd.DataFrame): sums by fund code in cents, from
+            sum_fund_cents()
+        finance_cents (pd.DataFrame): appropriations and encumbrances
+            by fund code in cents, added along with the free balance
+            of each fund code if given
+
+    Returns:
+        None
+    """
+
+    COLUMN_NAMES = ['FUND CODE', 'CURRENT EXPENDITURES', 'YTD EXPENDITURES']
+    sum_names = ['current', 'ytd']
+    if finance_cents is not None:
+        # lines up the finance with the expenditures of each fund code
+        # in one join, fund codes missing from either are 0, so that
+        # budgets with nothing spent yet are still listed
+        fund_cents = fund_cents.join(finance_cents, how='outer') \
+            .fillna(0) \
+            .astype('int64')
+        fund_cents['free'] = fund_cents[FINANCE_COLUMN_NAMES[0]] \
+            - fund_cents['ytd'] - fund_cents[FINANCE_COLUMN_NAMES[1]]
+        COLUMN_NAMES = ['FUND CODE', 'APPROPRIATION', 'CURRENT EXPENDITURES',
+                        'YTD EXPENDITURES', 'ENCUMBRANCES', 'FREE BALANCE']
+        sum_names = [FINANCE_COLUMN_NAMES[0], 'current', 'ytd',
+                     FINANCE_COLUMN_NAMES[1], 'free']
+    LAST_COLUMN = len(COLUMN_NAMES) - 1
+    HEADER_ROW = 2
+    START_ROW = HEADER_ROW + 1
+    INDENT_STR = '    ' # indents each level of the fund codes
+    rollup_cents = rollup_fund_cents(fund_cents)
+    TOTALS_ROW = START_ROW + len(rollup_cents.index)
+
+    # the grand totals are the sums of the top level alone
+    code_texts = [INDENT_STR * level + code for code, level \
+                  in rollup_cents['level'].items()]
+    table_cents = rollup_cents[sum_names]
+    totals_cents = table_cents[rollup_cents['level'] == 0].sum()
+
+    # sizes columns up front, as rows cannot be revisited once written
+    set_column_widths(worksheet,
+                      [[COLUMN_NAMES[0], 'TOTALS', *code_texts]] + \
+                      [[column_name,
+                        *map(format_currency, table_cents[column]),
+                        format_currency(totals_cents[column])] \
+                       for column_name, column \
+                       in zip(COLUMN_NAMES[1 : ], table_cents.columns)])
+
+    # headers come first, as rows must be written in order
+    # NOTE: summary rows sit above their children, not below
+    worksheet.outline_settings(visible=True, symbols_below=False)
+    worksheet.merge_range(0, 0, 0, LAST_COLUMN, '', formats['header'])
+    worksheet.merge_range(1,
+                          0,
+                          1,
+                          LAST_COLUMN,
+                          'REPORT - EXPENDITURES BY FUND CODE',
+                          formats['header'])
+    worksheet.write_row(HEADER_ROW,
+                        0,
+                        COLUMN_NAMES,
+                        formats['column_header'])
+
+    # converts integer cents back to currency only when writing,
+    # rows with children are subtotals and stand out in bold
+    table_values = (table_cents / CENTS_PER_DOLLAR).values.tolist()
+    for offset, (code_text, level, is_parent, values) in enumerate(
+            zip(code_texts,
+                rollup_cents['level'],
+                rollup_cents['is_parent'],
+                table_values)):
+        row = START_ROW + offset
+        worksheet.set_row(row, None, None, {'level' : level})
+        worksheet.write_string(row,
+                               0,
+                               code_text,
+                               formats['subtotal'] if is_parent \
+                                else formats['subfund'])
+        worksheet.write_row(row,
+                            1,
+                            values,
+                            formats['subtotal'] if is_parent \
+                                else formats['currency'])
+
+    # totals row, written as values as the subtotals would be counted twice
+    worksheet.write_string(TOTALS_ROW, 0, 'TOTALS', formats['totals'])
+    worksheet.write_row(TOTALS_ROW,
+                        1,
+                        (totals_cents / CENTS_PER_DOLLAR).tolist(),
+                        formats['totals'])
+
+
+def write_variance_sheet(worksheet,
+                         formats : dict,
+                         variance_cents : pd.DataFrame,
+                         baseline_name : str) -> None:
+    """Writes the comparison of a report with a baseline onto a worksheet.
+
+    A function which writes the YTD and current expenditures of each
+    subfund next to those of the baseline, with the change and percent
+    change highlighted by sign, followed by a TOTALS row. Rows are
+    written in order, a whole row at a time.
+
+    Args:
+        worksheet (Worksheet): the worksheet to write the comparison onto
+        formats (dict): formats from create_report_formats()
+        variance_cents (pd.DataFrame): the variance from
+            diff_report_sums()
+        baseline_name (str): the export or snapshot compared against
+
+    Returns:
+        None
+    """
+
+    COLUMN_NAMES = [
+        'SUBFUND',
+        'BASELINE YTD',
+        'YTD EXPENDITURES',
+        'YTD CHANGE',
+        'YTD % CHANGE',
+        'BASELINE CURRENT',
+        'CURRENT EXPENDITURES',
+        'CURRENT CHANGE',
+        'CURRENT % CHANGE',
+    ]
+    LAST_COLUMN = len(COLUMN_NAMES) - 1
+    PERCENT_COLUMNS = [4, 8]
+    HEADER_ROW = 2
+    START_ROW = HEADER_ROW + 1
+    TOTALS_ROW = START_ROW + len(variance_cents.index)
+
+    # converts integer cents back to currency and fractions to numbers
+    # only when writing, a change from nothing has no percentage
+    variance_values = variance_cents.astype('float64')
+    percent_names = variance_values.columns[[column - 1 for column \
+                                             in PERCENT_COLUMNS]]
+    amount_names = variance_values.columns.difference(percent_names,
+                                                      sort=False)
+    variance_values[amount_names] /= CENTS_PER_DOLLAR
+    table_rows = variance_values.astype(object) \
+        .where(variance_values.notna(), '') \
+        .values.tolist()
+
+    # sizes columns up front, as rows cannot be revisited once written
+    column_totals = variance_cents[amount_names].sum()
+    column_texts = [[COLUMN_NAMES[0], 'TOTALS', *variance_cents.index]]
+    for column_name, sum_name in zip(COLUMN_NAMES[1 : ],
+                                     variance_cents.columns):
+        if sum_name in percent_names:
+            column_texts.append([column_name, '-100.0%',
+                                 *[f'{fraction:.1%}' for fraction \
+                                   in variance_cents[sum_name].dropna()]])
+        else:
+            column_texts.append([column_name,
+                                 *map(format_currency,
+                                      variance_cents[sum_name]),
+                                 format_currency(column_totals[sum_name])])
+    set_column_widths(worksheet, column_texts)
+    for column in range(1, LAST_COLUMN + 1):
+        column_format = formats['percent'] if column in PERCENT_COLUMNS \
+            else formats['currency']
+        worksheet.set_column(column,
+                             column,
+                             max(map(len, column_texts[column])) \
+                                + COLUMN_WIDTH_PADDING,
+                             column_format)
+
+    # headers come first, as rows must be written in order
+    worksheet.merge_range(0, 0, 0, LAST_COLUMN, '', formats['header'])
+    worksheet.merge_range(1,
+                          0,
+                          1,
+                          LAST_COLUMN,
+                          f'REPORT - VARIANCE FROM: {baseline_name}',
+                          formats['header'])
+    worksheet.write_row(HEADER_ROW,
+                        0,
+                        COLUMN_NAMES,
+                        formats['column_header'])
+
+    for row, (subfund, values) in enumerate(zip(variance_cents.index,
+                                                table_rows),
+                                            start=START_ROW):
+        worksheet.write_string(row, 0, subfund, formats['subfund'])
+        worksheet.write_row(row, 1, values)
+
+    # totals row, percent changes are taken from the column totals
+    worksheet.write_string(TOTALS_ROW, 0, 'TOTALS', formats['totals'])
+    for column in range(1, LAST_COLUMN + 1):
+        column_name = xl_col_to_name(column)
+        totals_formula = f'=SUM({column_name}{START_ROW + 1}:' \
+            f'{column_name}{TOTALS_ROW})'
+        totals_format = formats['totals']
+        if column in PERCENT_COLUMNS:
+            baseline_cell = f'{xl_col_to_name(column - 3)}{TOTALS_ROW + 1}'
+            change_cell = f'{xl_col_to_name(column - 1)}{TOTALS_ROW + 1}'
+            totals_formula = f'=IF({baseline_cell}=0,"",' \
+                f'{change_cell}/{baseline_cell})'
+            totals_format = formats['percent_totals']
+        worksheet.write_formula(TOTALS_ROW,
+                                column,
+                                totals_formula,
+                                totals_format)
+
+    # highlights increases in green and decreases in red
+    for column in PERCENT_COLUMNS:
+        add_sign_formatting(worksheet,
+                            formats,
+                            START_ROW,
+                            column - 1,
+                            TOTALS_ROW,
+                            column)
+
+
+def write_detail_sheets(workbook : xlsxwriter.Workbook,
+                        formats : dict,
+                        invoice_lines : pd.DataFrame,
+                        per_fund : bool = False) -> None:
+    """Writes the invoice lines behind each subfund onto detail sheets.
+
+    A function which sorts the invoice lines by subfund once, then
+    finds where each subfund starts in the sorted lines, so that every
+    subfund is a slice of the sorted table rather than filtered out of
+    it. Lines are written a whole row at a time, either onto a single
+    detail sheet with a total after each subfund or onto one sheet per
+    subfund. Sheets past Excel's row limit continue on another sheet.
+
+    Args:
+        workbook (Workbook): the workbook to add the sheets to
+        formats (dict): formats from create_report_formats()
+        invoice_lines (pd.DataFrame): the invoice lines, from
+            select_invoice_lines()
+        per_fund (bool): writes one sheet per subfund if True
+
+    Returns:
+        None
+    """
+
+    COLUMN_NAMES = [
+        'SUBFUND',
+        'FUND CODE',
+        'INVOICE DATE',
+        'VENDOR INVOICE NUMBER',
+        'INVOICE LINE NUMBER',
+        'PERCENTAGE',
+        'AMOUNT',
+    ]
+    LAST_COLUMN = len(COLUMN_NAMES) - 1
+    HEADER_ROW = 2
+    START_ROW = HEADER_ROW + 1
+
+    # sorts once, subfunds in order and each subfund's lines by date
+    titles = invoice_lines['Title'].where(invoice_lines['Title'] != '',
+                                          'Miscellaneous')
+    sorted_lines = invoice_lines.assign(Title=titles) \
+        .sort_values(['Title', DATE_CUTOFF_COLUMN_NAME], kind='stable')
+    detail_df = pd.DataFrame({
+        'SUBFUND' : sorted_lines['Title'],
+        'FUND CODE' : sorted_lines['Code'],
+        'INVOICE DATE' : pd.to_datetime(sorted_lines[DATE_CUTOFF_COLUMN_NAME]) \
+            .dt.strftime(DATETIME_FORMAT),
+        'VENDOR INVOICE NUMBER' : sorted_lines[INVOICE_ID_COLUMN_NAMES[0]],
+        'INVOICE LINE NUMBER' : sorted_lines[INVOICE_ID_COLUMN_NAMES[1]],
+        'PERCENTAGE' : sorted_lines['Percentage Used'],
+        'AMOUNT' : sorted_lines[CENTS_COLUMN_NAME] / CENTS_PER_DOLLAR,
+    }).astype({column_name : str for column_name in COLUMN_NAMES[ : -1]})
+
+    # each subfund starts where the sorted titles change
+    sorted_titles = detail_df['SUBFUND']
+    group_starts = sorted_titles.ne(sorted_titles.shift()).to_numpy() \
+        .nonzero()[0].tolist()
+    group_ends = group_starts[1 : ] + [len(detail_df.index)]
+    line_rows = detail_df.values.tolist()
+    line_cents = sorted_lines[CENTS_COLUMN_NAME].tolist()
+
+    # sizes columns from the longest text of each column
+    column_texts = [[column_name] for column_name in COLUMN_NAMES]
+    for texts, column_name in zip(column_texts, COLUMN_NAMES[ : -1]):
+        if not detail_df.empty:
+            lengths = detail_df[column_name].str.len()
+            texts.append(detail_df[column_name].loc[lengths.idxmax()])
+    column_texts[-1] += [format_currency(cents) for cents \
+                         in [max(line_cents, default=0),
+                             sum(line_cents)]]
+
+    # pairs each row with whether it is a total, slicing per subfund
+    total_row = lambda label, cents : \
+        ([label] + [''] * (LAST_COLUMN - 1) + [cents / CENTS_PER_DOLLAR], True)
+    sheet_tables = [] # (sheet name, rows) of each sheet
+    if per_fund:
+        for start, end in zip(group_starts, group_ends):
+            fund_rows = [(row, False) for row in line_rows[start : end]]
+            fund_rows.append(total_row('TOTAL', sum(line_cents[start : end])))
+            sheet_tables.append((line_rows[start][0], fund_rows))
+    else:
+        detail_rows = []
+        for start, end in zip(group_starts, group_ends):
+            detail_rows += [(row, False) for row in line_rows[start : end]]
+            detail_rows.append(total_row(f'TOTAL {line_rows[start][0]}',
+                                         sum(line_cents[start : end])))
+        sheet_tables.append((DETAIL_SHEET_NAME, detail_rows))
+
+    # writes each table, continuing on another sheet past the row limit
+    rows_per_sheet = MAX_SHEET_ROWS - START_ROW
+    for sheet_name, table_rows in sheet_tables:
+        for first_row in range(0, max(len(table_rows), 1), rows_per_sheet):
+            worksheet = workbook.add_worksheet(find_sheet_name(workbook,
+                                                               sheet_name))
+            set_column_widths(worksheet, column_texts)
+            worksheet.set_column(LAST_COLUMN,
+                                 LAST_COLUMN,
+                                 max(map(len, column_texts[-1])) \
+                                    + COLUMN_WIDTH_PADDING,
+                                 formats['currency'])
+            worksheet.merge_range(0, 0, 0, LAST_COLUMN, '', formats['header'])
+            worksheet.merge_range(1,
+                                  0,
+                                  1,
+                                  LAST_COLUMN,
+                                  f'REPORT - INVOICE LINES: {sheet_name}',
+                                  formats['header'])
+            worksheet.write_row(HEADER_ROW,
+                                0,
+                                COLUMN_NAMES,
+                                formats['column_header'])
+            sheet_rows = table_rows[first_row : first_row + rows_per_sheet]
+            for row, (values, is_total) in enumerate(sheet_rows,
+                                                     start=START_ROW):
+                worksheet.write_row(row,
+                                    0,
+                                    values,
+                                    formats['subtotal'] if is_total else None)
 
 
 def start_report_generation() -> None:
-    """Organizes report generation.
+    """Organizes report generation from the main window.
 
-    A function which serves as the "main" function for the primary
-    purpose of the program, that being the extraction and processing
-    of the data exported from FOLIO and the generation of a budget
-    report from that data
+    A function which reads the input, cutoff date and options from the
+    widgets of the main window, then hands them to generate_report()
     
     Args:
         None
@@ -635,41 +3495,678 @@ def start_report_generation() -> None:
         None
     """
 
+    global progress_queue
+
+    # only one report runs at a time, i.e. Return pressed mid-report
+    if progress_queue is not None:
+        return
+
     # prevents future inputs
-    update_status(msg='Beginning report generation. Checking column names.',
+    update_status(msg='Beginning report generation.',
                   enter_state='disabled')
 
+    # widgets are only read here, the report runs on a worker thread so
+    # that the window keeps responding while pandas works
+    cutoff_date = datetime.strptime(calendar.get_date(), DATETIME_FORMAT)
+    report_args = (input_filename.get(), cutoff_date)
+    report_kwargs = dict(by_period=include_breakdown.get(),
+                         by_fund=include_rollups.get(),
+                         with_detail=include_detail.get(),
+                         detail_per_fund=split_detail.get(),
+                         consolidate=consolidate_batch.get(),
+                         fiscal_year_code=fiscal_year_str.get(),
+                         config_name=config_relpath.get(),
+                         include_finance=include_finance.get(),
+                         running_totals=use_running_totals.get(),
+                         compare_path=compare_input.get().strip())
+    cancel_event.clear()
+    progress_queue = queue.Queue()
+    threading.Thread(target=run_report_thread,
+                     args=report_args,
+                     kwargs=report_kwargs,
+                     daemon=True).start()
+    cancel_button.config(text='Stop')
+    root.after(PROGRESS_POLL_MS, poll_report_progress)
+    return
 
-    # validates column, then splits into separate columns
-    filename = input_filename.get()
-    budget_df = extract_data_from_csv(filename)
-    if budget_df.empty:
+
+def run_report_thread(*args, **kwargs) -> None:
+    """Generates the report on the worker thread.
+
+    A function which runs generate_report() with the given arguments,
+    then tells the main window the report has finished, whether it was
+    generated, cancelled or stopped by an unexpected error.
+
+    Args:
+        *args: Positional arguments of generate_report()
+        **kwargs: Keyword arguments of generate_report()
+
+    Returns:
+        None
+    """
+
+    try:
+        generate_report(*args, **kwargs)
+    except ReportCancelled:
+        update_status(msg='Report cancelled.', col=FAIL_COL)
+    except Exception as e: # the window would otherwise wait forever
+        update_status(msg='Report generation failed.', col=FAIL_COL)
+        error_msg(f'{type(e).__name__}: {e}')
+    progress_queue.put(('done',))
+
+
+def poll_report_progress() -> None:
+    """Shows the progress of the report running on the worker thread.
+
+    A function which empties the progress queue onto the main window,
+    showing status messages, stages and errors, then checks again
+    after PROGRESS_POLL_MS until the report has finished.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    global progress_queue
+
+    while True:
+        try:
+            kind, *values = progress_queue.get_nowait()
+        except queue.Empty:
+            root.after(PROGRESS_POLL_MS, poll_report_progress)
+            return
+
+        if kind == 'status':
+            # the enter button stays disabled until the thread is done
+            msg, col, _ = values
+            update_status(msg=msg, col=col)
+        elif kind == 'stage':
+            stage_number = list(REPORT_STAGES.keys()).index(values[0]) + 1
+            stage_label.config(text=f'Stage {stage_number}/' \
+                               f'{len(REPORT_STAGES)}: ' \
+                               f'{REPORT_STAGES[values[0]]}')
+        elif kind == 'error':
+            # error windows run their own event loop, so the rest of
+            # the queue is read from within it
+            root.after(PROGRESS_POLL_MS, poll_report_progress)
+            error_msg(values[0])
+            return
+        elif kind == 'done':
+            progress_queue = None
+            stage_label.config(text='')
+            cancel_button.config(text='Cancel')
+            # ensures successive uses, unless the input was changed
+            # to an invalid one while the report ran
+            is_valid_input, _ = validate_input(input_filename.get(),
+                                               fiscal_year_str.get())
+            update_status(enter_state='normal' if is_valid_input \
+                          else 'disabled')
+            return
+
+
+def cancel_report() -> None:
+    """Stops the report if one is running, otherwise closes the window.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    if progress_queue is None:
+        root.destroy()
+        return
+    cancel_event.set()
+    update_status(msg='Stopping after the current stage.')
+
+
+def generate_report(path : str,
+                    cutoff_date : datetime,
+                    *, # requires all options to be keyword-only arguments
+                    by_period : bool = False,
+                    period_starts : list = None,
+                    by_fund : bool = False,
+                    with_detail : bool = False,
+                    detail_per_fund : bool = False,
+                    consolidate : bool = False,
+                    fiscal_year_code : str = '',
+                    config_name : str = DEFAULT_CONFIG_NAME,
+                    include_finance : bool = False,
+                    running_totals : bool = False,
+                    compare_path : str = '',
+                    compare_cutoff_date : datetime = None,
+                    output_filename : str = None) -> bool:
+    """Organizes report generation.
+
+    A function which serves as the "main" function for the primary
+    purpose of the program, that being the extraction and processing
+    of the data exported from FOLIO and the generation of a budget
+    report from that data. Reads no widgets, so that it runs the same
+    from the main window and from the command line
+    
+    Args:
+        path (str): The CSV file, folder or glob pattern of exports
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Adds the fund-by-month breakdown if True
+        period_starts (list): The start dates of custom periods for
+            the breakdown, defaults to monthly periods
+        by_fund (bool): Adds the fund code rollups if True
+        with_detail (bool): Adds the invoice lines behind each subfund
+            if True, except for batches and running totals
+        detail_per_fund (bool): Lists the invoice lines of each
+            subfund on a sheet of its own if True
+        consolidate (bool): Writes a batch into one workbook if True
+        fiscal_year_code (str): The FOLIO fiscal year to pull instead
+            of an export, i.e. "FY2025"
+        config_name (str): The path to the config.json file
+        include_finance (bool): Fills in appropriations and
+            encumbrances from FOLIO by fund code if True, adding the
+            fund code rollups
+        running_totals (bool): Only fetches the FOLIO invoices updated
+            since an earlier report of the fiscal year if True, exports
+            are always counted in full
+        compare_path (str): The export or snapshot to compare the
+            report with on a variance sheet, except for batches
+        compare_cutoff_date (datetime): The cutoff date of the export
+            compared with, defaults to cutoff_date
+        output_filename (str): The path of the report, named after
+            the input if not given
+    
+    Returns:
+        bool: Returns True if the report was generated, False otherwise
+    """
+
+    update_status(msg='Beginning report generation. Checking column names.')
+
+    # fiscal years are pulled straight from FOLIO instead of an export
+    fiscal_year_code = fiscal_year_code.strip()
+    if fiscal_year_code:
+        return start_folio_report_generation(fiscal_year_code,
+                                             cutoff_date,
+                                             by_period=by_period,
+                                             period_starts=period_starts,
+                                             by_fund=by_fund,
+                                             with_detail=with_detail,
+                                             detail_per_fund=detail_per_fund,
+                                             config_name=config_name,
+                                             include_finance=include_finance,
+                                             incremental=running_totals,
+                                             compare_path=compare_path,
+                                             compare_cutoff_date=\
+                                                compare_cutoff_date,
+                                             output_filename=output_filename)
+
+    # folders and glob patterns are processed as a batch
+    batch_files = find_batch_files(path)
+    if batch_files:
+        return start_batch_report_generation(path,
+                                             batch_files,
+                                             cutoff_date,
+                                             by_period=by_period,
+                                             period_starts=period_starts,
+                                             by_fund=by_fund,
+                                             consolidate=consolidate,
+                                             output_filename=output_filename)
+
+    # an export always holds the whole fiscal year, including lines
+    # since amended or deleted, so it is counted in full every time
+    if running_totals:
+        update_status(msg='Running totals are only kept for FOLIO fiscal ' \
+                      'years, counting the whole export.')
+    sums = summarize_export(path,
+                            cutoff_date,
+                            by_period,
+                            period_starts,
+                            with_lines=with_detail)
+    if sums is None:
         # specific message found in above function
         update_status(enter_state='normal') # ensures successive uses
-        return
-        
-    # extracts and summarizes information into a dictionary
-    ytd_cost_sums, current_cost_sums = sum_costs(budget_df)
+        return False
+
+    # fills in appropriations and encumbrances for the fiscal
+    # year containing the cutoff date
+    finance_cents = None # scope resolution
+    if include_finance:
+        update_status(msg='Logging into FOLIO.')
+        f = login_folioclient(config_name)
+        if f is None:
+            return False # specific message found in above function
+        with f:
+            fiscal_year_code = fetch_fiscal_year_code(f, cutoff_date)
+            if fiscal_year_code is None:
+                status_msg = 'No fiscal year contains the cutoff date.'
+                update_status(msg=status_msg,
+                              col=FAIL_COL,
+                              enter_state='normal')
+                error_msg(status_msg)
+                return False
+            finance_cents = load_finance_cents(f, fiscal_year_code)
+        if finance_cents is None:
+            return False # specific message found in above function
+
+    # compares with an earlier export or snapshot of a report
+    variance_cents = None # scope resolution
+    if compare_path:
+        variance_cents = compare_report_sums(sums,
+                                             compare_path,
+                                             compare_cutoff_date or cutoff_date)
+        if variance_cents is None:
+            return False # specific message found in above function
+    ytd_cost_sums, current_cost_sums = sums['ytd'], sums['current']
     # for key, value in ytd_cost_sums.items():
     #     print(f'{key:<25}{value:>10}')
     # for key, value in current_cost_sums.items():
     #     print(f'{key:<25}{value:>10}')
 
     # generates report for xlsx table
-    output_filename = generate_xlsx_report(filename,
+    output_filename = generate_xlsx_report(path,
                                            ytd_cost_sums,
-                                           current_cost_sums)
+                                           current_cost_sums,
+                                           cutoff_date,
+                                           sums.get('periods'),
+                                           finance_cents,
+                                           sums.get('funds') if by_fund \
+                                            or include_finance else None,
+                                           sums.get('lines'),
+                                           detail_per_fund,
+                                           variance_cents,
+                                           os.path.basename(compare_path),
+                                           output_filename=output_filename)
+    write_report_snapshot(path, cutoff_date, sums)
 
     update_status(msg=f'Generated {output_filename}.',
                   col=SUCCESS_COL,
                   enter_state='normal')
-    return
+    return True
+
+
+def start_folio_report_generation(fiscal_year_code : str,
+                                  cutoff_date : datetime,
+                                  *,
+                                  by_period : bool = False,
+                                  period_starts : list = None,
+                                  by_fund : bool = False,
+                                  with_detail : bool = False,
+                                  detail_per_fund : bool = False,
+                                  config_name : str = DEFAULT_CONFIG_NAME,
+                                  include_finance : bool = False,
+                                  incremental : bool = False,
+                                  compare_path : str = '',
+                                  compare_cutoff_date : datetime = None,
+                                  output_filename : str = None) -> bool:
+    """Organizes report generation straight from FOLIO.
+
+    A function which logs into FOLIO, then summarizes the invoices of
+    a fiscal year without an exported CSV file.
+
+    Args:
+        fiscal_year_code (str): The code of the fiscal year, i.e. "FY2025"
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Adds the fund-by-month breakdown if True
+        period_starts (list): The start dates of custom periods for
+            the breakdown, defaults to monthly periods
+        by_fund (bool): Adds the fund code rollups if True
+        with_detail (bool): Adds the invoice lines behind each subfund
+            if True, unless incremental
+        detail_per_fund (bool): Lists the invoice lines of each
+            subfund on a sheet of its own if True
+        config_name (str): The path to the config.json file
+        include_finance (bool): Fills in appropriations and
+            encumbrances by fund code if True, adding the fund code
+            rollups
+        incremental (bool): Adds to the running year-to-date totals
+            if True
+        compare_path (str): The export or snapshot to compare the
+            report with on a variance sheet
+        compare_cutoff_date (datetime): The cutoff date of the export
+            compared with, defaults to cutoff_date
+        output_filename (str): The path of the report, named after
+            the fiscal year if not given
+
+    Returns:
+        bool: Returns True if the report was generated, False otherwise
+    """
+
+    update_status(msg='Logging into FOLIO.')
+    f = login_folioclient(config_name)
+    if f is None:
+        return False # specific message found in above function
+
+    # one session for the whole report, logs out afterwards
+    sums = None # scope resolution
+    finance_cents = None
+    with f:
+        sums = summarize_folio_invoices(f,
+                                        fiscal_year_code,
+                                        cutoff_date,
+                                        by_period,
+                                        period_starts,
+                                        incremental=incremental,
+                                        with_lines=with_detail)
+        if sums is not None and include_finance:
+            finance_cents = load_finance_cents(f, fiscal_year_code)
+    if sums is None:
+        return False # specific message found in above function
+    if include_finance and finance_cents is None:
+        return False # specific message found in above function
+
+    # compares with an earlier export or snapshot of a report
+    variance_cents = None # scope resolution
+    if compare_path:
+        variance_cents = compare_report_sums(sums,
+                                             compare_path,
+                                             compare_cutoff_date or cutoff_date)
+        if variance_cents is None:
+            return False # specific message found in above function
+
+    # names the report after the fiscal year, there is no export file
+    output_filename = generate_xlsx_report(f'FOLIO-{fiscal_year_code}',
+                                           sums['ytd'],
+                                           sums['current'],
+                                           cutoff_date,
+                                           sums.get('periods'),
+                                           finance_cents,
+                                           sums.get('funds') if by_fund \
+                                            or include_finance else None,
+                                           sums.get('lines'),
+                                           detail_per_fund,
+                                           variance_cents,
+                                           os.path.basename(compare_path),
+                                           output_filename=output_filename)
+    write_report_snapshot(f'FOLIO-{fiscal_year_code}', cutoff_date, sums)
+
+    update_status(msg=f'Generated {output_filename}.',
+                  col=SUCCESS_COL,
+                  enter_state='normal')
+    return True
+
+
+def start_batch_report_generation(path : str,
+                                  batch_files : list,
+                                  cutoff_date : datetime,
+                                  *,
+                                  by_period : bool = False,
+                                  period_starts : list = None,
+                                  by_fund : bool = False,
+                                  consolidate : bool = False,
+                                  output_filename : str = None) -> bool:
+    """Organizes report generation for a batch of exports.
+
+    A function which parses and summarizes every export in a batch
+    across a pool of processes, using every core, then writes either
+    one report per export or a single consolidated report.
+
+    Args:
+        path (str): The folder or glob pattern of the batch
+        batch_files (list): The CSV files in the batch
+        cutoff_date (datetime): The date on or after which costs
+            count towards "current" expenditures
+        by_period (bool): Adds the fund-by-month breakdown if True
+        period_starts (list): The start dates of custom periods for
+            the breakdown, defaults to monthly periods
+        by_fund (bool): Adds the fund code rollups if True
+        consolidate (bool): Writes one consolidated report if True,
+            otherwise one report per export
+        output_filename (str): The path of the consolidated report,
+            named after the batch if not given
+
+    Returns:
+        bool: Returns True if every export was reported, False otherwise
+    """
+
+    # per-export reports are written by the workers themselves
+    update_status(msg=f'Processing batch of {len(batch_files)} exports.')
+    batch_sums = {} # successful exports, in order
+    failures = [] # exports which could not be summarized
+    report_stage('read')
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(summarize_batch_file,
+                               batch_files,
+                               [cutoff_date] * len(batch_files),
+                               [not consolidate] * len(batch_files),
+                               [by_period] * len(batch_files),
+                               [period_starts] * len(batch_files),
+                               [by_fund] * len(batch_files))
+        try:
+            for index, (filename, sums, last_msg) in enumerate(results,
+                                                               start=1):
+                update_status(msg=f'{index}/{len(batch_files)} exports ' \
+                              'processed.')
+                if sums is None:
+                    failures.append(f'{os.path.basename(filename)}: ' \
+                                    f'{last_msg}')
+                else:
+                    batch_sums[filename] = sums
+                report_stage('aggregate')
+        except ReportCancelled:
+            # exports not yet started are dropped, started ones finish
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    # writes consolidated report from the successful exports
+    output_msg = f'Generated {len(batch_sums)} reports.'
+    if consolidate and batch_sums:
+        folder_path = path if os.path.isdir(path) else os.path.dirname(path)
+        folder_name = os.path.basename(os.path.abspath(folder_path))
+        output_filename = generate_batch_xlsx_report(folder_name,
+                                                     batch_sums,
+                                                     cutoff_date,
+                                                     by_fund,
+                                                     output_filename)
+        output_msg = f'Generated {output_filename}.'
+
+    if failures:
+        update_status(msg=f'{output_msg} {len(failures)} exports failed.',
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{len(failures)} of {len(batch_files)} exports failed:\n' \
+                  + '\n'.join(failures))
+        return False
+
+    update_status(msg=output_msg,
+                  col=SUCCESS_COL,
+                  enter_state='normal')
+    return True
+
+
+def parse_cutoff_date(date_str : str) -> datetime:
+    """Parses the cutoff date given on the command line.
+
+    Args:
+        date_str (str): The date, in the form YYYY-MM-DD
+
+    Returns:
+        datetime: Returns the parsed cutoff date
+    """
+
+    try:
+        return datetime.strptime(date_str, DATETIME_FORMAT)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'\"{date_str}\" is not a date ' \
+                                         'of the form YYYY-MM-DD.')
+
+
+def parse_period_starts(dates_str : str) -> list:
+    """Parses the custom period start dates given on the command line.
+
+    Args:
+        dates_str (str): The dates, in the form YYYY-MM-DD and
+            separated by commas
+
+    Returns:
+        list: Returns the parsed start dates
+    """
+
+    date_strs = [date_str.strip() for date_str in dates_str.split(',') \
+                 if date_str.strip()]
+    if not date_strs:
+        raise argparse.ArgumentTypeError('at least one period start date ' \
+                                         'is required.')
+    return [parse_cutoff_date(date_str) for date_str in date_strs]
+
+
+def parse_arguments(argv : list) -> argparse.Namespace:
+    """Parses and validates the command line arguments.
+
+    A function which mirrors the inputs of the main window, so that
+    the report can be generated from a scheduler without a display.
+    Exits with a usage message if the input is invalid.
+
+    Args:
+        argv (list): The command line arguments, without the program
+
+    Returns:
+        argparse.Namespace: Returns the parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='budget_report',
+        description='Generates a budget report from FOLIO invoices ' \
+            'without opening the window.')
+    parser.add_argument('input',
+                        nargs='?',
+                        default='',
+                        help='CSV or XLSX export, folder or glob pattern ' \
+                            'of exports')
+    parser.add_argument('-c', '--cutoff',
+                        type=parse_cutoff_date,
+                        default=datetime.now().strftime(DATETIME_FORMAT),
+                        help='cutoff date for "Current Expenditures", ' \
+                            'YYYY-MM-DD (default: today)')
+    parser.add_argument('-o', '--output',
+                        help='path of the report, or of the consolidated ' \
+                            'report of a batch (default: named after ' \
+                            'the input)')
+    parser.add_argument('--fiscal-year',
+                        default='',
+                        help='FOLIO fiscal year to pull instead of an ' \
+                            'export, i.e. FY2025')
+    parser.add_argument('--config',
+                        default=DEFAULT_CONFIG_NAME,
+                        help='path to the configuration file used to log ' \
+                            'into FOLIO (default: %(default)s)')
+    parser.add_argument('--breakdown',
+                        action='store_true',
+                        help='include month-by-month breakdown')
+    parser.add_argument('--period-starts',
+                        type=parse_period_starts,
+                        metavar='DATES',
+                        help='break down by custom periods instead of ' \
+                            'months, starting on each of the ' \
+                            'comma-separated YYYY-MM-DD dates, implies ' \
+                            '--breakdown')
+    parser.add_argument('--rollups',
+                        action='store_true',
+                        help='include fund code rollups')
+    parser.add_argument('--detail',
+                        action='store_true',
+                        help='include the invoice lines behind each subfund')
+    parser.add_argument('--detail-per-fund',
+                        action='store_true',
+                        help='list the invoice lines of each subfund on a ' \
+                            'sheet of its own, implies --detail')
+    parser.add_argument('--consolidate',
+                        action='store_true',
+                        help='consolidate batch into one workbook')
+    parser.add_argument('--finance',
+                        action='store_true',
+                        help='fill in appropriations and encumbrances ' \
+                            'from FOLIO')
+    parser.add_argument('--running-totals',
+                        action='store_true',
+                        help='add to running year-to-date totals ' \
+                            '(FOLIO fiscal years only)')
+    parser.add_argument('--compare',
+                        default='',
+                        metavar='BASELINE',
+                        help='export or report snapshot to compare the ' \
+                            'report with on a variance sheet')
+    parser.add_argument('--compare-cutoff',
+                        type=parse_cutoff_date,
+                        help='cutoff date of the export compared with, ' \
+                            'YYYY-MM-DD (default: --cutoff)')
+    parser.add_argument('-q', '--quiet',
+                        action='store_true',
+                        help='only print errors')
+    args = parser.parse_args(argv)
+
+    # same checks as the filename input of the main window
+    is_valid_input, validation_msg = validate_input(args.input,
+                                                    args.fiscal_year)
+    if not is_valid_input:
+        parser.error(f'{args.input or "input"}: {validation_msg}')
+    if args.compare and not os.path.isfile(args.compare):
+        parser.error(f'{args.compare}: File not found.')
+    return args
+
+
+def run_from_command_line(argv : list) -> int:
+    """Generates a report from the command line.
+
+    A function which generates the report without the main window,
+    printing status messages to stdout and errors to stderr.
+
+    Args:
+        argv (list): The command line arguments, without the program
+
+    Returns:
+        int: Returns the exit code, 0 if the report was generated
+    """
+
+    global status_handler
+    args = parse_arguments(argv)
+
+    def print_status(msg : str, col : str) -> None:
+        if col == FAIL_COL:
+            print(msg, file=sys.stderr)
+        elif not args.quiet:
+            print(msg)
+
+    status_handler = print_status
+
+    is_generated = generate_report(args.input,
+                                   args.cutoff,
+                                   by_period=args.breakdown \
+                                    or args.period_starts is not None,
+                                   period_starts=args.period_starts,
+                                   by_fund=args.rollups,
+                                   with_detail=args.detail \
+                                    or args.detail_per_fund,
+                                   detail_per_fund=args.detail_per_fund,
+                                   consolidate=args.consolidate,
+                                   fiscal_year_code=args.fiscal_year,
+                                   config_name=args.config,
+                                   include_finance=args.finance,
+                                   running_totals=args.running_totals,
+                                   compare_path=args.compare,
+                                   compare_cutoff_date=args.compare_cutoff,
+                                   output_filename=args.output)
+    return 0 if is_generated else 1
 
 
 # Justin Caringal, TSU, BSCS 2025, github@jaq-lagnirac
 # main loop functionality, generates root tkinter window
 # where most of the user interacts
 if __name__ == '__main__':
+    # required for worker processes within a PyInstaller executable
+    multiprocessing.freeze_support()
+
+    # any arguments run the report headlessly, i.e. from a scheduler
+    if len(sys.argv) > 1:
+        sys.exit(run_from_command_line(sys.argv[1 : ]))
+
+    # GUI-only libraries, never imported on the command line
+    import tkinter as tk
+    from tkinter import filedialog
+    import webbrowser as wb
+    from PIL import ImageTk, Image
+    from tkcalendar import Calendar
+
     BUTTON_COUNT = 3
     INPUT_WIDTH = 60
     WIDGET_PADDING = 20
@@ -723,6 +4220,25 @@ if __name__ == '__main__':
                                 row=INPUT_FILE_ROW,
                                 column=INPUT_FILE_COLUMN + BUTTON_COUNT,
                                 padx=INPUT_SIDE_PADDING)
+    # batch mode, takes a folder (or a glob pattern typed in above)
+    BATCH_ROW = INPUT_FILE_ROW + 1
+    consolidate_batch = tk.BooleanVar()
+    consolidate_checkbox = tk.Checkbutton(root,
+                                          text='Consolidate batch into ' \
+                                            'one workbook',
+                                          font=FONT_TUPLE,
+                                          variable=consolidate_batch)
+    consolidate_checkbox.grid(sticky='W',
+                              row=BATCH_ROW,
+                              column=INPUT_FILE_COLUMN + 1,
+                              columnspan=BUTTON_COUNT - 1)
+    find_input_folder_button = tk.Button(root,
+                                         text='Find folder...',
+                                         command=find_input_folder)
+    find_input_folder_button.grid(sticky='NESW',
+                                  row=BATCH_ROW,
+                                  column=INPUT_FILE_COLUMN + BUTTON_COUNT,
+                                  padx=INPUT_SIDE_PADDING)
     # adds formatting and logic to filename text input
     filename_str.trace_add('write', update_validation)
     # adds Enter/Return in the filename input as an option to start program
@@ -730,8 +4246,70 @@ if __name__ == '__main__':
         if update_validation() else None
     input_filename.bind('<Return>', validate_and_start)
 
+    # pulls a fiscal year straight from FOLIO instead of an export
+    FOLIO_ROW = BATCH_ROW + 1
+    fiscal_year_txt = tk.Label(root,
+                               text='Or FOLIO fiscal year:\t',
+                               font=FONT_TUPLE)
+    fiscal_year_txt.grid(sticky='W',
+                         row=FOLIO_ROW,
+                         column=INPUT_FILE_COLUMN,
+                         padx=TEXT_SIDE_PADDING)
+    fiscal_year_str = tk.StringVar()
+    fiscal_year_input = tk.Entry(root,
+                                 width=INPUT_WIDTH,
+                                 textvariable=fiscal_year_str)
+    fiscal_year_input.grid(sticky='NESW',
+                           row=FOLIO_ROW,
+                           column=INPUT_FILE_COLUMN + 1,
+                           columnspan=BUTTON_COUNT,
+                           padx=INPUT_SIDE_PADDING)
+    fiscal_year_str.trace_add('write', update_validation)
+    fiscal_year_input.bind('<Return>', validate_and_start)
+
+    # requests path of config.json, used to log into FOLIO
+    CONFIG_ROW = FOLIO_ROW + 1
+    config_txt = tk.Label(root,
+                          text='Path to configuration file:\t',
+                          font=FONT_TUPLE)
+    config_txt.grid(sticky='W',
+                    row=CONFIG_ROW,
+                    column=INPUT_FILE_COLUMN,
+                    padx=TEXT_SIDE_PADDING)
+    config_relpath = tk.Entry(root,
+                              width=INPUT_WIDTH)
+    config_relpath.grid(sticky='NESW',
+                        row=CONFIG_ROW,
+                        column=INPUT_FILE_COLUMN + 1,
+                        columnspan=BUTTON_COUNT,
+                        padx=INPUT_SIDE_PADDING)
+    config_relpath.insert(0, os.path.abspath(DEFAULT_CONFIG_NAME))
+
+    # compares the report with an earlier export or report snapshot
+    COMPARE_ROW = CONFIG_ROW + 1
+    compare_txt = tk.Label(root,
+                           text='Compare with (optional):\t',
+                           font=FONT_TUPLE)
+    compare_txt.grid(sticky='W',
+                     row=COMPARE_ROW,
+                     column=INPUT_FILE_COLUMN,
+                     padx=TEXT_SIDE_PADDING)
+    compare_input = tk.Entry(root,
+                             width=INPUT_WIDTH)
+    compare_input.grid(sticky='NESW',
+                       row=COMPARE_ROW,
+                       column=INPUT_FILE_COLUMN + 1,
+                       columnspan=BUTTON_COUNT - 1)
+    find_compare_file_button = tk.Button(root,
+                                         text='Find file...',
+                                         command=find_compare_file)
+    find_compare_file_button.grid(sticky='NESW',
+                                  row=COMPARE_ROW,
+                                  column=INPUT_FILE_COLUMN + BUTTON_COUNT,
+                                  padx=INPUT_SIDE_PADDING)
+
     # requests cutoff day for expenditures
-    DATE_ROW = INPUT_FILE_ROW + 1
+    DATE_ROW = COMPARE_ROW + 1
     DATE_COLUMN = INPUT_FILE_COLUMN
     date_txt = tk.Label(root,
                         text='Cutoff date for ' \
@@ -749,6 +4327,84 @@ if __name__ == '__main__':
                   column=DATE_COLUMN + 1,
                   columnspan=1,
                   pady = (10, 0))
+
+    # adds fund-by-month breakdown sheet to the report
+    BREAKDOWN_ROW = DATE_ROW + 1
+    include_breakdown = tk.BooleanVar()
+    breakdown_checkbox = tk.Checkbutton(root,
+                                        text='Include month-by-month ' \
+                                          'breakdown',
+                                        font=FONT_TUPLE,
+                                        variable=include_breakdown)
+    breakdown_checkbox.grid(sticky='W',
+                            row=BREAKDOWN_ROW,
+                            column=DATE_COLUMN + 1,
+                            columnspan=BUTTON_COUNT - 1)
+
+    # adds subtotals at every level of the fund codes to the report
+    ROLLUP_ROW = BREAKDOWN_ROW + 1
+    include_rollups = tk.BooleanVar()
+    rollup_checkbox = tk.Checkbutton(root,
+                                     text='Include fund code rollups',
+                                     font=FONT_TUPLE,
+                                     variable=include_rollups)
+    rollup_checkbox.grid(sticky='W',
+                         row=ROLLUP_ROW,
+                         column=DATE_COLUMN + 1,
+                         columnspan=BUTTON_COUNT - 1)
+
+    # lists the invoice lines behind each subfund, on one sheet or many
+    DETAIL_ROW = ROLLUP_ROW + 1
+    include_detail = tk.BooleanVar()
+    detail_checkbox = tk.Checkbutton(root,
+                                     text='Include invoice line detail',
+                                     font=FONT_TUPLE,
+                                     variable=include_detail)
+    detail_checkbox.grid(sticky='W',
+                         row=DETAIL_ROW,
+                         column=DATE_COLUMN + 1,
+                         columnspan=BUTTON_COUNT - 1)
+    SPLIT_DETAIL_ROW = DETAIL_ROW + 1
+    split_detail = tk.BooleanVar()
+    split_detail_checkbox = tk.Checkbutton(root,
+                                           text='One detail sheet per ' \
+                                            'subfund',
+                                           font=FONT_TUPLE,
+                                           variable=split_detail,
+                                           command=lambda : \
+                                            include_detail.set(True) \
+                                            if split_detail.get() else None)
+    split_detail_checkbox.grid(sticky='W',
+                               row=SPLIT_DETAIL_ROW,
+                               column=DATE_COLUMN + 1,
+                               columnspan=BUTTON_COUNT - 1)
+
+    # fills in APPROPRIATION and ENCUMBRANCES from FOLIO finance
+    FINANCE_ROW = SPLIT_DETAIL_ROW + 1
+    include_finance = tk.BooleanVar()
+    finance_checkbox = tk.Checkbutton(root,
+                                      text='Fill in appropriations and ' \
+                                        'encumbrances from FOLIO',
+                                      font=FONT_TUPLE,
+                                      variable=include_finance)
+    finance_checkbox.grid(sticky='W',
+                          row=FINANCE_ROW,
+                          column=DATE_COLUMN + 1,
+                          columnspan=BUTTON_COUNT - 1)
+
+    # only folds in invoices since the last report of the fiscal year
+    RUNNING_TOTALS_ROW = FINANCE_ROW + 1
+    use_running_totals = tk.BooleanVar()
+    running_totals_checkbox = tk.Checkbutton(root,
+                                             text='Add to running ' \
+                                               'year-to-date totals ' \
+                                               '(FOLIO only)',
+                                             font=FONT_TUPLE,
+                                             variable=use_running_totals)
+    running_totals_checkbox.grid(sticky='W',
+                                 row=RUNNING_TOTALS_ROW,
+                                 column=DATE_COLUMN + 1,
+                                 columnspan=BUTTON_COUNT - 1)
     
     # bottom rows
     BOTTOM_ROW = 100 # arbitrarily large number
@@ -763,6 +4419,14 @@ if __name__ == '__main__':
                 columnspan=100,
                 padx=TEXT_SIDE_PADDING,
                 pady=(12, 12))
+    # shows the stage the report running on the worker thread has reached
+    STAGE_ROW = STATUS_ROW - 1
+    stage_label = tk.Label(root, text='', font=STATUS_FONT)
+    stage_label.grid(sticky='W',
+                     row=STAGE_ROW,
+                     column=IMAGE_COLUMN,
+                     columnspan=100,
+                     padx=TEXT_SIDE_PADDING)
     # NOTE: sticky='NESW' used to fill box to fit column and row
     enter_button = tk.Button(root,
                              text='Enter',
@@ -779,7 +4443,7 @@ if __name__ == '__main__':
                      column=BUTTON_COLUMN_START + 1)
     cancel_button = tk.Button(root,
                               text='Cancel',
-                              command=root.destroy)
+                              command=cancel_report)
     cancel_button.grid(sticky='NESW',
                        row=BUTTON_ROW,
                        column=BUTTON_COLUMN_START + 2,
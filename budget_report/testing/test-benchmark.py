@@ -0,0 +1,251 @@
+# Justin Caringal
+#
+# Benchmarks the report pipeline against synthetic FOLIO invoice exports
+# of increasing size, timing each stage and tracking its peak memory, so
+# that the scaling of the pipeline can be tracked between versions
+#
+# Runs without a display, i.e. from the budget_report folder:
+#     python testing/test-benchmark.py --rows 1000 100000 1000000
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# imports the program from the folder above, its GUI is never opened
+PROGRAM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAM_DIRECTORY)
+import budget_report as br
+
+DEFAULT_ROW_COUNTS = [1_000, 100_000, 1_000_000]
+DEFAULT_SEED = 2025
+DEFAULT_OUTPUT = 'benchmark-results.json'
+GENERATION_CHUNK_SIZE = 100_000 # rows generated and written at a time
+FISCAL_YEAR_START = '2024-07-01'
+FISCAL_YEAR_DAYS = 365
+CUTOFF_DATE = datetime(2025, 6, 1)
+SPLIT_LINE_SHARE = 0.1 # share of invoice lines split across two funds
+FUND_CODES = [
+    'LIB-BKS-GEN',
+    'LIB-BKS-CUR',
+    'LIB-BKS-REF',
+    'LIB-PER-PRINT',
+    'LIB-PER-ELEC',
+    'LIB-MED-AV',
+    'LIB-DB-SUBS',
+    'ARC-SPC-RARE',
+    'ARC-SPC-PRES',
+]
+EXPENSE_CLASSES = ['Books', 'Electronic', 'Media', 'Print', 'Serials', '']
+STATUSES = ['Paid', 'Approved', 'Open']
+
+
+def generate_export(filename : str, row_count : int, seed : int) -> None:
+    """Generates a synthetic FOLIO invoice export.
+
+    A function which writes invoice lines shaped like those exported
+    from FOLIO, with dates across a fiscal year and fund distribution
+    strings, some split across two funds. Rows are generated and
+    written a chunk at a time.
+
+    Args:
+        filename (str): The path of the CSV file to write
+        row_count (int): The number of invoice lines
+        seed (int): Seed of the random generator, for repeatable exports
+
+    Returns:
+        None
+    """
+
+    rng = np.random.default_rng(seed)
+    fiscal_year_start = pd.Timestamp(FISCAL_YEAR_START)
+    for chunk_start in range(0, row_count, GENERATION_CHUNK_SIZE):
+        size = min(GENERATION_CHUNK_SIZE, row_count - chunk_start)
+        line_numbers = np.arange(chunk_start, chunk_start + size)
+
+        # totals in integer cents, mostly small with a long tail
+        cents = np.round(rng.lognormal(mean=8, sigma=1.2, size=size)) \
+            .astype('int64') + 1
+        dates = fiscal_year_start + pd.to_timedelta(
+            rng.integers(0, FISCAL_YEAR_DAYS, size=size), unit='D')
+
+        # one "Code""Title""Percentage Used""Cost" distribution per fund
+        format_amounts = lambda amounts : \
+            pd.Series(amounts / br.CENTS_PER_DOLLAR).map('${:.2f}'.format)
+        first_codes = pd.Series(rng.choice(FUND_CODES, size=size))
+        first_classes = pd.Series(rng.choice(EXPENSE_CLASSES, size=size))
+        second_codes = pd.Series(rng.choice(FUND_CODES, size=size))
+        second_classes = pd.Series(rng.choice(EXPENSE_CLASSES, size=size))
+        is_split = rng.random(size=size) < SPLIT_LINE_SHARE
+        half_cents = cents // 2
+        whole_distributions = '"' + first_codes + '""' + first_classes + \
+            '""100%""' + format_amounts(cents) + '"'
+        split_distributions = '"' + first_codes + '""' + first_classes + \
+            '""50%""' + format_amounts(half_cents) + '"|"' + second_codes + \
+            '""' + second_classes + '""50%""' + \
+            format_amounts(cents - half_cents) + '"'
+
+        chunk_df = pd.DataFrame({
+            'Vendor invoice number' : [f'INV{number // 5}' \
+                                       for number in line_numbers],
+            br.DATE_CUTOFF_COLUMN_NAME : dates.strftime(br.US_DATE_FORMAT),
+            'Status' : rng.choice(STATUSES, size=size),
+            'Invoice line number' : [f'{number // 5}-{number % 5 + 1}' \
+                                     for number in line_numbers],
+            br.COST_COLUMN_NAME : cents / br.CENTS_PER_DOLLAR,
+            br.COLUMN_TO_BE_SPLIT : split_distributions.where(
+                is_split, whole_distributions),
+            'Description' : 'Synthetic invoice line',
+        })
+        chunk_df.to_csv(filename,
+                        mode='w' if chunk_start == 0 else 'a',
+                        header=chunk_start == 0,
+                        index=False)
+
+
+def measure(stage, *args, **kwargs) -> tuple[object, float, int]:
+    """Times a stage of the pipeline and tracks its peak memory.
+
+    A function which runs the stage twice: once timed on its own, then
+    again under tracemalloc, as tracing slows every allocation down.
+
+    Args:
+        stage (function): The stage of the pipeline to run
+        *args: Positional arguments of the stage
+        **kwargs: Keyword arguments of the stage
+
+    Returns:
+        tuple[object, float, int]: Returns the result of the stage,
+            the seconds it took and the peak bytes it allocated
+    """
+
+    start_time = time.perf_counter()
+    stage(*args, **kwargs)
+    seconds = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    try:
+        result = stage(*args, **kwargs)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak_bytes
+
+
+def benchmark_export(filename : str, work_directory : str) -> dict:
+    """Benchmarks each stage of the pipeline on one export.
+
+    Args:
+        filename (str): The path of the synthetic export
+        work_directory (str): Folder for the cache and the report
+
+    Returns:
+        dict: Returns the seconds and peak bytes of each stage
+    """
+
+    # every parse starts with an empty cache, except the cached stage
+    br.CACHE_DIRECTORY = os.path.join(work_directory, 'cache')
+    def extract_without_cache() -> pd.DataFrame:
+        shutil.rmtree(br.CACHE_DIRECTORY, ignore_errors=True)
+        return br.extract_data_from_csv(filename)
+    output_filename = os.path.join(work_directory, 'REPORT_benchmark.xlsx')
+
+    stages = {}
+    budget_df, seconds, peak_bytes = measure(extract_without_cache)
+    stages['extract_data_from_csv'] = (seconds, peak_bytes)
+    _, seconds, peak_bytes = measure(br.extract_data_from_csv, filename)
+    stages['extract_data_from_csv (cached)'] = (seconds, peak_bytes)
+    (ytd_cost_sums, current_cost_sums), seconds, peak_bytes = \
+        measure(br.sum_costs, budget_df, CUTOFF_DATE)
+    stages['sum_costs'] = (seconds, peak_bytes)
+    _, seconds, peak_bytes = measure(br.generate_xlsx_report,
+                                     filename,
+                                     ytd_cost_sums,
+                                     current_cost_sums,
+                                     CUTOFF_DATE,
+                                     output_filename=output_filename)
+    stages['generate_xlsx_report'] = (seconds, peak_bytes)
+
+    return {stage : {'seconds' : round(seconds, 4), 'peak_bytes' : peak_bytes} \
+            for stage, (seconds, peak_bytes) in stages.items()}
+
+
+def main() -> None:
+    """Generates the exports, benchmarks them and writes the results."""
+
+    parser = argparse.ArgumentParser(
+        description='Benchmarks budget_report on synthetic FOLIO exports.')
+    parser.add_argument('--rows',
+                        type=int,
+                        nargs='+',
+                        default=DEFAULT_ROW_COUNTS,
+                        help='invoice lines of each export ' \
+                            '(default: %(default)s)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=DEFAULT_SEED,
+                        help='seed of the synthetic exports ' \
+                            '(default: %(default)s)')
+    parser.add_argument('--exports',
+                        default=os.path.join(tempfile.gettempdir(),
+                                             'budget_report_benchmark'),
+                        help='folder the exports are generated in and ' \
+                            'reused from (default: %(default)s)')
+    parser.add_argument('-o', '--output',
+                        help=f'JSON file of the results (default: ' \
+                            f'{DEFAULT_OUTPUT} in the exports folder)')
+    args = parser.parse_args()
+    if args.output is None:
+        args.output = os.path.join(args.exports, DEFAULT_OUTPUT)
+
+    # status messages would otherwise be sent to the missing window
+    br.status_handler = lambda msg, col : None
+    os.makedirs(args.exports, exist_ok=True)
+    # keeps the cache, snapshots and running totals of the user apart,
+    # see benchmark_export()
+    home_directory = tempfile.TemporaryDirectory()
+    br.CACHE_DIRECTORY = os.path.join(home_directory.name, 'cache')
+    br.SNAPSHOT_DIRECTORY = os.path.join(home_directory.name, 'snapshots')
+    br.YTD_STORE_PATH = os.path.join(home_directory.name, 'ytd.sqlite3')
+
+    results = []
+    for row_count in args.rows:
+        filename = os.path.join(args.exports,
+                                f'export-{row_count}-{args.seed}.csv')
+        if not os.path.exists(filename):
+            print(f'Generating {row_count} invoice lines.')
+            generate_export(filename, row_count, args.seed)
+        print(f'Benchmarking {row_count} invoice lines.')
+        with tempfile.TemporaryDirectory() as work_directory:
+            stages = benchmark_export(filename, work_directory)
+        for stage, measurements in stages.items():
+            print(f'    {stage:<32}{measurements["seconds"]:>10.3f} s' \
+                  f'{measurements["peak_bytes"] / 1024 ** 2:>10.1f} MiB')
+        results.append({
+            'rows' : row_count,
+            'file_bytes' : os.path.getsize(filename),
+            'stages' : stages,
+        })
+
+    with open(args.output, 'w') as output_file:
+        json.dump({
+            'timestamp' : datetime.now().isoformat(timespec='seconds'),
+            'python' : platform.python_version(),
+            'pandas' : pd.__version__,
+            'seed' : args.seed,
+            'results' : results,
+        }, output_file, indent=4)
+    home_directory.cleanup()
+    print(f'Wrote {args.output}.')
+
+
+if __name__ == '__main__':
+    main()
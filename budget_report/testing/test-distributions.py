@@ -0,0 +1,78 @@
+# Justin Caringal
+#
+# Checks how invoice lines are split across their fund distributions,
+# both by percentage and by amount, against lines worked out by hand
+#
+# Runs without a display, i.e. from the budget_report folder:
+#     python testing/test-distributions.py
+
+import os
+import sys
+import pandas as pd
+
+# imports the program from the folder above, its GUI is never opened
+PROGRAM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAM_DIRECTORY)
+import budget_report as br
+
+# invoice lines of "Invoice line fund distributions" and their totals,
+# along with the cents each distribution is expected to receive
+TEST_LINES = [
+    ( # a single fund
+        '"LIB-BKS-GEN""Books""100%""$25.00"',
+        '25.00',
+        [2500],
+    ),
+    ( # by percentage, the last fund takes the rounding remainder
+        '"LIB-BKS-GEN""Books""33.3333%""$3.33" | ' \
+            '"LIB-BKS-CUR""Books""33.3333%""$3.33" | ' \
+            '"LIB-BKS-REF""Books""33.3334%""$3.34"',
+        '10.00',
+        [333, 333, 334],
+    ),
+    ( # by amount, no percentage given
+        '"LIB-PER-PRINT""Print""$40.00""$40.00" | ' \
+            '"LIB-PER-ELEC""Electronic""$60.00""$60.00"',
+        '100.00',
+        [4000, 6000],
+    ),
+    ( # by amount and by percentage on the same line
+        '"LIB-MED-AV""Media""$1,250.50""$1,250.50" | ' \
+            '"LIB-DB-SUBS""""50%""$1,249.50"',
+        '2500.00',
+        [125050, 124950],
+    ),
+    ( # no distributions, kept whole
+        '',
+        '12.34',
+        [1234],
+    ),
+]
+
+
+def main() -> None:
+    """Splits the test lines and checks every distribution's cents."""
+
+    # status messages would otherwise be sent to the missing window
+    br.status_handler = lambda msg, col : None
+
+    distributions = pd.Series([line[0] for line in TEST_LINES],
+                              dtype='string')
+    cents_column = br.convert_to_cents(pd.Series([line[1] \
+                                                  for line in TEST_LINES]))
+    split_df = br.split_distributions(distributions, cents_column)
+
+    failures = 0
+    for index, (line, total, expected_cents) in enumerate(TEST_LINES):
+        actual_cents = split_df.loc[[index], br.CENTS_COLUMN_NAME].tolist()
+        is_passed = actual_cents == expected_cents
+        failures += not is_passed
+        print(f'{"PASS" if is_passed else "FAIL"}: line {index + 1} of ' \
+              f'${total}, expected {expected_cents}, got {actual_cents}')
+
+    print(f'{len(TEST_LINES) - failures}/{len(TEST_LINES)} lines passed.')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# Justin Caringal
+#
+# Checks that appropriations and encumbrances fetched from FOLIO finance
+# line up with the expenditures of each fund code on the report, including
+# budgets with nothing spent yet, and that the finance cache keeps tenants
+# apart, against a stand-in for the FOLIO APIs
+#
+# Runs without a display or FOLIO, i.e. from the budget_report folder:
+#     python testing/test-finance.py
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import openpyxl
+import pandas as pd
+
+# imports the program from the folder above, its GUI is never opened
+PROGRAM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAM_DIRECTORY)
+import budget_report as br
+
+CUTOFF_DATE = datetime(2025, 1, 1)
+# budgets of the fiscal year, and the codes of their funds
+BUDGETS = [
+    {'id' : 'budget-bks', 'fundId' : 'fund-bks', 'allocated' : 1000.00,
+     'encumbered' : 80.00},
+    {'id' : 'budget-gen', 'fundId' : 'fund-gen', 'allocated' : 500.00,
+     'encumbered' : 20.00},
+    {'id' : 'budget-med', 'fundId' : 'fund-med', 'allocated' : 200.00,
+     'encumbered' : 0},
+]
+FUNDS = [
+    {'id' : 'fund-bks', 'code' : 'LIB-BKS'},
+    {'id' : 'fund-gen', 'code' : 'LIB-GEN'},
+    {'id' : 'fund-med', 'code' : 'LIB-MED'}, # no spending yet
+]
+# expenditures of the report in cents, by expense class and fund code
+YTD_COST_SUMS = {'Books' : 30000, 'Electronic' : 10000, 'General' : 5000}
+CURRENT_COST_SUMS = {'Books' : 5000, 'Electronic' : 0, 'General' : 0}
+FUND_CENTS = pd.DataFrame({
+    'ytd' : [40000, 5000],
+    'current' : [5000, 0],
+}, index=pd.Index(['LIB-BKS', 'LIB-GEN'], name='Code'))
+# expected rows of the BY FUND CODE sheet,
+# (APPROPRIATION, YTD, ENCUMBRANCES, FREE BALANCE)
+EXPECTED_ROWS = {
+    'LIB' : (1700.00, 450.00, 100.00, 1150.00),
+    'LIB-BKS' : (1000.00, 400.00, 80.00, 520.00),
+    'LIB-GEN' : (500.00, 50.00, 20.00, 430.00),
+    'LIB-MED' : (200.00, 0, 0, 200.00),
+    'TOTALS' : (1700.00, 450.00, 100.00, 1150.00),
+}
+# expected (APPROPRIATION, ENCUMBRANCES) of the TOTALS row of the budget
+# sheet, subfunds themselves are left as 0
+EXPECTED_TOTALS = (1700.00, 100.00)
+
+
+class StandInFolioClient:
+    """Answers the FOLIO finance requests of fetch_finance_cents()."""
+
+    def __init__(self, okapi_url : str = '', tenant_id : str = '') -> None:
+        self.okapi_url = okapi_url
+        self.tenant_id = tenant_id
+
+    def folio_get(self,
+                  path : str,
+                  key : str = None,
+                  query_params : dict = None) -> dict | list:
+        if path == '/finance/budgets':
+            return {'budgets' : BUDGETS, 'totalRecords' : len(BUDGETS)}
+        return FUNDS
+
+
+def check(name : str, expected, actual) -> bool:
+    """Prints whether a check passed and returns the result."""
+
+    is_passed = expected == actual
+    print(f'{"PASS" if is_passed else "FAIL"}: {name}, expected ' \
+          f'{expected}, got {actual}')
+    return is_passed
+
+
+def main() -> None:
+    """Writes a report with the fetched finance and checks its rows."""
+
+    # status messages would otherwise be sent to the missing window
+    br.status_handler = lambda msg, col : None
+
+    with ThreadPoolExecutor() as executor:
+        finance_cents = br.fetch_finance_cents(StandInFolioClient(),
+                                               'fiscal-year',
+                                               executor)
+
+    with tempfile.TemporaryDirectory() as work_directory:
+        output_filename = os.path.join(work_directory, 'REPORT_finance.xlsx')
+        br.generate_xlsx_report('finance.csv',
+                                YTD_COST_SUMS,
+                                CURRENT_COST_SUMS,
+                                CUTOFF_DATE,
+                                finance_cents=finance_cents,
+                                fund_cents=FUND_CENTS,
+                                output_filename=output_filename)
+        workbook = openpyxl.load_workbook(output_filename, read_only=True)
+        fund_rows = {row[0].strip() : (row[1], row[3], row[4], row[5]) \
+                     for row in workbook[br.FUND_SHEET_NAME].iter_rows(
+                        min_row=4,
+                        values_only=True) \
+                     if row[0]}
+        budget_rows = {row[0] : (row[1], row[4]) \
+                       for row in workbook.worksheets[0].iter_rows(
+                          min_row=4,
+                          values_only=True) \
+                       if row[0]}
+        workbook.close()
+
+        # a second tenant with the same fiscal year code is not handed
+        # the cached finance of the first
+        br.CACHE_DIRECTORY = os.path.join(work_directory, 'cache')
+        br.fetch_fiscal_year_id = lambda f, code : 'fiscal-year'
+        br.load_finance_cents(StandInFolioClient('https://a', 'a'), 'FY2025')
+        br.load_finance_cents(StandInFolioClient('https://b', 'b'), 'FY2025')
+        cache_count = len(os.listdir(br.CACHE_DIRECTORY))
+
+    results = [check(code, EXPECTED_ROWS.get(code), fund_rows.get(code)) \
+               for code in sorted(EXPECTED_ROWS.keys() | fund_rows.keys())]
+    results.append(check('budget sheet TOTALS',
+                         EXPECTED_TOTALS,
+                         budget_rows.get('TOTALS')))
+    results.append(check('subfund appropriations',
+                         [0] * len(YTD_COST_SUMS),
+                         [budget_rows[subfund][0] \
+                          for subfund in YTD_COST_SUMS]))
+    results.append(check('finance cache files per tenant', 2, cache_count))
+
+    print(f'{sum(results)}/{len(results)} checks passed.')
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,16 +9,18 @@
 ### LIBRARIES / PACKAGES ###
 
 import os
+import re
 import sys
 import json
 import tkinter as tk
 import webbrowser as wb
 from bisect import bisect
-from time import sleep
+from time import sleep, monotonic
 import folioclient
 from PIL import ImageTk, Image
 import pycallnumber as pycn
 from pycallnumber.units import callnumbers
+from pycallnumber.units.callnumbers.lc import LcClass
 from pycallnumber.units.simple import Alphabetic
 from pycallnumber.units.numbers import Number
 from pycallnumber.exceptions import InvalidCallNumberStringError
@@ -39,6 +41,7 @@ OUTPUT_PADDING = '-'
 DUMMY_TITLE_TEXT = 'INPUTTED CALL NUMBER'
 LINE_LENGTH = CALL_NUM_BUFFER + TITLE_BUFFER
 SLICE_ONE_SIDED = 10
+CALL_NUM_INDEX_TTL = 15 * 60 # seconds before an indexed search is re-queried
 
 # scope resolution for variable used in
 # login_folioclient and start_call_num_search
@@ -46,7 +49,22 @@ tenant = None
 
 # scope resolution for global variable used
 # as comparison against extracted call numbers
-input_call_num_type = None # scope resolution
+input_call_num_scheme = None # scope resolution
+
+# local call numbers start with a letter prefix, a space and a number,
+# i.e. 'DVD 1234' or 'CD 56 V.2', as pycallnumber parses nearly any
+# string as a Local call number. The space keeps bare LC classes such
+# as 'PS3545' out, see parse_lc()
+LOCAL_CALL_NUMBER_PATTERN = re.compile(r'[A-Z]+\.? \d', re.IGNORECASE)
+
+# registry of supported call number schemes, populated through
+# register_scheme() and checked in insertion order (first match wins)
+CALL_NUMBER_SCHEMES = {}
+
+# local index of previously extracted items, keyed by the search query
+# and partitioned by scheme name, along with when it was indexed, i.e.
+# {query : {'indexedAt' : 123.4, 'partitions' : {'lc' : [...], ...}}}
+call_num_index = {}
 
 # keys required in config.json
 REQUIRED_CONFIG_KEYS = {
@@ -148,6 +166,169 @@ def is_juvenile_fiction(call_number : callnumbers) -> bool:
     return True
 
 
+def register_scheme(name : str,
+                    label : str,
+                    parser,
+                    sort_key,
+                    classification) -> None:
+    """Adds a call number scheme to the scheme registry.
+
+    A function which registers a call number scheme under a unique
+    name so that it can be recognized during input validation and
+    extraction. Schemes are checked in the order they are registered,
+    so broader schemes (i.e. local call numbers) should come last.
+
+    Args:
+        name (str): The unique key of the scheme, used as the name
+            of its partition in the local index
+        label (str): The human-readable name of the scheme
+        parser (callable): Takes a call number string and returns a
+            parsed call number, raising InvalidCallNumberStringError
+            if the string does not belong to the scheme
+        sort_key (callable): Takes a parsed call number and returns a
+            string which sorts in shelf order
+        classification (callable): Takes a parsed call number and
+            returns the prefix used to query the FOLIO API
+
+    Returns:
+        None
+    """
+
+    CALL_NUMBER_SCHEMES[name] = {
+        'label' : label,
+        'parser' : parser,
+        'sortKey' : sort_key,
+        'classification' : classification,
+    }
+
+
+def parse_as(call_number : str, unit_type) -> callnumbers:
+    """Parses a call number string as a single pycallnumber type.
+
+    A function which restricts pycallnumber to one unit type so that a
+    scheme only accepts the call numbers that belong to it.
+
+    Args:
+        call_number (str): The call number string to be parsed
+        unit_type: The pycallnumber unit type to parse as
+
+    Returns:
+        callnumbers: Returns the parsed call number, raises
+            InvalidCallNumberStringError otherwise
+    """
+
+    return pycn.callnumber(call_number, unittypes=[unit_type])
+
+
+def parse_lc(call_number : str) -> callnumbers:
+    """Parses a call number string as a Library of Congress call number.
+
+    A function which also accepts a bare LC class without a cutter, i.e.
+    'PS3545' or 'QA76.73', so long as its letters and number are not
+    spaced apart like a local call number (i.e. 'DVD 1234').
+
+    Args:
+        call_number (str): The call number string to be parsed
+
+    Returns:
+        callnumbers: Returns the parsed call number, raises
+            InvalidCallNumberStringError otherwise
+    """
+
+    try:
+        return parse_as(call_number, callnumbers.LC)
+    except InvalidCallNumberStringError:
+        if re.search(r'\s', call_number):
+            raise
+        return parse_as(call_number, LcClass)
+
+
+def parse_juvenile_fiction(call_number : str) -> callnumbers:
+    """Parses a call number string as a Juvenile Fiction call number.
+
+    A function which parses a call number string as a local call number
+    and only accepts it if it follows the Juvenile Fiction pattern.
+
+    Args:
+        call_number (str): The call number string to be parsed
+
+    Returns:
+        callnumbers: Returns the parsed call number, raises
+            InvalidCallNumberStringError otherwise
+    """
+
+    parsed_call_num = parse_as(call_number, callnumbers.Local)
+    if not is_juvenile_fiction(parsed_call_num):
+        raise InvalidCallNumberStringError
+    return parsed_call_num
+
+
+def parse_local(call_number : str) -> callnumbers:
+    """Parses a call number string as a local call number.
+
+    A function which only accepts call numbers which follow
+    LOCAL_CALL_NUMBER_PATTERN, so that arbitrary text is not mistaken
+    for a local call number.
+
+    Args:
+        call_number (str): The call number string to be parsed
+
+    Returns:
+        callnumbers: Returns the parsed call number, raises
+            InvalidCallNumberStringError otherwise
+    """
+
+    if not LOCAL_CALL_NUMBER_PATTERN.match(call_number):
+        raise InvalidCallNumberStringError
+    return parse_as(call_number, callnumbers.Local)
+
+
+def classify_call_number(call_number : str) -> tuple[str, callnumbers]:
+    """Finds the scheme of a call number string.
+
+    A function which runs a call number string through the parser of
+    each registered scheme and returns the first one to accept it.
+
+    Args:
+        call_number (str): The call number string to be classified
+
+    Returns:
+        tuple[str, callnumbers]: Returns the name of the matching scheme
+            and the parsed call number, raises
+            InvalidCallNumberStringError if no scheme matches
+    """
+
+    for name, scheme in CALL_NUMBER_SCHEMES.items():
+        try:
+            return name, scheme['parser'](call_number)
+        except InvalidCallNumberStringError:
+            continue # tries next scheme
+    raise InvalidCallNumberStringError
+
+
+def is_indexed(search_query : str) -> bool:
+    """Checks the local index for a recent identical search.
+
+    A function which drops searches indexed more than
+    CALL_NUM_INDEX_TTL seconds ago, so that changes to the holdings in
+    FOLIO show up without restarting the program.
+
+    Args:
+        search_query (str): The query used to search FOLIO
+
+    Returns:
+        bool: Returns True if the search is indexed and recent,
+            False otherwise
+    """
+
+    indexed_search = call_num_index.get(search_query)
+    if indexed_search and \
+            monotonic() - indexed_search['indexedAt'] < CALL_NUM_INDEX_TTL:
+        return True
+    call_num_index.pop(search_query, None) # re-queried from FOLIO
+    return False
+
+
 def update_status(*, # requires all arguments to be keyword-only arguments
                   msg : str = '',
                   col : str = DEFAULT_COL,
@@ -200,7 +381,7 @@ def update_validation(*entry : tk.Event) -> bool:
         bool: Returns True if patron ID is valid, False otherwise
     """
 
-    global input_call_num_type
+    global input_call_num_scheme
 
     # retrieves patron id from text field
     call_num = call_num_input.get().upper().strip()
@@ -209,21 +390,12 @@ def update_validation(*entry : tk.Event) -> bool:
     is_valid_id = False # default case
     try:
 
-        call_num = pycn.callnumber(call_num) # attempts to convert to pycn
-        input_call_num_type = type(call_num) # saves type for comparison
-        
-        if input_call_num_type == callnumbers.lc.LC: # input is LC
-            update_status(msg='Valid LC call number.',
-                          col=SUCCESS_COL)
-        elif input_call_num_type == callnumbers.dewey.Dewey: # input is DDC
-            update_status(msg='Valid Dewey call number.',
-                          col=SUCCESS_COL)
-        elif is_juvenile_fiction(call_num): # input is juvenile fiction
-            update_status(msg='Valid Juvenile Fiction call number.',
-                          col=SUCCESS_COL)
-        
-        else: # all other call number types raise an error
-            raise InvalidCallNumberStringError 
+        # attempts to match input against registered schemes,
+        # raises an error if no scheme accepts the input
+        input_call_num_scheme, _ = classify_call_number(call_num)
+        scheme_label = CALL_NUMBER_SCHEMES[input_call_num_scheme]['label']
+        update_status(msg=f'Valid {scheme_label} call number.',
+                      col=SUCCESS_COL)
         
         # call number input is valid
         update_status(enter_state='normal')
@@ -389,25 +561,25 @@ def login_folioclient() -> folioclient.FolioClient:
 
 
 def extract_queries(queries : list,
-                    total_records : int) -> list:
-    """Extracts FOLIO information into a list.
+                    total_records : int) -> dict:
+    """Extracts FOLIO information into lists partitioned by scheme.
     
     A function which takes a list from the FOLIO
     API method and extracts the relevant information
     into a dictionary which is then appended to
-    a return list.
+    the list of its call number scheme.
 
     Args:
         queries (list): A FOLIO object containing call number information
         total_records (int): The total count of records listed (NOT items)
     
     Returns:
-        list: A list of the relevant extracted information stored
-            in separate dictionaries.
+        dict: A dictionary of scheme names to lists of the relevant
+            extracted information stored in separate dictionaries.
     """
 
     global tenant # local tenant ID for comparison
-    extracted_items = [] # the list to be returned
+    extracted_items = {} # the partitions to be returned
 
     for index, query in enumerate(queries):
         queries_processed_txt = f'{index}/{total_records}' \
@@ -423,8 +595,9 @@ def extract_queries(queries : list,
         
         # iterates through each separate item tied to a holding
         #
-        # brute forces finding LC call numbers, because Pickler
-        # uses both LC and Dewey call numbers (for some reason)
+        # every item is kept under its own scheme rather than only
+        # the scheme of the input, as Pickler uses LC, Dewey, and
+        # local call numbers (for some reason)
         for item in items:
 
             # checks if call number is from Pickler or not
@@ -435,23 +608,28 @@ def extract_queries(queries : list,
             item_info = {
                 'title' : title,
                 'callNumber' : 'n/a',
-                'shelvingOrder' : 'n/a' # for sorting
+                'sortKey' : '', # for sorting and bisecting
+                'shelvingOrder' : 'n/a'
             }
 
             call_num_components = item['effectiveCallNumberComponents']
-            extracted_call_num_type = None # scope resolution
+            scheme_name = None # scope resolution
             try: # replaces "if 'callNumber' in call_num_components:"
-                call_num = pycn.callnumber(call_num_components['callNumber'])
+                scheme_name, call_num = \
+                    classify_call_number(call_num_components['callNumber'])
                 item_info['callNumber'] = call_num
-                extracted_call_num_type = type(call_num)
+                item_info['sortKey'] = \
+                    CALL_NUMBER_SCHEMES[scheme_name]['sortKey'](call_num)
             except Exception: # catches all exceptions, not just KeyErrors
-                ...
+                continue # item has no call number in a known scheme
 
             if 'effectiveShelvingOrder' in item:
                 item_info['shelvingOrder'] = item['effectiveShelvingOrder']
 
-            if input_call_num_type == extracted_call_num_type:
-                extracted_items.append(item_info)
+            # adds item to the partition of its scheme
+            if scheme_name not in extracted_items:
+                extracted_items[scheme_name] = []
+            extracted_items[scheme_name].append(item_info)
     
     return extracted_items
 
@@ -492,7 +670,8 @@ def remove_duplicates(items : list) -> list:
 
 
 def extract_slice(items : list,
-                  call_number : callnumbers) -> list:
+                  call_number : callnumbers,
+                  sort_key : str) -> list:
     """Identifies insertion point of call number into lst.
     
     A function which finds where a call number goes into a list
@@ -500,8 +679,10 @@ def extract_slice(items : list,
     preceeding and succeeding it.
     
     Args:
-        items (list): A list of dictionaries with item information
+        items (list): A list of dictionaries with item information,
+            sorted by sortKey
         call_number (callnumbers): The number to be inserted
+        sort_key (str): The encoded sort key of the call number
     
     Returns:
         list, bool, bool: Returns a slice of the original slice
@@ -512,12 +693,15 @@ def extract_slice(items : list,
 
     dummy_dict = {
         'callNumber': call_number,
+        'sortKey' : sort_key,
         'shelvingOrder' : '',
         'title' : DUMMY_TITLE_TEXT,
     }
 
-    search_key = lambda info : (info['callNumber'])
-    insertion_point = bisect(items, call_number, key=search_key)
+    # copies list to keep the dummy out of the local index
+    items = list(items)
+    search_key = lambda info : (info['sortKey'])
+    insertion_point = bisect(items, sort_key, key=search_key)
     items.insert(insertion_point, dummy_dict)
 
     # scope resolution, default case
@@ -560,12 +744,9 @@ def print_call_num_slice(item_slice : list,
         None
     """
 
-    global input_call_num_type # variable for type comparison
-    call_num_header = ' (Juvenile Fiction)' # default
-    if input_call_num_type == callnumbers.lc.LC:
-        call_num_header = ' (Library of Congress)'
-    elif input_call_num_type == callnumbers.dewey.Dewey:
-        call_num_header = ' (Dewey Decmial)'
+    global input_call_num_scheme # variable for scheme lookup
+    scheme_label = CALL_NUMBER_SCHEMES[input_call_num_scheme]['label']
+    call_num_header = f' ({scheme_label})'
 
     # sets up output header
     output_heading = f'{f'CALL NUMBER{call_num_header}':<{CALL_NUM_BUFFER}}' \
@@ -650,22 +831,20 @@ def start_call_num_search() -> None:
     # takes input from user and files
     call_number = call_num_input.get() # retrieves data
     call_number = call_number.upper().strip() # cleans and standardizes data
-    call_number = pycn.callnumber(call_number) # error handling pre-validated
-    classification = None # scope resolution
-    if type(call_number) == callnumbers.lc.LC: # class letters
-        classification = call_number.classification.letters
-    elif type(call_number) == callnumbers.dewey.Dewey: # first number
-        classification = call_number.classification
-    elif is_juvenile_fiction(call_number): # 'F [LETTER]'
-        classification = f'{call_number.parts[0]} {call_number.parts[1]}'
-    else:
+    scheme_name = None # scope resolution
+    try: # error handling pre-validated
+        scheme_name, call_number = classify_call_number(call_number)
+    except InvalidCallNumberStringError:
         # safely exits program query execution
         # input pre-validated, should never execute
         # here unless something goes wrong
         update_status(msg='Something went wrong with the ' \
                       'inputted call number, please try again.',
-                      col=FAIL_COL)
+                      col=FAIL_COL,
+                      enter_state='normal')
         return
+    scheme = CALL_NUMBER_SCHEMES[scheme_name]
+    classification = scheme['classification'](call_number)
 
     # formats search query
     global tenant
@@ -691,10 +870,14 @@ def start_call_num_search() -> None:
         update_status(msg=status_msg)
 
 
-    # makes the information queries
+    # makes the information queries, skipped if the local index
+    # already holds the items of an identical search
     SEARCH_WINDOW_LIMIT = 100
     offset = 0
     queries = []
+    already_indexed = is_indexed(search_query)
+    if already_indexed:
+        offset = total_records # items already partitioned
     while offset < total_records:
 
         # organizes and formats status updates to the user
@@ -724,26 +907,36 @@ def start_call_num_search() -> None:
         queries += new_query # appends to total queries
         offset += SEARCH_WINDOW_LIMIT # moves offset window
 
-    # a list of call number information from a FOLIO list
     call_num_input.delete(0, 'end')
-    update_status(msg='Extracting items from FOLIO.')
-    extracted_items = extract_queries(queries, total_records)
-
-    # sorts the list
-    update_status(msg='Sorting extracted items.')
-    sorting_reqs = lambda info : (info['callNumber'])
-    sorted_items = sorted(extracted_items, key=sorting_reqs)
-
-    # trims duplicates from list
-    update_status(msg='Trimming duplicates.')
-    trimmed_items = remove_duplicates(sorted_items)
+    if not already_indexed:
+        # a dict of call number information partitioned by scheme
+        update_status(msg='Extracting items from FOLIO.')
+        extracted_items = extract_queries(queries, total_records)
+
+        # sorts and trims duplicates from each partition once,
+        # storing the results in the local index for future browses
+        update_status(msg='Sorting extracted items and trimming duplicates.')
+        sorting_reqs = lambda info : (info['sortKey'])
+        call_num_index[search_query] = {
+            'indexedAt' : monotonic(),
+            'partitions' : {
+                name : remove_duplicates(sorted(items, key=sorting_reqs))
+                for name, items in extracted_items.items()
+            },
+        }
+
+    # only the partition of the inputted scheme is browsed
+    trimmed_items = \
+        call_num_index[search_query]['partitions'].get(scheme_name, [])
     
     # finds where to put inputted call number
     update_status(msg='Extracting call number slice.')
     list_slice, \
         start_is_oob, \
         end_is_oob \
-        = extract_slice(trimmed_items, call_number) # oob == out of bounds
+        = extract_slice(trimmed_items,
+                        call_number,
+                        scheme['sortKey'](call_number)) # oob == out of bounds
     
     print_call_num_slice(list_slice, start_is_oob, end_is_oob)
     success_msg = f'Success! Done printing slice around \"{call_number}\".'
@@ -753,6 +946,40 @@ def start_call_num_search() -> None:
     return
 
 
+### CALL NUMBER SCHEMES ###
+
+# NOTE: order matters, as the first scheme to accept a call number
+# claims it. Local call numbers are the broadest scheme and must be
+# registered last. New schemes only need a parser, a sort key encoder,
+# and a way of finding the classification used to query FOLIO.
+register_scheme(name='lc',
+                label='Library of Congress',
+                parser=parse_lc,
+                sort_key=lambda cn : cn.for_sort(),
+                classification=lambda cn : cn.letters \
+                    if isinstance(cn, LcClass) else cn.classification.letters)
+register_scheme(name='dewey',
+                label='Dewey Decimal',
+                parser=lambda cn : parse_as(cn, callnumbers.Dewey),
+                sort_key=lambda cn : cn.for_sort(),
+                classification=lambda cn : cn.classification)
+register_scheme(name='juvenile_fiction', # 'F [LETTER]'
+                label='Juvenile Fiction',
+                parser=parse_juvenile_fiction,
+                sort_key=lambda cn : cn.for_sort(),
+                classification=lambda cn : f'{cn.parts[0]} {cn.parts[1]}')
+register_scheme(name='sudoc', # government documents, i.e. 'Y 4.B 22/1:S.HRG.'
+                label='SuDoc',
+                parser=lambda cn : parse_as(cn, callnumbers.SuDoc),
+                sort_key=lambda cn : cn.for_sort(),
+                classification=lambda cn : cn.stem.agency)
+register_scheme(name='local', # local media, i.e. 'DVD 1234'
+                label='Local',
+                parser=parse_local,
+                sort_key=lambda cn : cn.for_sort(),
+                classification=lambda cn : cn.parts[0])
+
+
 # Justin Caringal, TSU, BSCS 2025, github@jaq-lagnirac
 # main loop functionality, generates root tkinter window
 # where most of the user interacts
@@ -0,0 +1,48 @@
+# Justin Caringal
+#
+# Tests the scheme registry on call numbers which look alike, i.e. bare
+# LC classes and spaced local media call numbers, without a display
+#
+# Runs from the call_number_browser folder:
+#     python testing/test-schemes.py
+
+import os
+import sys
+
+# imports the program from the folder above, its GUI is never opened
+PROGRAM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAM_DIRECTORY)
+import call_number_browser as cnb
+
+# call number : (expected scheme, expected classification)
+EXPECTED_SCHEMES = {
+    'PS3545' : ('lc', 'PS'),
+    'QA76' : ('lc', 'QA'),
+    'QA76.73' : ('lc', 'QA'),
+    'PS3545 .I345' : ('lc', 'PS'),
+    'QA 76.73 .P98' : ('lc', 'QA'),
+    'Y 4.B 22/1:S.HRG.' : ('sudoc', 'Y 4'),
+    'DVD 1234' : ('local', 'DVD'),
+    'CD 56 V.2' : ('local', 'CD'),
+}
+
+
+def main() -> None:
+    """Classifies each call number and prints those that do not match."""
+
+    failed_count = 0
+    for call_number, expected in EXPECTED_SCHEMES.items():
+        scheme_name, parsed_call_num = cnb.classify_call_number(call_number)
+        classification = \
+            cnb.CALL_NUMBER_SCHEMES[scheme_name]['classification'](
+                parsed_call_num)
+        found = (scheme_name, str(classification))
+        if found != expected:
+            failed_count += 1
+            print(f'{call_number}: expected {expected}, found {found}')
+    print(f'{len(EXPECTED_SCHEMES) - failed_count}/{len(EXPECTED_SCHEMES)} ' \
+          'call numbers classified as expected.')
+
+
+if __name__ == '__main__':
+    main()
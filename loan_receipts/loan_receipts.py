@@ -14,15 +14,23 @@
 import os
 import sys
 import json
+import queue
+import socket
+import threading
+import subprocess
 import tkinter as tk
 import webbrowser as wb
 from datetime import datetime, timezone, timedelta
 from time import sleep
 from typing import Generator
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import folioclient
-import win32print
 from PIL import ImageTk, Image
+try:
+    import win32print # only on Windows, see PRINTER_BACKENDS
+except ImportError:
+    win32print = None
 
 ### GLOBAL CONSTANTS / VARIABLES ###
 
@@ -34,6 +42,29 @@ FONT_TUPLE = ('Verdana', 10)
 LOGO_PATH = os.path.join('images', 'logo-no-background.png')
 HELP_PATH = os.path.join('texts', 'info-help-text.txt')
 SEARCH_WIN_SIZE = 15 # minutes
+LOAN_MAX_WORKERS = 8 # loan lookups to the FOLIO API in flight at once
+LOAN_ID_BATCH_SIZE = 50 # loan IDs per /circulation/loans query
+FOLIO_KEEPALIVE_INTERVAL = 30 # seconds between checks of the FOLIO session
+SPOOL_DIRECTORY = os.path.join(os.path.expanduser('~'),
+                               '.loan_receipts',
+                               'spool')
+SPOOL_EXTENSION = '.json'
+PRINT_RETRY_DELAY = 5 # seconds, multiplied by the number of failed attempts
+PRINT_MAX_RETRY_DELAY = 60 # seconds, longest wait between attempts
+SPOOL_POLL_MS = 200 # how often the window checks on the print spooler
+
+# FOLIO session kept open across patrons, see open_folio_session()
+folio_session = None
+folio_session_login = None # config.json login the session was opened with
+folio_session_lock = threading.RLock()
+
+# print jobs, drained in order by run_print_spooler()
+print_jobs = queue.Queue() # paths of spooled jobs
+spool_status_queue = queue.Queue() # (msg, col) for the window
+retrying_print_job = threading.Event() # set while the printer is down
+discard_print_job = threading.Event() # set by staff to skip a stuck job
+unprinted_job_count = 0 # jobs discarded this run, shown in the window
+memory_printer = [] # receipts sent to the 'memory' printer backend
 
 # keys required in config.json
 REQUIRED_CONFIG_KEYS = {
@@ -43,6 +74,23 @@ REQUIRED_CONFIG_KEYS = {
     'password' : '[PASSWORD]',
     }
 
+# optional key in config.json choosing how receipts reach the printer
+PRINTER_BACKEND_KEY = 'printer_backend'
+DEFAULT_PRINTER_BACKEND = 'win32print'
+# what the printer name means to each backend, see PRINTER_BACKENDS
+PRINTER_BACKEND_HELP = {
+    'win32print' : 'The name of a printer installed on Windows.',
+    'socket' : 'The address of a network receipt printer, i.e. ' \
+        '"192.168.1.50" or "192.168.1.50:9100".',
+    'cups' : 'The name of a CUPS print queue, as listed by "lpstat -a".',
+    'file' : 'The path of a file or device the receipts are added to, ' \
+        'i.e. "receipts.prn" or "/dev/usb/lp0".',
+    'memory' : 'Ignored, receipts are kept in memory for testing.',
+}
+RAW_PRINTER_PORT = 9100 # default port of network receipt printers
+PRINTER_SOCKET_TIMEOUT = 10 # seconds
+ESCPOS_INITIALIZE = b'\x1b@' # ESC @, resets the printer before a raw job
+
 ### FUNCTIONS ###
 
 def resource_path(relpath : str) -> str:
@@ -175,6 +223,7 @@ def find_printers() -> str:
     
     A function which uses the win32print to find a list of
     local printers to connect to and print receipts from.
+    Other printer backends are described instead.
     
     See DEFAULT_PRINTER_NAME under the main loop for the
     default name.
@@ -187,6 +236,15 @@ def find_printers() -> str:
             and information from EnumPrinters.
     """
 
+    backend_name = read_printer_backend()
+    if backend_name != 'win32print' or not win32print:
+        backend_help = PRINTER_BACKEND_HELP.get(backend_name,
+                                                'Unknown printer backend.')
+        return 'Printers are only listed for the \"win32print\" printer ' \
+            'backend, on Windows.\n\n' \
+            f'Printer backend in use: \"{backend_name}\"\n\n' \
+            f'Printer name: {backend_help}\n'
+
     # finds list of local printers
     printers = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL,
                                        None,
@@ -380,11 +438,128 @@ def open_info_help() -> None:
     info_window.mainloop()
 
 
+def read_printer_backend() -> str:
+    """Reads which printer backend to use from config.json.
+
+    A function which returns the PRINTER_BACKEND_KEY of config.json,
+    or DEFAULT_PRINTER_BACKEND if it is not set. Problems with
+    config.json itself are left for login_folioclient() to report.
+
+    Args:
+        None
+
+    Returns:
+        str: Returns the name of the printer backend, see
+            PRINTER_BACKENDS
+    """
+
+    try:
+        with open(config_relpath.get(), 'r') as config:
+            login = json.load(config)
+        return login.get(PRINTER_BACKEND_KEY, DEFAULT_PRINTER_BACKEND)
+    except (OSError, ValueError, AttributeError):
+        return DEFAULT_PRINTER_BACKEND
+
+
+def open_folio_session(login : dict) -> folioclient.FolioClient:
+    """Opens a FOLIO session which is kept open across patrons.
+
+    A function which logs into the FOLIOClient API and enters the
+    client (as in "with f:"), so that its connections are kept alive
+    and its token is refreshed by the client itself as needed. The
+    session is reused for as long as config.json holds the same login,
+    saving a full login on every receipt.
+
+    Args:
+        login (dict): The contents of config.json
+
+    Returns:
+        FolioClient: Returns an API object to the FOLIOClient, already
+            entered
+    """
+
+    global folio_session, folio_session_login
+
+    with folio_session_lock: # waits for a login already under way
+        if folio_session and folio_session_login == login:
+            return folio_session
+
+        close_folio_session() # login changed, logs out of the old one
+        f = folioclient.FolioClient(login['okapi_url'],
+                                    login['tenant'],
+                                    login['username'],
+                                    login['password'])
+        f.__enter__() # exited by close_folio_session()
+        folio_session = f
+        folio_session_login = login
+        return f
+
+
+def close_folio_session() -> None:
+    """Closes the FOLIO session, if open.
+
+    A function which logs out of the session opened with
+    open_folio_session(), so that the next receipt logs in anew.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    global folio_session, folio_session_login
+
+    with folio_session_lock:
+        if folio_session:
+            try:
+                folio_session.__exit__(None, None, None) # logs out
+            except Exception:
+                pass # session already unusable, nothing to log out of
+        folio_session = None
+        folio_session_login = None
+
+
+def keep_folio_session(config_name : str) -> None:
+    """Logs into FOLIO ahead of the first patron and keeps it logged in.
+
+    A function run on a background thread from start-up, which opens
+    the FOLIO session with open_folio_session() and then, every
+    FOLIO_KEEPALIVE_INTERVAL seconds, refreshes its token if it is
+    about to expire, so that a patron never waits on a login. Errors
+    are left for login_folioclient() to report on the next receipt.
+
+    Args:
+        config_name (str): The path of config.json
+
+    Returns:
+        None
+    """
+
+    try:
+        with open(config_name, 'r') as config:
+            open_folio_session(json.load(config))
+    except Exception:
+        pass # reported by login_folioclient() on the next receipt
+
+    while True:
+        sleep(FOLIO_KEEPALIVE_INTERVAL)
+        with folio_session_lock:
+            if not folio_session:
+                continue
+            try:
+                folio_session.access_token # refreshes token if expiring
+            except Exception:
+                close_folio_session() # logs in anew on the next receipt
+
+
 def login_folioclient() -> folioclient.FolioClient:
     """Organizes initial handshake with FOLIOClient.
     
     A function which handles the possible exceptions on start-up
-    and, if everything is in order, logs into the FOLIOClient API.
+    and, if everything is in order, logs into the FOLIOClient API,
+    reusing the session opened by keep_folio_session() if config.json
+    holds the same login.
     
     Args:
         None
@@ -421,16 +596,10 @@ def login_folioclient() -> folioclient.FolioClient:
                   f'\nRequired keys: {required_key_names}')
         return
 
-    # unpacks relevant data from config.json file
-    okapi_url = login['okapi_url']
-    tenant = login['tenant']
-    username = login['username']
-    password = login['password']
-
-    # attempts FOLIO API handshake
+    # attempts FOLIO API handshake, unless already logged in
     f = None # scope resolution
     try:
-        f = folioclient.FolioClient(okapi_url, tenant, username, password)
+        f = open_folio_session(login)
     except Exception as e:
         status_msg = f'Cannot connect to FolioClient. Try again.'
         update_status(msg=status_msg,
@@ -441,24 +610,19 @@ def login_folioclient() -> folioclient.FolioClient:
     return f
 
 
-def extract_single_query(f : folioclient.FolioClient,
-                         query : dict) -> dict:
-    """Extracts information from a single query.
+def extract_loan_info(loan : dict) -> dict:
+    """Extracts information from a single loan.
     
-    A function which compares the borrower barcode against the patron
-    ID and outputs a dictionary depending on if it's a match.
+    A function which picks the item information and due date out of
+    a loan record from /circulation/loans.
     
     Args:
-        f (FolioClient): An API object to the FOLIOClient
-        query (dict): The query to be searched against
+        loan (dict): The loan record
     
     Returns:
         dict: Returns a dictionary of the extracted information
     """
 
-    # queries loan ID to get loan- and item-specific information
-    loan_id = query['items'][0]['loanId'] # should always exist
-    loan = f.folio_get_single_object(path=f'/circulation/loans/{loan_id}')
     item = loan['item'] # should always exist
 
     # initializes base case dict
@@ -482,14 +646,91 @@ def extract_single_query(f : folioclient.FolioClient,
     return item_info
 
 
+def extract_log_info(query : dict) -> dict:
+    """Extracts what information a checkout log record holds.
+
+    A function used for a checkout whose loan cannot be looked up,
+    falling back on the barcode recorded in the checkout log, so that
+    one failed lookup does not stop the whole receipt.
+
+    Args:
+        query (dict): The checkout log record
+
+    Returns:
+        dict: Returns a dictionary of the extracted information, with
+            'lookupFailed' set to True
+    """
+
+    log_items = query.get('items') or [{}]
+    return {
+        'title' : 'n/a (loan not found)',
+        'barcode' : log_items[0].get('itemBarcode', 'n/a'),
+        'callNumber' : 'n/a',
+        'dueDate' : 'n/a',
+        'lookupFailed' : True,
+    }
+
+
+def fetch_loan_batch(f : folioclient.FolioClient, loan_ids : list) -> list:
+    """Fetches a batch of loans in a single query.
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        loan_ids (list): At most LOAN_ID_BATCH_SIZE loan IDs
+
+    Returns:
+        list: Returns the loan records found, a failed query raising its
+            error rather than passing its loans off as missing
+    """
+
+    return f.folio_get('/circulation/loans',
+                       'loans',
+                       query_params={
+                           'query' : f'id==({" or ".join(loan_ids)})',
+                           'limit' : len(loan_ids),
+                       })
+
+
+def fetch_loans(f : folioclient.FolioClient, loan_ids : list) -> dict:
+    """Fetches many loans in a few batched queries.
+
+    A function which splits the loan IDs into batches of
+    LOAN_ID_BATCH_SIZE, each fetched with a single id==(a or b or ...)
+    query to /circulation/loans, at most LOAN_MAX_WORKERS at a time,
+    rather than one round trip per loan.
+
+    NOTE: f must already be entered (i.e. "with f:"), so that the
+    queries share one session, see open_folio_session().
+
+    Args:
+        f (FolioClient): An API object to the FOLIOClient
+        loan_ids (list): The IDs of the loans
+
+    Returns:
+        dict: Returns the loan records found, by loan ID, loans missing
+            from the successful queries being left out
+    """
+
+    unique_ids = list(dict.fromkeys(loan_ids)) # removes repeats, keeps order
+    id_batches = [unique_ids[start : start + LOAN_ID_BATCH_SIZE] \
+                  for start in range(0, len(unique_ids), LOAN_ID_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=LOAN_MAX_WORKERS) as executor:
+        fetch_batch = lambda id_batch : fetch_loan_batch(f, id_batch)
+        return {loan['id'] : loan \
+                for batch_loans in executor.map(fetch_batch, id_batches) \
+                for loan in batch_loans}
+
+
 def extract_queries(f : folioclient.FolioClient,
                     queries : Generator[str, str, None]) -> list:
     """Extracts queries from FOLIO object.
     
-    A function which iterates through a FOLIO object and compares
-    it against the patron ID inputted by the user. If the borrower
-    barcode matches the patron ID, add an extracted info dictionary
-    to a list to be returned by the function.
+    A function which iterates through a FOLIO object, fetches the
+    loans of every checkout in a few batched queries with
+    fetch_loans(), then joins each checkout with its loan. The items
+    are returned in the order they were checked out in.
+
+    NOTE: f must already be entered (i.e. "with f:"), see fetch_loans().
     
     Args:
         f (FolioClient): An API object to the FOLIOClient
@@ -499,10 +740,20 @@ def extract_queries(f : folioclient.FolioClient,
         list: Returns a list of dictionaries containing item information
     """
 
+    queries = list(queries) # every checkout log record, in order
+    loan_ids = [(query.get('items') or [{}])[0].get('loanId') \
+                for query in queries]
+    loans = fetch_loans(f, [loan_id for loan_id in loan_ids if loan_id])
+
+    # joins each checkout with its loan, falling back on the log record
     checked_out_items = [] # list of dicts to be returned
-    for query in queries:
-        item_info = extract_single_query(f, query)
-        
+    for query, loan_id in zip(queries, loan_ids):
+        item_info = None # scope resolution
+        try:
+            item_info = extract_loan_info(loans[loan_id])
+        except (KeyError, TypeError, ValueError):
+            item_info = extract_log_info(query)
+
         if item_info: # if not an empty info dictionary
             checked_out_items.append(item_info)
 
@@ -586,7 +837,8 @@ def open_printer(printer_name : str) -> Generator[any, any, any]:
     """A context manager for win32print functions.
     
     A context manager function to handle all win32print interactions
-    and safely exit if needed.
+    and safely release the printer if needed. Errors are raised to the
+    caller, see print_spooled_job().
     
     Args:
         printer_name (str): The name of the printer from which a 
@@ -606,17 +858,318 @@ def open_printer(printer_name : str) -> Generator[any, any, any]:
         win32print.StartDocPrinter(handle, 1, print_tuple)
         yield handle
         win32print.EndDocPrinter(handle)
-    except Exception as e:
-        printer_error = 'Error occured during printing process.'
-        update_status(msg=printer_error,
-                      col=FAIL_COL,
-                      enter_state='normal')
-        error_msg(f'{printer_error}\n{e}')
     finally:
         # releases handle resource
         win32print.ClosePrinter(handle)
 
 
+def print_to_win32print(printer : str, receipt_data : bytes) -> None:
+    """Sends a receipt to a Windows printer through win32print.
+
+    Args:
+        printer (str): The name of the printer
+        receipt_data (bytes): The encoded receipt
+
+    Returns:
+        None
+    """
+
+    with open_printer(printer) as printer_handle:
+        win32print.WritePrinter(printer_handle, receipt_data)
+
+
+def print_to_socket(printer : str, receipt_data : bytes) -> None:
+    """Sends a receipt straight to a network receipt printer.
+
+    A function which sends the receipt as a raw ESC/POS job to the
+    printer's raw TCP port (RAW_PRINTER_PORT unless given), bypassing
+    the operating system's print spooler.
+
+    Args:
+        printer (str): The address of the printer, i.e. "host:port"
+        receipt_data (bytes): The encoded receipt
+
+    Returns:
+        None
+    """
+
+    host, _, port = printer.partition(':')
+    address = (host, int(port or RAW_PRINTER_PORT))
+    with socket.create_connection(address,
+                                  timeout=PRINTER_SOCKET_TIMEOUT) as connection:
+        connection.sendall(ESCPOS_INITIALIZE + receipt_data)
+
+
+def print_to_cups(printer : str, receipt_data : bytes) -> None:
+    """Sends a receipt to a CUPS print queue.
+
+    A function which passes the receipt to the "lp" command as a raw
+    job, so that it reaches the printer as is.
+
+    Args:
+        printer (str): The name of the CUPS print queue
+        receipt_data (bytes): The encoded receipt
+
+    Returns:
+        None
+    """
+
+    subprocess.run(['lp', '-d', printer, '-o', 'raw'],
+                   input=receipt_data,
+                   capture_output=True,
+                   check=True)
+
+
+def print_to_file(printer : str, receipt_data : bytes) -> None:
+    """Adds a receipt to the end of a file or device.
+
+    Args:
+        printer (str): The path of the file or device
+        receipt_data (bytes): The encoded receipt
+
+    Returns:
+        None
+    """
+
+    with open(printer, 'ab') as printer_file:
+        printer_file.write(receipt_data)
+
+
+def print_to_memory(printer : str, receipt_data : bytes) -> None:
+    """Keeps a receipt in memory_printer, for testing.
+
+    Args:
+        printer (str): Ignored
+        receipt_data (bytes): The encoded receipt
+
+    Returns:
+        None
+    """
+
+    memory_printer.append(receipt_data)
+
+
+# printer backends by name, chosen by PRINTER_BACKEND_KEY in config.json
+PRINTER_BACKENDS = {
+    'win32print' : print_to_win32print,
+    'socket' : print_to_socket,
+    'cups' : print_to_cups,
+    'file' : print_to_file,
+    'memory' : print_to_memory,
+}
+
+
+def write_print_job(job_path : str, job : dict) -> None:
+    """Writes a print job to the spool directory.
+
+    A function which writes the job to a temporary file first, then
+    renames it into place, so that a job is never left half-written.
+
+    Args:
+        job_path (str): The path of the job
+        job (dict): The printer backend, printer, patron ID, receipt
+            text and attempts
+
+    Returns:
+        None
+    """
+
+    temp_path = f'{job_path}.tmp'
+    try:
+        with open(temp_path, 'w') as job_file:
+            json.dump(job, job_file)
+        os.replace(temp_path, job_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path) # leaves no half-written receipt behind
+        raise
+
+
+def spool_receipt(backend_name : str,
+                  printer : str,
+                  receipt_text : str,
+                  patron_id : str) -> int:
+    """Adds a receipt to the print queue.
+
+    A function which saves the receipt as a job in SPOOL_DIRECTORY and
+    hands it to the print spooler, returning straight away. Jobs are
+    kept on disk until printed, so that receipts still waiting when the
+    program is closed are printed the next time it is opened.
+
+    Args:
+        backend_name (str): The printer backend, see PRINTER_BACKENDS
+        printer (str): The name of the printer
+        receipt_text (str): The formatted receipt
+        patron_id (str): The patron ID, for status messages
+
+    Returns:
+        int: Returns the number of jobs waiting in the print queue
+    """
+
+    os.makedirs(SPOOL_DIRECTORY, exist_ok=True)
+    # names sort in the order the jobs were spooled in
+    job_name = datetime.now().strftime('%Y%m%d_%H%M%S_%f') + SPOOL_EXTENSION
+    job_path = os.path.join(SPOOL_DIRECTORY, job_name)
+    write_print_job(job_path, {
+        'backend' : backend_name,
+        'printer' : printer,
+        'patron' : patron_id,
+        'text' : receipt_text,
+        'attempts' : 0,
+    })
+    print_jobs.put(job_path)
+    return print_jobs.qsize()
+
+
+def discard_spooled_job(job_path : str, msg : str) -> None:
+    """Deletes a print job which will not be printed.
+
+    A function which removes the job, along with its patron ID and
+    titles, and counts it towards the receipts not printed this run.
+
+    Args:
+        job_path (str): The path of the job
+        msg (str): The status message sent to the window
+
+    Returns:
+        None
+    """
+
+    global unprinted_job_count
+
+    os.remove(job_path)
+    unprinted_job_count += 1
+    spool_status_queue.put((msg, FAIL_COL))
+
+
+def print_spooled_job(job_path : str) -> None:
+    """Prints a single job from the print queue.
+
+    A function which sends the receipt to its printer through its
+    printer backend, see PRINTER_BACKENDS, retrying until it prints
+    with a growing delay in between, of at most PRINT_MAX_RETRY_DELAY
+    seconds. The jobs behind it wait in the queue meanwhile, so that a
+    printer out of paper only holds receipts up rather than losing
+    them. The job is deleted once printed, or once staff discard it
+    through discard_print_job. Status messages are sent to the window
+    through spool_status_queue.
+
+    Args:
+        job_path (str): The path of the job
+
+    Returns:
+        None
+    """
+
+    try:
+        with open(job_path, 'r') as job_file:
+            job = json.load(job_file)
+        patron_id = job['patron']
+        # jobs spooled before printer backends were added used win32print
+        print_receipt = PRINTER_BACKENDS[job.get('backend',
+                                                 DEFAULT_PRINTER_BACKEND)]
+    except (OSError, ValueError, KeyError):
+        discard_spooled_job(job_path, 'Unreadable print job discarded.')
+        return
+
+    discard_print_job.clear() # ignores clicks meant for an earlier job
+    while True:
+        try:
+            print_receipt(job['printer'], job['text'].encode('utf-8'))
+        except Exception as e:
+            job['attempts'] += 1
+            write_print_job(job_path, job) # keeps attempts across restarts
+            retrying_print_job.set()
+            spool_status_queue.put(('Printer error, retrying receipt for ' \
+                                    f'\"{patron_id}\" (attempt ' \
+                                    f'{job["attempts"] + 1}), ' \
+                                    f'{print_jobs.qsize()} waiting.\n{e}',
+                                    FAIL_COL))
+            retry_delay = min(PRINT_RETRY_DELAY * job['attempts'],
+                              PRINT_MAX_RETRY_DELAY)
+            if discard_print_job.wait(retry_delay):
+                retrying_print_job.clear()
+                discard_spooled_job(job_path,
+                                    f'Discarded receipt for \"{patron_id}\".')
+                return
+            continue
+
+        retrying_print_job.clear()
+        os.remove(job_path)
+        waiting_msg = f' {print_jobs.qsize()} waiting.' \
+            if not print_jobs.empty() else ''
+        spool_status_queue.put((f'Printed receipt for \"{patron_id}\".' \
+                                + waiting_msg,
+                                SUCCESS_COL))
+        return
+
+
+def resume_print_jobs() -> None:
+    """Queues the jobs left in SPOOL_DIRECTORY from the last run.
+
+    NOTE: Must be run before run_print_spooler() is started and before
+    any receipt is spooled, so that no job is queued twice.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    os.makedirs(SPOOL_DIRECTORY, exist_ok=True)
+    for job_name in sorted(os.listdir(SPOOL_DIRECTORY)): # oldest first
+        if job_name.endswith(SPOOL_EXTENSION):
+            print_jobs.put(os.path.join(SPOOL_DIRECTORY, job_name))
+
+
+def run_print_spooler() -> None:
+    """Drains the print queue, one job at a time.
+
+    A function run on a background thread from start-up, which prints
+    every job with print_spooled_job() in the order they were spooled
+    in, so that staff can scan the next patron ID straight away.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    while True:
+        job_path = print_jobs.get()
+        try:
+            print_spooled_job(job_path)
+        except OSError as e: # i.e. spool directory unwritable
+            spool_status_queue.put((f'Print queue error.\n{e}', FAIL_COL))
+
+
+def poll_print_spooler() -> None:
+    """Shows the latest status of the print spooler in the window.
+
+    A function which checks spool_status_queue every SPOOL_POLL_MS
+    milliseconds, as tkinter may only be used from the main thread,
+    along with the count of receipts not printed this run. The discard
+    button is only enabled while a receipt is being retried.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    while not spool_status_queue.empty():
+        msg, col = spool_status_queue.get()
+        if unprinted_job_count:
+            msg += f' {unprinted_job_count} receipt(s) not printed.'
+        spool_status.config(text=msg, fg=col)
+    discard_state = 'normal' if retrying_print_job.is_set() else 'disabled'
+    discard_button.config(state=discard_state)
+    root.after(SPOOL_POLL_MS, poll_print_spooler)
+
+
 def start_printing_process() -> None:
     """The response to clicking the Enter button.
     
@@ -637,24 +1190,41 @@ def start_printing_process() -> None:
     update_status(msg='Beginning receipt printing. Checking printers.',
                   enter_state='disabled')
     
-    # checks to see if listed printer exists
-    printers = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL,
-                                       None,
-                                       2)
-    printer_names = [printer['pPrinterName'] for printer in printers]
-    inputted_printer = printer_name.get()
-    inputted_printer = inputted_printer.strip() # strips whitespace from input
-    if send_to_printer.get() and (inputted_printer not in printer_names):
-        update_status(msg=f'\"{inputted_printer}\" is not ' \
-                      'a recognized printer.',
+    # checks to see if printer backend is available
+    backend_name = read_printer_backend()
+    if send_to_printer.get() and (backend_name not in PRINTER_BACKENDS or \
+                                  (backend_name == 'win32print' and \
+                                   not win32print)):
+        update_status(msg=f'Printer backend \"{backend_name}\" is not ' \
+                      'available.',
                       col=FAIL_COL,
                       enter_state='normal')
         return
 
+    # checks to see if listed printer exists, other backends find out
+    # when printing, see print_spooled_job()
+    inputted_printer = printer_name.get()
+    inputted_printer = inputted_printer.strip() # strips whitespace from input
+    if send_to_printer.get() and backend_name == 'win32print':
+        printers = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL,
+                                           None,
+                                           2)
+        printer_names = [printer['pPrinterName'] for printer in printers]
+        if inputted_printer not in printer_names:
+            update_status(msg=f'\"{inputted_printer}\" is not ' \
+                          'a recognized printer.',
+                          col=FAIL_COL,
+                          enter_state='normal')
+            return
+
     # logs into folioclient
     update_status(msg='Logging into FOLIO.')
+    # holds the session until the queries below are done, so that
+    # keep_folio_session() cannot log out of it under a receipt
+    folio_session_lock.acquire()
     f = login_folioclient()
     if not f:
+        folio_session_lock.release()
         # safety net to enable enter button again,
         # more detailed status messages executed during
         # login_folioclient() execution
@@ -714,14 +1284,25 @@ def start_printing_process() -> None:
     search_query = f'date > \"{iso_timeframe}\"' \
         f' and userBarcode == \"{patron_id}\"' \
         ' and action == \"Checked out\"'
-    queries = f.folio_get_all(path='audit-data/circulation/logs',
-                              key='logRecords',
-                              query=search_query)
-
+    checked_out_items = [] # scope resolution
+    try:
+        queries = f.folio_get_all(path='audit-data/circulation/logs',
+                                  key='logRecords',
+                                  query=search_query)
 
-    # iterates through queries to find matches to patron ID
-    update_status(msg='Extracting item information.')
-    checked_out_items = extract_queries(f, queries)
+        # looks up the loans of the checkouts found
+        update_status(msg='Extracting item information.')
+        checked_out_items = extract_queries(f, queries)
+    except Exception as e:
+        close_folio_session() # logs in anew on the next receipt
+        status_msg = 'Cannot query FOLIO API. Try again.'
+        update_status(msg=status_msg,
+                      col=FAIL_COL,
+                      enter_state='normal')
+        error_msg(f'{status_msg}\n{e}')
+        return
+    finally:
+        folio_session_lock.release() # queries done, see above
     id_input.delete(0, 'end') # deletes patron ID from input
     # test_item = {
     #     'title' : 'Loan Receipt Prints by jaq-lagnirac',
@@ -745,11 +1326,24 @@ def start_printing_process() -> None:
     BUFFER = '\n' * 10 # ensures whole receipt is above the tear bar
     receipt_text = format_full_receipt(checked_out_items, time_now) + BUFFER
 
+    job_msg = 'Printed' # scope resolution
+    queue_msg = ''
     if send_to_printer.get():
-        # prints to named and connected printer
-        with open_printer(inputted_printer) as printer_handle:
-            encoded_text = receipt_text.encode('utf-8')
-            win32print.WritePrinter(printer_handle, encoded_text)
+        # queues for named and connected printer, see run_print_spooler()
+        try:
+            waiting_count = spool_receipt(backend_name,
+                                          inputted_printer,
+                                          receipt_text,
+                                          patron_id)
+        except OSError as e:
+            status_msg = 'Cannot queue receipt. Try again.'
+            update_status(msg=status_msg,
+                          col=FAIL_COL,
+                          enter_state='normal')
+            error_msg(f'{status_msg}\n{e}')
+            return
+        job_msg = 'Queued'
+        queue_msg = f' {waiting_count} in print queue.'
     else:
         # prints to .txt file in working directory
         iso_prefix = time_now.astimezone().strftime('%Y%m%d_%H%M%S')
@@ -758,7 +1352,12 @@ def start_printing_process() -> None:
             receipt_file.write(receipt_text)
 
     # wrap-up statements
-    update_status(msg=f'Printed receipt for patron \"{patron_id}\"!',
+    failed_count = sum(1 for item in checked_out_items \
+                       if item.get('lookupFailed'))
+    failed_msg = f' {failed_count} item(s) could not be looked up.' \
+        if failed_count else ''
+    update_status(msg=f'{job_msg} receipt for patron \"{patron_id}\"!' \
+                  + queue_msg + failed_msg,
                   col=SUCCESS_COL,
                   enter_state='normal')
     return
@@ -891,6 +1490,7 @@ if __name__ == '__main__':
     BOTTOM_ROW = 100 # arbitrarily large number
     BUTTON_ROW = BOTTOM_ROW - 10
     STATUS_ROW = BUTTON_ROW - 1
+    SPOOL_STATUS_ROW = STATUS_ROW - 1
     BUTTON_COLUMN_START = IMAGE_COLUMN + 1
     STATUS_FONT = ('Courier New', 11)
     status = tk.Label(root, text='', font=STATUS_FONT)
@@ -900,6 +1500,25 @@ if __name__ == '__main__':
                 columnspan=100,
                 padx=TEXT_SIDE_PADDING,
                 pady=(12, 12))
+    # shows the latest job of the print queue, see poll_print_spooler()
+    spool_status = tk.Label(root,
+                            text='',
+                            font=(STATUS_FONT[0], 9),
+                            justify='left')
+    spool_status.grid(sticky='W',
+                      row=SPOOL_STATUS_ROW,
+                      column=IMAGE_COLUMN,
+                      columnspan=BUTTON_COLUMN_START + 2 - IMAGE_COLUMN,
+                      padx=TEXT_SIDE_PADDING)
+    # skips a receipt the printer keeps failing on, see print_spooled_job()
+    discard_button = tk.Button(root,
+                               text='Discard receipt',
+                               command=discard_print_job.set)
+    discard_button.grid(sticky='NESW',
+                        row=SPOOL_STATUS_ROW,
+                        column=BUTTON_COLUMN_START + 2,
+                        padx=(0, X_WIDGET_PADDING))
+    discard_button.config(state='disabled') # enabled while retrying
     # NOTE: sticky='NESW' used to fill box to fit column and row
     enter_button = tk.Button(root,
                              text='Enter',
@@ -932,5 +1551,15 @@ if __name__ == '__main__':
                            font=(FONT_TUPLE[0], 7))
     description.grid(sticky='W', row=BOTTOM_ROW, column=0, columnspan=100)
 
+    # logs into FOLIO in the background, ahead of the first patron
+    threading.Thread(target=keep_folio_session,
+                     args=(config_relpath.get(),),
+                     daemon=True).start()
+    # prints queued receipts in the background, see spool_receipt()
+    resume_print_jobs()
+    threading.Thread(target=run_print_spooler, daemon=True).start()
+    root.after(SPOOL_POLL_MS, poll_print_spooler)
+
     root.mainloop()
+    close_folio_session() # logs out once the window is closed
     
\ No newline at end of file
@@ -0,0 +1,117 @@
+# Justin Caringal, Stephen Wynn
+#
+# Testing grounds for the "socket" printer backend, without a printer
+#
+# Starts a stand-in network receipt printer on a local port, then sends
+# receipts to it through the print spooler, timing how long receipts take
+# to be queued and to be printed. Runs on any system, i.e. from the
+# loan_receipts folder:
+#     python testing/test-socket-printer.py --receipts 200 --print-delay 0.05
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import threading
+import socketserver
+from datetime import datetime, timezone
+
+# imports the program from the folder above, its GUI is never opened
+PROGRAM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAM_DIRECTORY)
+import loan_receipts as lr
+
+received_receipts = [] # receipts the stand-in printer has "printed"
+print_head_lock = threading.Lock() # prints one receipt at a time
+
+
+class StandInPrinter(socketserver.BaseRequestHandler):
+    """Reads one raw print job per connection, like a receipt printer."""
+
+    print_delay = 0 # seconds the stand-in takes to print a receipt
+
+    def handle(self) -> None:
+        job_data = b''
+        while chunk := self.request.recv(4096):
+            job_data += chunk
+        with print_head_lock:
+            time.sleep(self.print_delay)
+            received_receipts.append(job_data)
+
+
+class StandInPrinterServer(socketserver.ThreadingTCPServer):
+    """Accepts the next job while the last one is still being read."""
+
+    request_queue_size = 128 # connections waiting to be accepted
+    daemon_threads = True
+
+
+def main() -> None:
+    """Sends receipts to the stand-in printer and prints the timings."""
+
+    parser = argparse.ArgumentParser(
+        description='Load tests the loan_receipts print spooler against a ' \
+            'stand-in network receipt printer.')
+    parser.add_argument('--receipts',
+                        type=int,
+                        default=100,
+                        help='receipts to print (default: %(default)s)')
+    parser.add_argument('--items',
+                        type=int,
+                        default=3,
+                        help='items on each receipt (default: %(default)s)')
+    parser.add_argument('--print-delay',
+                        type=float,
+                        default=0,
+                        help='seconds the stand-in takes to print a ' \
+                            'receipt (default: %(default)s)')
+    args = parser.parse_args()
+
+    # starts the stand-in printer on a free local port
+    StandInPrinter.print_delay = args.print_delay
+    server = StandInPrinterServer(('127.0.0.1', 0), StandInPrinter)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    printer = f'127.0.0.1:{server.server_address[1]}'
+
+    # formats the same receipt for every patron
+    test_item = {
+        'title' : 'Loan Receipt Prints by jaq-lagnirac',
+        'barcode' : 'Barcode',
+        'dueDate' : 'Due',
+        'callNumber' : 'Call Number'
+    }
+    receipt_text = lr.format_full_receipt([test_item] * args.items,
+                                          datetime.now(timezone.utc))
+
+    with tempfile.TemporaryDirectory() as spool_directory:
+        lr.SPOOL_DIRECTORY = spool_directory
+        threading.Thread(target=lr.run_print_spooler, daemon=True).start()
+
+        start_time = time.perf_counter()
+        for patron_number in range(args.receipts):
+            lr.spool_receipt('socket',
+                             printer,
+                             receipt_text,
+                             f'{patron_number:09}')
+        queued_seconds = time.perf_counter() - start_time
+        while len(received_receipts) < args.receipts:
+            time.sleep(0.01)
+        printed_seconds = time.perf_counter() - start_time
+
+    server.shutdown()
+    expected_data = lr.ESCPOS_INITIALIZE + receipt_text.encode('utf-8')
+    intact_count = sum(1 for job_data in received_receipts \
+                       if job_data == expected_data)
+    print(f'Queued {args.receipts} receipts in {queued_seconds:.3f} s.')
+    print(f'Printed {args.receipts} receipts in {printed_seconds:.3f} s ' \
+          f'({args.receipts / printed_seconds:.1f} receipts/s), ' \
+          f'{intact_count} intact.')
+    while not lr.spool_status_queue.empty():
+        msg, col = lr.spool_status_queue.get()
+        if col == lr.FAIL_COL:
+            print(msg)
+
+
+if __name__ == '__main__':
+    main()